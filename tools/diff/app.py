@@ -1,11 +1,18 @@
 import os
+import sys
 import streamlit as st
-from rdflib import Graph, RDF, RDFS, OWL, URIRef
+from rdflib import URIRef
 from collections import defaultdict
 import pandas as pd
 import math
-from helpers import pretty, build_class_stats, extract_edges, class_nice_view, compare_object_properties
-from PIL import Image
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ontocommon.graph_cache import content_hash
+from ontocommon.shared_graphs import get_shared_graphs, format_stats
+from ontocommon.formats import UPLOAD_EXTENSIONS
+from helpers import pretty, relation_changes_frame
+from ontodiff import diff_versions
+from timeline import get_timeline_cache, relations_frame
 
 
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -26,18 +33,21 @@ default_old = os.path.join(CURRENT_DIR, "example_data", "ebucoreplus_1.owl")
 default_new = os.path.join(CURRENT_DIR, "example_data", "ebucoreplus_2.owl")
 
 def read_ontology_file(f):
+    # Raw bytes: hashed and parsed as-is, without a decoded str copy next to them
     if f is None:
         return None
+    if hasattr(f, "getvalue"):
+        return f.getvalue()
     if hasattr(f, "read"):
         try:
             f.seek(0)
         except Exception:
             pass
-        return f.read().decode("utf-8")
+        return f.read()
     elif isinstance(f, bytes):
-        return f.decode("utf-8")
-    elif isinstance(f, str):
         return f
+    elif isinstance(f, str):
+        return f.encode("utf-8")
     return None
 
 def get_default_file_obj(filepath):
@@ -52,29 +62,85 @@ def get_filename(file_like, default_name):
         return os.path.basename(file_like.name)
     return os.path.basename(default_name)
 
-def parse_graph_from_data(data, filename_hint=None):
-    g = Graph()
-    ext = os.path.splitext(filename_hint or "")[1].lower()
-    formats_to_try = ["turtle", "xml"]
-
-
-    for fmt in formats_to_try:
-        try:
-            if fmt == "xml" and isinstance(data, str):
-                data = data.encode("utf-8")
-            g.parse(data=data, format=fmt)
-            return g
-        except Exception:
-            continue
+@st.cache_resource(max_entries=8, show_spinner="Comparing ontology versions...")
+def load_diff(hash_old, hash_new, _data_old, _data_new, _name_old=None, _name_new=None):
+    # Keyed on the pair of content hashes only; reruns reuse the shared DiffResult.
+    # Same pipeline as the headless CLI: both versions are parsed and summarized in parallel.
+    # Parse errors (ValueError) propagate and are shown by the caller, so nothing is cached
+    return diff_versions(_data_old, _data_new, _name_old, _name_new)
+
+# -------------- Timeline mode (N versions) --------------
+TIMELINE_COLORS = {
+    "New": "background-color: #d4edda",
+    "Removed": "background-color: #f8d7da",
+    "Modified": "background-color: #fff3cd",
+}
 
-    st.error("❌ Could not parse file: unsupported RDF format (expected TTL or RDF/XML)")
+def show_timeline():
+    st.sidebar.markdown("### Upload ontology versions, oldest first")
+    files = st.sidebar.file_uploader("Versions", type=UPLOAD_EXTENSIONS, accept_multiple_files=True)
+    if files:
+        versions = [(read_ontology_file(f), get_filename(f, "")) for f in files]
+    else:
+        versions = [(get_default_file_obj(path), os.path.basename(path)) for path in (default_old, default_new)]
+    if st.sidebar.checkbox("Order versions by file name", value=False):
+        versions.sort(key=lambda version: version[1])
+    if len(versions) < 2 or any(data is None for data, _ in versions):
+        st.info("Upload at least two ontology versions.")
+        st.stop()
+
+    # Summaries and version-to-version steps are cached per content hash, so
+    # adding a release only summarizes it and compares it with its neighbour
+    try:
+        with st.spinner(f"Comparing {len(versions)} ontology versions..."):
+            timeline = get_timeline_cache().timeline(versions)
+    except ValueError as e:
+        st.error(f"❌ Could not parse ontology: {e}")
+        st.stop()
+
+    st.subheader("Timeline")
+    st.caption(" → ".join(timeline.versions))
+    st.dataframe(timeline.step_counts(), hide_index=True)
+
+    st.subheader("Classes × versions")
+    query = st.text_input("Filter", key="timeline_filter", placeholder="Search label or URI...")
+    changed_only = st.checkbox("Only classes that changed", value=True)
+    matrix = timeline.changed_classes() if changed_only else timeline.class_matrix
+    if query:
+        q = query.lower()
+        matrix = matrix.loc[matrix["Label"].str.lower().str.contains(q, regex=False)
+                            | matrix.index.str.lower().str.contains(q, regex=False)]
+    st.caption(f"{len(matrix)} of {len(timeline.class_matrix)} classes")
+    st.dataframe(
+        matrix.style.map(lambda status: TIMELINE_COLORS.get(status, ""), subset=timeline.versions),
+        height=min(600, 35 * (len(matrix) + 1) + 3),
+    )
+    st.download_button(
+        "Download class matrix (CSV)", lambda: timeline.class_matrix.to_csv(),
+        file_name="class_matrix.csv", mime="text/csv",
+    )
+
+    st.subheader("Relation lifecycles")
+    relations = timeline.relation_lifecycles
+    if st.checkbox("Only relations that were added or removed", value=True):
+        relations = relations.loc[(relations["Introduced"] != timeline.versions[0]) | (relations["Removed"] != "")]
+    st.caption(f"{len(relations)} of {len(timeline.relation_lifecycles)} relations")
+    st.dataframe(relations_frame(relations), hide_index=True, height=min(600, 35 * (len(relations) + 1) + 3))
+    st.download_button(
+        "Download relation lifecycles (CSV)", lambda: timeline.relation_lifecycles.to_csv(index=False),
+        file_name="relation_lifecycles.csv", mime="text/csv",
+    )
+
+mode = st.sidebar.radio("Mode", ["Two versions", "Timeline"], horizontal=True)
+if mode == "Timeline":
+    show_timeline()
     st.stop()
 
 # Sidebar
 st.sidebar.markdown("### Upload ontology versions (optional)")
 
-file_old = st.sidebar.file_uploader("Old version", type=["ttl", "owl"])
-file_new = st.sidebar.file_uploader("New version", type=["ttl", "owl"])
+file_old = st.sidebar.file_uploader("Old version", type=UPLOAD_EXTENSIONS)
+file_new = st.sidebar.file_uploader("New version", type=UPLOAD_EXTENSIONS)
 
 # Fallback to defaults if nothing is uploaded
 if not file_old:
@@ -90,50 +156,28 @@ if data_old is None or data_new is None:
     st.error("Failed to load ontology files. Please ensure example_data/ebucoreplus_1.owl and ebucoreplus_2.owl exist.")
     st.stop()
 
-g_old = parse_graph_from_data(data_old, default_old)
-g_new = parse_graph_from_data(data_new, default_new)
+hash_old, hash_new = content_hash(data_old), content_hash(data_new)
+try:
+    diff = load_diff(
+        hash_old, hash_new, data_old, data_new,
+        get_filename(file_old, default_old), get_filename(file_new, default_new)
+    )
+except ValueError as e:
+    st.error(f"❌ Could not parse ontology: {e}")
+    st.stop()
+old_version, new_version = diff.old, diff.new
+df_old, df_new, cmp = diff.df_old, diff.df_new, diff.cmp
+new_nodes, removed_nodes = diff.new_nodes, diff.removed_nodes
+edges_old, edges_new = diff.edges_old, diff.edges_new
 
 # Sidebar confirmation of loaded files
 st.sidebar.write("### Loaded files:")
 st.sidebar.write(f"Old: {get_filename(file_old, default_old)}")
 st.sidebar.write(f"New: {get_filename(file_new, default_new)}")
+st.sidebar.caption(f"Shared ontologies: {format_stats(get_shared_graphs().stats())}")
 
-df_old = build_class_stats(g_old)
-df_new = build_class_stats(g_new)
-
-# --- diff of classes --------------------------------------------------
-df_old["key"] = df_old["URI"]
-df_new["key"] = df_new["URI"]
-
-cmp = df_new.merge(df_old, on="key", how="outer", suffixes=("_new", "_old"))
-
-def status(row):
-    if pd.isna(row["Label_old"]):
-        return "New"
-    if pd.isna(row["Label_new"]):
-        return "Removed"
-    if row["Subclasses_new"] != row["Subclasses_old"] or row["TotalRelations_new"] != row["TotalRelations_old"]:
-        return "Modified"
-    return "Unchanged"
-
-cmp["Status"] = cmp.apply(status, axis=1)
-
-valid_uris = set(df_new["URI"])
-new_nodes = {
-    uri for uri in cmp.loc[cmp["Status"] == "New", "URI_new"]
-    if uri in valid_uris
-}
-removed_nodes = set(cmp.loc[cmp["Status"] == "Removed", "URI_old"])
-
-# edges
-classes_new = {URIRef(u) for u in df_new["URI"]}
-classes_old = {URIRef(u) for u in df_old["URI"]}
-
-edges_new = extract_edges(g_new, classes_new)
-edges_old = extract_edges(g_old, classes_old)
-
-added_edges = len(edges_new - edges_old)
-removed_edges = len(edges_old - edges_new)
+added_edges = len(diff.added_edges)
+removed_edges = len(diff.removed_edges)
 
 # --- Delta dashboard metrics for classes and relations ---
 st.subheader("Delta dashboard")
@@ -146,45 +190,35 @@ d1, d2 = st.columns(2)
 d1.metric("➕ Relations", added_edges)
 d2.metric("➖ Relations", removed_edges)
 
-# ----------- Grouped domains and domain mapping -----------
-grouped_main_classes = {
-    "Audit": [
-        "AuditJob", "AuditReport", "Measure"
-    ],
-    "Commercial": [
-        "Asset", "Contract", "Rights", "Rule"
-    ],
-    "Consumption": [
-        "Account", "ConsumptionDevice", "ConsumptionEvent", "ConsumptionLicence", "Consumer", "ResonanceEvent"
-    ],
-    "Distribution": [
-        "ConsumptionDeviceProfile", "PublicationEvent", "PublicationService"
-    ],
-    "Editorial": [
-        "EditorialObject", "Event", "Location", "TimelineTrack"
-    ],
-    "Financial": [
-        "AssetValue", "ContractCost"
-    ],
-    "Participation": [
-        "Agent", "Crew", "Involvement", "Organisation", "Person"
-    ],
-    "Planning": [
-        "Audience", "Campaign", "ProductionOrder", "PublicationPlan"
-    ],
-    "Production": [
-        "Artefact", "Essence", "Format", "MediaResource", "OnStagePosition", "PhysicalResource",
-        "ProductionDevice", "ProductionJob", "Resource", "Track"
-    ]
-}
-
-label2dom = {}
-ns = "http://www.ebu.ch/metadata/ontologies/ebucoreplus#"
-for dom, labels in grouped_main_classes.items():
-    for lbl in labels:
-        label2dom[f"{ns}{lbl}"] = dom
-df_old["Domain"] = df_old["URI"].map(label2dom).fillna("Other")
-df_new["Domain"] = df_new["URI"].map(label2dom).fillna("Other")
+# -------------- Lazy, paginated class lists --------------
+PAGE_SIZES = [25, 50, 100]
+
+@st.cache_data(max_entries=4096)
+def cached_class_view(graph_hash, class_uri, _version, _labels):
+    # Memoized per (ontology version, class); only computed once an expander is opened
+    return _version.class_view(class_uri, _labels)
+
+def paginated_rows(df, key, label_col, uri_col):
+    """Filter ``df`` by a search box and return only the rows of the current page."""
+    query = st.text_input("Filter", key=f"{key}_filter", placeholder="Search label or URI...")
+    if query:
+        mask = (
+            df[label_col].str.contains(query, case=False, regex=False, na=False)
+            | df[uri_col].str.contains(query, case=False, regex=False, na=False)
+        )
+        df = df.loc[mask]
+    df = df.sort_values(label_col, key=lambda s: s.str.lower())
+    c1, c2 = st.columns(2)
+    page_size = c1.selectbox("Classes per page", PAGE_SIZES, key=f"{key}_page_size")
+    pages = max(1, math.ceil(len(df) / page_size))
+    page = c2.number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    start = (page - 1) * page_size
+    st.caption(f"Showing {min(start + 1, len(df))}–{min(start + page_size, len(df))} of {len(df)} classes")
+    return df.iloc[start:start + page_size]
+
+def lazy_expander(label, key):
+    # on_change="rerun" makes .open report the state, so closed bodies are skipped
+    return st.expander(label, key=key, on_change="rerun")
 
 # -------------- Tabs UI --------------
 tab_labels = [
@@ -204,19 +238,18 @@ with tabs[0]:
     if mod_df.empty:
         st.info("No modified classes.")
     else:
-        for _, row in mod_df.iterrows():
-            lbl = row["Label_new"]
-            with st.expander(lbl):
-                st.write("URI (v2):", row.get("URI_new", "—"))
-                st.write("URI (v1):", row.get("URI_old", "—"))
-                st.markdown(
-                    f"- Subclasses **{row['Subclasses_old']} → {row['Subclasses_new']}**  \n"
-                    f"- ObjectProperties **{row['ObjectProperties_old']} → {row['ObjectProperties_new']}**  \n"
-                    f"- TotalRelations **{row['TotalRelations_old']} → {row['TotalRelations_new']}**"
-                )
-                uri = row.get("URI_new", None)
-                if uri:
-                    added, removed = compare_object_properties(g_new, g_old, uri)
+        for row in paginated_rows(mod_df, "modified", "Label_new", "URI_new").itertuples():
+            exp = lazy_expander(row.Label_new, f"modified_{row.key}")
+            with exp:
+                if exp.open:
+                    st.write("URI (v2):", row.URI_new)
+                    st.write("URI (v1):", row.URI_old)
+                    st.markdown(
+                        f"- Subclasses **{row.Subclasses_old} → {row.Subclasses_new}**  \n"
+                        f"- ObjectProperties **{row.ObjectProperties_old} → {row.ObjectProperties_new}**  \n"
+                        f"- TotalRelations **{row.TotalRelations_old} → {row.TotalRelations_new}**"
+                    )
+                    added, removed = diff.property_deltas.get(row.URI_new, (set(), set()))
                     if added:
                         st.write("**New object properties in v2:**")
                         for p in added:
@@ -235,12 +268,11 @@ with tabs[1]:
     if new_df.empty:
         st.info("No new classes.")
     else:
-        for _, row in new_df.iterrows():
-            lbl = row["Label_new"]
-            with st.expander(lbl):
-                uri = row.get("URI_new", None)
-                if uri:
-                    st.markdown(class_nice_view(g_new, uri))
+        for row in paginated_rows(new_df, "new", "Label_new", "URI_new").itertuples():
+            exp = lazy_expander(row.Label_new, f"new_{row.key}")
+            with exp:
+                if exp.open:
+                    st.markdown(cached_class_view(hash_new, row.URI_new, new_version, diff.labels_new))
 
 # -------- Per-class differences: REMOVED -----------
 with tabs[2]:
@@ -249,49 +281,49 @@ with tabs[2]:
     if rem_df.empty:
         st.info("No removed classes.")
     else:
-        for _, row in rem_df.iterrows():
-            lbl = row["Label_old"]
-            with st.expander(lbl):
-                uri = row.get("URI_old", None)
-                if uri:
-                    st.markdown(class_nice_view(g_old, uri))
+        for row in paginated_rows(rem_df, "removed", "Label_old", "URI_old").itertuples():
+            exp = lazy_expander(row.Label_old, f"removed_{row.key}")
+            with exp:
+                if exp.open:
+                    st.markdown(cached_class_view(hash_old, row.URI_old, old_version, diff.labels_old))
 
 
 # -------- Per-relation differences by class (object properties only) -----------
 with tabs[3]:
     st.subheader("Relations")
-    SUBCLASS_PRED = URIRef("subClassOf")
-    def filter_non_subclassof(edges):
-        return [e for e in edges if e[1] != SUBCLASS_PRED]
-    changed_classes = set()
-    for subj, pred, obj in filter_non_subclassof(edges_new - edges_old):
-        changed_classes.add(subj)
-        changed_classes.add(obj)
-    for subj, pred, obj in filter_non_subclassof(edges_old - edges_new):
-        changed_classes.add(subj)
-        changed_classes.add(obj)
-    class_label_map = {URIRef(row['URI_new']): row['Label_new'] for _, row in cmp.iterrows() if pd.notna(row['URI_new'])}
-    class_label_map.update({URIRef(row['URI_old']): row['Label_old'] for _, row in cmp.iterrows() if pd.notna(row['URI_old'])})
+    # Relation changes are bucketed per class once, in compute_diff
+    relation_changes = diff.relation_changes
     def get_label(uri):
-        return class_label_map.get(uri, pretty(uri))
-    for cls in sorted(changed_classes, key=lambda u: get_label(u).lower()):
-        with st.expander(f"{get_label(cls)}"):
-            added_edges_cls = [
-                e for e in filter_non_subclassof(edges_new - edges_old) if e[0] == cls or e[2] == cls
-            ]
-            removed_edges_cls = [
-                e for e in filter_non_subclassof(edges_old - edges_new) if e[0] == cls or e[2] == cls
-            ]
-            if added_edges_cls:
-                st.write("**➕ New relations in v2:**")
-                for a, p, b in added_edges_cls:
-                    st.write(f"- {pretty(a)} --{pretty(p)}→ {pretty(b)}")
-            if removed_edges_cls:
-                st.write("**➖ Removed relations since v1:**")
-                for a, p, b in removed_edges_cls:
-                    st.write(f"- {pretty(a)} --{pretty(p)}→ {pretty(b)}")
-            if not (added_edges_cls or removed_edges_cls):
-                st.write("No object property relation changes for this class.")
+        return diff.class_labels.get(uri, pretty(uri))
+    if relation_changes:
+        st.download_button(
+            "Download relation changes (CSV)",
+            lambda: relation_changes_frame(relation_changes, diff.class_labels).to_csv(index=False),
+            file_name="relation_changes.csv",
+            mime="text/csv",
+        )
+    rel_df = pd.DataFrame(
+        [(get_label(cls), str(cls)) for cls in relation_changes],
+        columns=["Label", "URI"],
+    )
+    if rel_df.empty:
+        st.info("No relation changes.")
+    else:
+        for row in paginated_rows(rel_df, "relations", "Label", "URI").itertuples():
+            exp = lazy_expander(row.Label, f"relations_{row.URI}")
+            with exp:
+                if exp.open:
+                    added_edges_cls, removed_edges_cls = relation_changes[URIRef(row.URI)]
+                    if added_edges_cls:
+                        st.markdown("**➕ New relations in v2:**\n" + "\n".join(
+                            f"- {pretty(a)} --{pretty(p)}→ {pretty(b)}" for a, p, b in added_edges_cls
+                        ))
+                    if removed_edges_cls:
+                        st.markdown("**➖ Removed relations since v1:**\n" + "\n".join(
+                            f"- {pretty(a)} --{pretty(p)}→ {pretty(b)}" for a, p, b in removed_edges_cls
+                        ))
+                    if not (added_edges_cls or removed_edges_cls):
+                        st.write("No object property relation changes for this class.")
 
 # -------- Overview of New Classes -----------
 with tabs[4]:
@@ -300,11 +332,8 @@ with tabs[4]:
     for _, row in cmp.loc[cmp["Status"] == "New"].iterrows():
         uri = URIRef(row["URI_new"])
         label = row["Label_new"]
-        supers = [pretty(s) for s in g_new.objects(uri, RDFS.subClassOf)]
-        subs = [
-            pretty(sub) for sub in g_new.subjects(RDFS.subClassOf, uri)
-            if (sub, RDF.type, OWL.Class) in g_new
-        ]
+        supers = [pretty(s) for s in new_version.superclasses.get(uri, ())]
+        subs = [pretty(sub) for sub in new_version.subclasses.get(uri, ())]
         new_classes_info.append({
             "Label": label,
             "URI": row["URI_new"],
@@ -319,7 +348,7 @@ with tabs[4]:
         new_nodes_with_super = []
         for u in new_nodes:
             u_uri = URIRef(u)
-            superclasses = list(g_new.objects(u_uri, RDFS.subClassOf))
+            superclasses = new_version.superclasses.get(u_uri, ())
             uri_superclasses = [s for s in superclasses if isinstance(s, URIRef)]
             if uri_superclasses:
                 new_nodes_with_super.append(u_uri)
@@ -345,7 +374,7 @@ with tabs[4]:
 
             super_links = defaultdict(list)
             for cls in dom_nodes:
-                for sup in g_new.objects(cls, RDFS.subClassOf):
+                for sup in new_version.superclasses.get(cls, ()):
                     if isinstance(sup, URIRef):
                         super_links[sup].append(cls)
 
@@ -402,7 +431,7 @@ with tabs[4]:
 # -------- Overview of New Relations -----------
 with tabs[5]:
     st.subheader("Overview of New Relations")
-    new_relations = list(edges_new - edges_old)
+    new_relations = diff.decode_edges(diff.added_edges)
     if not new_relations:
         st.info("No new relations found in the new version.")
     else:
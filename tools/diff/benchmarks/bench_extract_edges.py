@@ -0,0 +1,92 @@
+"""
+Time and peak memory of extract_edges plus the version-to-version set
+difference, comparing the previous URIRef-triple implementation with the
+current integer-id one. Run from the tools/diff directory:
+
+    python benchmarks/bench_extract_edges.py [old.owl new.owl]
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+
+from rdflib import Graph, RDF, RDFS, OWL, URIRef
+from helpers import TermInterner, build_class_stats, extract_edges
+
+EXAMPLE_DATA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "example_data")
+DEFAULT_OLD = os.path.join(EXAMPLE_DATA, "ebucoreplus_1.owl")
+DEFAULT_NEW = os.path.join(EXAMPLE_DATA, "ebucoreplus_2.owl")
+
+
+def extract_edges_legacy(g, class_set):
+    # Previous implementation: domain x range product, subClassOf scan, per-class restriction walk
+    edges = set()
+    for prop in g.subjects(RDF.type, OWL.ObjectProperty):
+        for d in g.objects(prop, RDFS.domain):
+            for r in g.objects(prop, RDFS.range):
+                if d in class_set and r in class_set:
+                    edges.add((d, prop, r))
+    for sub, _, sup in g.triples((None, RDFS.subClassOf, None)):
+        if sub in class_set and sup in class_set:
+            edges.add((sub, URIRef("subClassOf"), sup))
+    for cls in class_set:
+        for rest in g.objects(cls, RDFS.subClassOf):
+            if (rest, RDF.type, OWL.Restriction) in g:
+                prop = next(g.objects(rest, OWL.onProperty), None)
+                if prop:
+                    for p in [OWL.someValuesFrom, OWL.allValuesFrom, OWL.hasValue]:
+                        for tgt in g.objects(rest, p):
+                            if tgt in class_set:
+                                edges.add((cls, prop, tgt))
+    return edges
+
+
+def legacy_diff(g_old, g_new, classes_old, classes_new):
+    edges_new = extract_edges_legacy(g_new, classes_new)
+    edges_old = extract_edges_legacy(g_old, classes_old)
+    return edges_new - edges_old, edges_old - edges_new
+
+
+def interned_diff(g_old, g_new, classes_old, classes_new):
+    interner = TermInterner()
+    edges_new = extract_edges(g_new, classes_new, interner)
+    edges_old = extract_edges(g_old, classes_old, interner)
+    return edges_new - edges_old, edges_old - edges_new
+
+
+def measure(func, *args, repeat=10):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    elapsed = (time.perf_counter() - start) / repeat
+    tracemalloc.start()
+    func(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(path_old=DEFAULT_OLD, path_new=DEFAULT_NEW):
+    g_old = Graph().parse(path_old, format="turtle")
+    g_new = Graph().parse(path_new, format="turtle")
+    classes_old = {URIRef(u) for u in build_class_stats(g_old)["URI"]}
+    classes_new = {URIRef(u) for u in build_class_stats(g_new)["URI"]}
+    args = (g_old, g_new, classes_old, classes_new)
+
+    (added, removed), legacy_time, legacy_peak = measure(legacy_diff, *args)
+    (added_ids, removed_ids), interned_time, interned_peak = measure(interned_diff, *args)
+    print(f"{os.path.basename(path_old)} -> {os.path.basename(path_new)}: "
+          f"{len(added)} added, {len(removed)} removed relations")
+    print(f"legacy   (URIRef triples): {legacy_time * 1000:7.1f} ms, peak {legacy_peak / 1024:7.1f} KiB")
+    print(f"interned (integer ids):    {interned_time * 1000:7.1f} ms, peak {interned_peak / 1024:7.1f} KiB")
+    same = (len(added), len(removed)) == (len(added_ids), len(removed_ids))
+    print("same delta sizes:", same)
+    return 0 if same else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*sys.argv[1:3]))
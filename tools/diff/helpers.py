@@ -1,140 +1,501 @@
+from collections import defaultdict
+from dataclasses import dataclass
 from rdflib import Graph, RDF, RDFS, OWL, URIRef
+import numpy as np
 import pandas as pd
 
+from ontocommon.labels import LabelResolver, short_name
+
+# ----------- Grouped domains and domain mapping -----------
+grouped_main_classes = {
+    "Audit": [
+        "AuditJob", "AuditReport", "Measure"
+    ],
+    "Commercial": [
+        "Asset", "Contract", "Rights", "Rule"
+    ],
+    "Consumption": [
+        "Account", "ConsumptionDevice", "ConsumptionEvent", "ConsumptionLicence", "Consumer", "ResonanceEvent"
+    ],
+    "Distribution": [
+        "ConsumptionDeviceProfile", "PublicationEvent", "PublicationService"
+    ],
+    "Editorial": [
+        "EditorialObject", "Event", "Location", "TimelineTrack"
+    ],
+    "Financial": [
+        "AssetValue", "ContractCost"
+    ],
+    "Participation": [
+        "Agent", "Crew", "Involvement", "Organisation", "Person"
+    ],
+    "Planning": [
+        "Audience", "Campaign", "ProductionOrder", "PublicationPlan"
+    ],
+    "Production": [
+        "Artefact", "Essence", "Format", "MediaResource", "OnStagePosition", "PhysicalResource",
+        "ProductionDevice", "ProductionJob", "Resource", "Track"
+    ]
+}
+
+EBUCOREPLUS_NS = "http://www.ebu.ch/metadata/ontologies/ebucoreplus#"
+label2dom = {
+    f"{EBUCOREPLUS_NS}{lbl}": dom
+    for dom, labels in grouped_main_classes.items()
+    for lbl in labels
+}
+
 # ----------- helper functions ----------
 def pretty(uri: URIRef) -> str:
-    s = str(uri)
-    return s.split("#")[-1] if "#" in s else s.split("/")[-1]
+    return short_name(uri)
 
-def build_class_stats(g: Graph) -> pd.DataFrame:
-    class_info = {}
-    all_classes = {
-        cls for cls in g.subjects(RDF.type, OWL.Class)
-        if isinstance(cls, URIRef)
-    }
-    for cls in all_classes:
-        label = next(
-            (str(l) for l in g.objects(cls, RDFS.label)
-             if getattr(l, "language", None) == "en"),
-            pretty(cls),
-        )
-        class_info[cls] = dict(
-            label=label, subclasses=0, obj_props=0, relations=0, uri=str(cls)
-        )
+class TermInterner:
+    """Maps RDF terms to dense integer ids (and back) so triples can live in NumPy arrays."""
+
+    def __init__(self):
+        self.ids = {}
+        self.terms = []
+
+    def __len__(self):
+        return len(self.terms)
+
+    def id(self, term) -> int:
+        term_id = self.ids.get(term)
+        if term_id is None:
+            term_id = self.ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def array(self, terms) -> np.ndarray:
+        return np.fromiter((self.id(t) for t in terms), dtype=np.int64)
 
-    for sub, _, sup in g.triples((None, RDFS.subClassOf, None)):
-        if sup in class_info and (sub, RDF.type, OWL.Class) in g:
-            class_info[sup]["subclasses"] += 1
-            class_info[sup]["relations"] += 1
-            class_info[sub]["relations"] += 1
-
-    for prop in g.subjects(RDF.type, OWL.ObjectProperty):
-        for cls in g.objects(prop, RDFS.domain):
-            if cls in class_info:
-                class_info[cls]["obj_props"] += 1
-                class_info[cls]["relations"] += 1
-        for cls in g.objects(prop, RDFS.range):
-            if cls in class_info:
-                class_info[cls]["obj_props"] += 1
-                class_info[cls]["relations"] += 1
-
-    for cls in class_info:
-        for rest in g.objects(cls, RDFS.subClassOf):
-            if (rest, RDF.type, OWL.Restriction) in g:
-                for p in [OWL.someValuesFrom, OWL.allValuesFrom, OWL.hasValue]:
-                    for tgt in g.objects(rest, p):
-                        if tgt in class_info:
-                            class_info[cls]["relations"] += 1
-                            class_info[tgt]["relations"] += 1
-
-    return pd.DataFrame([
-        dict(
-            Label=info["label"],
-            URI=info["uri"],
-            Subclasses=info["subclasses"],
-            ObjectProperties=info["obj_props"],
-            TotalRelations=info["relations"]
+    def pairs(self, g: Graph, predicate) -> tuple[np.ndarray, np.ndarray]:
+        """Subject and object id columns of every ``predicate`` triple in ``g``."""
+        flat = np.fromiter(
+            (self.id(term) for pair in g.subject_objects(predicate) for term in pair),
+            dtype=np.int64,
         )
-        for info in class_info.values()
-    ])
+        return flat[0::2], flat[1::2]
+
+    def mask(self, ids: np.ndarray) -> np.ndarray:
+        """Boolean membership array over all ids interned so far."""
+        result = np.zeros(len(self.terms), dtype=bool)
+        result[ids] = True
+        return result
+
+
+RESTRICTION_VALUE_PREDICATES = (OWL.someValuesFrom, OWL.allValuesFrom, OWL.hasValue)
+
+
+def build_class_stats(g: Graph) -> pd.DataFrame:
+    interner = TermInterner()
+
+    # Extract every relevant triple once, as columns of interned ids
+    typed_classes = interner.array(g.subjects(RDF.type, OWL.Class))
+    object_props = interner.array(g.subjects(RDF.type, OWL.ObjectProperty))
+    restrictions = interner.array(g.subjects(RDF.type, OWL.Restriction))
+    sub, sup = interner.pairs(g, RDFS.subClassOf)
+    dom_prop, dom_cls = interner.pairs(g, RDFS.domain)
+    rng_prop, rng_cls = interner.pairs(g, RDFS.range)
+    rest_values = [interner.pairs(g, p) for p in RESTRICTION_VALUE_PREDICATES]
+    rest_node = np.concatenate([node for node, _ in rest_values])
+    rest_target = np.concatenate([target for _, target in rest_values])
+
+    n = len(interner)
+    is_typed_class = interner.mask(typed_classes)
+    is_class = is_typed_class & np.fromiter(
+        (isinstance(t, URIRef) for t in interner.terms), dtype=bool, count=n
+    )
+    is_object_prop = interner.mask(object_props)
+    is_restriction = interner.mask(restrictions)
+
+    def count(ids):
+        return np.bincount(ids, minlength=n)
+
+    # Subclass links between classes
+    keep = is_class[sup] & is_typed_class[sub]
+    subclasses = count(sup[keep])
+    relations = subclasses + count(sub[keep & is_class[sub]])
+
+    # Object properties whose domain or range is a class
+    dom = dom_cls[is_object_prop[dom_prop] & is_class[dom_cls]]
+    rng = rng_cls[is_object_prop[rng_prop] & is_class[rng_cls]]
+    obj_props = count(dom) + count(rng)
+    relations += obj_props
+
+    # Restrictions on a class whose some/all/has value is a class
+    keep = is_class[sub] & is_restriction[sup]
+    class_restrictions = pd.DataFrame({"cls": sub[keep], "node": sup[keep]})
+    keep = is_class[rest_target]
+    restriction_targets = pd.DataFrame({"node": rest_node[keep], "tgt": rest_target[keep]})
+    links = class_restrictions.merge(restriction_targets, on="node")
+    relations += count(links["cls"].to_numpy()) + count(links["tgt"].to_numpy())
+
+    class_ids = np.flatnonzero(is_class)
+    classes = [interner.terms[i] for i in class_ids]
+    return pd.DataFrame(dict(
+        Label=[
+            next(
+                (str(l) for l in g.objects(cls, RDFS.label)
+                 if getattr(l, "language", None) == "en"),
+                pretty(cls),
+            )
+            for cls in classes
+        ],
+        URI=[str(cls) for cls in classes],
+        Subclasses=subclasses[class_ids],
+        ObjectProperties=obj_props[class_ids],
+        TotalRelations=relations[class_ids],
+    ))
+
+SUBCLASS_PRED = URIRef("subClassOf")
+
+
+def extract_edges(g: Graph, class_set: set[URIRef], interner: TermInterner = None) -> set[tuple]:
+    """
+    Return the class-to-class relations of ``g`` as (subject, predicate, object)
+    id tuples from ``interner``. Share one interner between versions so their
+    edge sets can be compared directly. Without an interner, the relations are
+    returned as URIRef triples.
+
+    Relations are object property domain x range pairs, subClassOf links
+    (predicate ``SUBCLASS_PRED``) and some/all/hasValue restrictions.
+    """
+    decode = interner is None
+    if decode:
+        interner = TermInterner()
+    term_id = interner.id
+
+    # One scan per predicate, keeping only what can end up in an edge: ranges that are
+    # classes and restrictions whose value is a class (their type and property are looked
+    # up only when a class is a subclass of them)
+    ranges, restriction_targets = {}, {}
+    for prop, cls in g.subject_objects(RDFS.range):
+        if cls in class_set:
+            ranges.setdefault(prop, []).append(term_id(cls))
+    for p in RESTRICTION_VALUE_PREDICATES:
+        for rest, tgt in g.subject_objects(p):
+            if tgt in class_set:
+                restriction_targets.setdefault(rest, []).append(term_id(tgt))
 
-def extract_edges(g: Graph, class_set: set[URIRef]) -> set[tuple]:
     edges = set()
-    for prop in g.subjects(RDF.type, OWL.ObjectProperty):
-        for d in g.objects(prop, RDFS.domain):
-            for r in g.objects(prop, RDFS.range):
-                if d in class_set and r in class_set:
-                    edges.add((d, prop, r))
-    for sub, _, sup in g.triples((None, RDFS.subClassOf, None)):
-        if sub in class_set and sup in class_set:
-            edges.add((sub, URIRef("subClassOf"), sup))
-    for cls in class_set:
-        for rest in g.objects(cls, RDFS.subClassOf):
-            if (rest, RDF.type, OWL.Restriction) in g:
-                prop = next(g.objects(rest, OWL.onProperty), None)
-                if prop:
-                    for p in [OWL.someValuesFrom, OWL.allValuesFrom, OWL.hasValue]:
-                        for tgt in g.objects(rest, p):
-                            if tgt in class_set:
-                                edges.add((cls, prop, tgt))
+    for prop, cls in g.subject_objects(RDFS.domain):
+        if cls in class_set and prop in ranges and (prop, RDF.type, OWL.ObjectProperty) in g:
+            d, prop_id = term_id(cls), term_id(prop)
+            edges.update((d, prop_id, r) for r in ranges[prop])
+    del ranges
+
+    subclass_pred = term_id(SUBCLASS_PRED)
+    for sub, sup in g.subject_objects(RDFS.subClassOf):
+        if sub not in class_set:
+            continue
+        if sup in class_set:
+            edges.add((term_id(sub), subclass_pred, term_id(sup)))
+            continue
+        targets = restriction_targets.get(sup)
+        if targets is None or (sup, RDF.type, OWL.Restriction) not in g:
+            continue
+        prop = g.value(sup, OWL.onProperty)
+        if prop is not None:
+            sub_id, prop_id = term_id(sub), term_id(prop)
+            edges.update((sub_id, prop_id, tgt) for tgt in targets)
+    if decode:
+        terms = interner.terms
+        return {(terms[s], terms[p], terms[o]) for s, p, o in edges}
     return edges
 
 
-def class_nice_view(g, class_uri):
+def class_nice_view(g, class_uri, labels=None):
     """
     Return a human-readable Markdown block for a class, showing:
     - URI
     - English label
     - English description
     - Superclasses (as prefixed names)
+    ``labels`` is the LabelResolver of ``g`` (built from it when omitted).
     """
-    prefix_map = {
-        "http://www.ebu.ch/metadata/ontologies/ebucoreplus#": "ec:",
-        "http://purl.org/dc/terms/": "dcterms:",
-        "http://www.w3.org/2004/02/skos/core#": "skos:",
-        "http://www.w3.org/2002/07/owl#": "owl:",
-        "http://www.w3.org/2000/01/rdf-schema#": "rdfs:",
-    }
-    def prefixed(uri):
-        s = str(uri)
-        for ns, prefix in prefix_map.items():
-            if s.startswith(ns):
-                return s.replace(ns, prefix)
-        return f"<{s}>"
+    labels = labels or LabelResolver.from_graph(g)
+    supers = [s for s in g.objects(URIRef(class_uri), RDFS.subClassOf) if isinstance(s, URIRef)]
+    return format_class_view(class_uri, labels, supers)
+
+
+def format_class_view(class_uri, labels, supers):
+    """Markdown block of class_nice_view, from a LabelResolver and the named superclasses."""
     c = URIRef(class_uri)
     lines = []
     # URI
     lines.append(f"**URI:** [{class_uri}]({class_uri})")
     # English label
-    label = next((l for l in g.objects(c, RDFS.label) if getattr(l, 'language', None) == 'en'), None)
+    label = next(iter(labels.labels_en.get(c, ())), None)
     if label:
         lines.append(f"**Label:** {label}")
     # English description
-    desc = next((d for d in g.objects(c, URIRef('http://purl.org/dc/terms/description')) if getattr(d, 'language', None) == 'en'), None)
+    desc = next(iter(labels.descriptions_en.get(c, ())), None)
     if desc:
         lines.append(f"**Description:** {desc}")
     # Superclasses
-    supers = [s for s in g.objects(c, RDFS.subClassOf) if isinstance(s, URIRef)]
     if supers:
-        lines.append(f"**Superclass{'es' if len(supers)>1 else ''}:** " + ", ".join(prefixed(s) for s in supers))
+        lines.append(f"**Superclass{'es' if len(supers)>1 else ''}:** " + ", ".join(labels.prefixed(s) for s in supers))
     return "\n\n".join(lines)
 
 
+def object_properties_by_class(g):
+    """
+    Map every class to the set of owl:ObjectProperty URIs that have it as
+    rdfs:domain or rdfs:range, in one sweep over the domain/range triples.
+    """
+    object_props = set(g.subjects(RDF.type, OWL.ObjectProperty))
+    by_class = defaultdict(set)
+    for predicate in (RDFS.domain, RDFS.range):
+        for prop, cls in g.subject_objects(predicate):
+            if prop in object_props:
+                by_class[cls].add(prop)
+    return by_class
+
+
+def compare_object_properties_batch(g_new, g_old, class_uris):
+    """
+    Return {class_uri: (added, removed)} object property sets for many classes,
+    sweeping each graph once instead of once per class.
+    """
+    return object_property_deltas(object_properties_by_class(g_new), object_properties_by_class(g_old), class_uris)
+
+
+def object_property_deltas(new_by_class, old_by_class, class_uris):
+    """compare_object_properties_batch on precomputed object_properties_by_class maps."""
+    deltas = {}
+    for class_uri in class_uris:
+        c = URIRef(class_uri)
+        new_props = new_by_class.get(c, set())
+        old_props = old_by_class.get(c, set())
+        deltas[class_uri] = (new_props - old_props, old_props - new_props)
+    return deltas
+
+
 def compare_object_properties(g_new, g_old, class_uri):
     """
     Return sets of object property URIs where class_uri is in domain or range,
     and show which were added or removed.
     """
-    def obj_props(graph):
-        props = set()
-        c = URIRef(class_uri)
-        for p in graph.subjects(RDF.type, OWL.ObjectProperty):
-            if (p, RDFS.domain, c) in graph or (p, RDFS.range, c) in graph:
-                props.add(p)
-        return props
-
-    new_props = obj_props(g_new)
-    old_props = obj_props(g_old)
-    added = new_props - old_props
-    removed = old_props - new_props
-    return added, removed
+    return compare_object_properties_batch(g_new, g_old, [class_uri])[class_uri]
+
+
+def class_status(row):
+    if pd.isna(row["Label_old"]):
+        return "New"
+    if pd.isna(row["Label_new"]):
+        return "Removed"
+    if row["Subclasses_new"] != row["Subclasses_old"] or row["TotalRelations_new"] != row["TotalRelations_old"]:
+        return "Modified"
+    return "Unchanged"
+
+
+def group_relation_changes(added, removed):
+    """
+    Bucket added/removed (subject, predicate, object) relations by endpoint:
+    class -> (added, removed). subClassOf links are left out.
+    """
+    changes = defaultdict(lambda: ([], []))
+    for slot, edges in ((0, added), (1, removed)):
+        for edge in edges:
+            subj, pred, obj = edge
+            if pred == SUBCLASS_PRED:
+                continue
+            changes[subj][slot].append(edge)
+            if obj != subj:
+                changes[obj][slot].append(edge)
+    return {cls: (sorted(a), sorted(r)) for cls, (a, r) in changes.items()}
+
+
+def relation_changes_frame(relation_changes, class_labels=None):
+    """Flat table (one row per class and changed relation) for exports."""
+    class_labels = class_labels or {}
+    rows = []
+    for cls, (added, removed) in relation_changes.items():
+        for change, edges in (("Added", added), ("Removed", removed)):
+            for subj, pred, obj in edges:
+                rows.append({
+                    "Class": class_labels.get(cls, pretty(cls)),
+                    "Change": change,
+                    "Subject": pretty(subj),
+                    "Predicate": pretty(pred),
+                    "Object": pretty(obj),
+                    "Class URI": str(cls),
+                    "Subject URI": str(subj),
+                    "Predicate URI": str(pred),
+                    "Object URI": str(obj),
+                })
+    return pd.DataFrame(rows, columns=[
+        "Class", "Change", "Subject", "Predicate", "Object",
+        "Class URI", "Subject URI", "Predicate URI", "Object URI",
+    ]).sort_values(["Class", "Change", "Subject", "Predicate", "Object"], ignore_index=True)
+
+
+@dataclass(frozen=True)
+class VersionSummary:
+    """
+    Compact, picklable digest of one ontology version: everything compute_diff and
+    the app need, without the rdflib Graph. Built by summarize_version, possibly in
+    a worker process (see ontodiff.summarize_versions).
+    """
+    class_stats: pd.DataFrame   # build_class_stats output; copy before adding columns
+    terms: tuple                # term table of this version: id -> URIRef
+    edges: np.ndarray           # extract_edges relations as an (n, 3) array of ids into ``terms``
+    object_properties: dict     # class -> set of object properties with it as domain or range
+    superclasses: dict          # class -> tuple of rdfs:subClassOf objects (restrictions included)
+    subclasses: dict            # URIRef -> tuple of subclasses typed owl:Class
+    labels: dict                # LabelResolver tables (see label_resolver)
+    labels_en: dict
+    descriptions_en: dict
+
+    def label_resolver(self):
+        return LabelResolver(self.labels, self.labels_en, self.descriptions_en)
+
+    def edge_triples(self):
+        """The relations as a set of (subject, predicate, object) URIRef triples."""
+        terms = self.terms
+        return {(terms[s], terms[p], terms[o]) for s, p, o in self.edges.tolist()}
+
+    def class_view(self, class_uri, labels=None):
+        """class_nice_view of ``class_uri`` in this version."""
+        labels = labels or self.label_resolver()
+        supers = [s for s in self.superclasses.get(URIRef(class_uri), ()) if isinstance(s, URIRef)]
+        return format_class_view(class_uri, labels, supers)
+
+
+def align_terms(old_terms, new_terms):
+    """
+    Interner holding ``old_terms`` with their ids unchanged, plus an id array
+    mapping each id of ``new_terms`` into it.
+    """
+    interner = TermInterner()
+    interner.terms = list(old_terms)
+    interner.ids = {term: i for i, term in enumerate(old_terms)}
+    remap = np.fromiter((interner.id(term) for term in new_terms), dtype=np.int32, count=len(new_terms))
+    return interner, remap
+
+
+def summarize_version(g: Graph) -> VersionSummary:
+    """Run the per-version half of the diff (stats, edges, properties, labels) on ``g``."""
+    class_stats = build_class_stats(g)
+    interner = TermInterner()
+    edges = extract_edges(g, {URIRef(u) for u in class_stats["URI"]}, interner)
+
+    typed_classes = set(g.subjects(RDF.type, OWL.Class))
+    superclasses = defaultdict(list)
+    subclasses = defaultdict(list)
+    for sub, sup in g.subject_objects(RDFS.subClassOf):
+        superclasses[sub].append(sup)
+        if sub in typed_classes:
+            subclasses[sup].append(sub)
+
+    labels = LabelResolver.from_graph(g)
+    return VersionSummary(
+        class_stats=class_stats,
+        terms=tuple(interner.terms),
+        edges=np.array(sorted(edges), dtype=np.int32).reshape(-1, 3),
+        object_properties=dict(object_properties_by_class(g)),
+        superclasses={cls: tuple(sups) for cls, sups in superclasses.items()},
+        subclasses={cls: tuple(subs) for cls, subs in subclasses.items()},
+        labels=labels.labels,
+        labels_en=labels.labels_en,
+        descriptions_en=labels.descriptions_en,
+    )
+
+
+@dataclass
+class DiffResult:
+    """
+    Everything the diff views render, computed once per pair of ontology versions.
+    Treat it as read-only: the app shares one instance across reruns and sessions.
+    """
+    old: VersionSummary
+    new: VersionSummary
+    df_old: pd.DataFrame
+    df_new: pd.DataFrame
+    cmp: pd.DataFrame           # outer merge of both class tables, with a Status column
+    new_nodes: set              # URIs (str) of classes only in the new version
+    removed_nodes: set          # URIs (str) of classes only in the old version
+    interner: TermInterner      # decodes the integer ids used in the edge sets
+    edges_old: set
+    edges_new: set
+    added_edges: set
+    removed_edges: set
+    property_deltas: dict       # URI (str) of each modified class -> (added, removed) object properties
+    relation_changes: dict      # class URIRef -> (added, removed) decoded relations, subClassOf excluded
+    class_labels: dict          # class URIRef -> label (old label wins when a class is in both versions)
+    labels_old: LabelResolver
+    labels_new: LabelResolver
+
+    def decode_edges(self, edges):
+        """Turn id-tuple edges back into (subject, predicate, object) URIRef triples."""
+        terms = self.interner.terms
+        return [(terms[s], terms[p], terms[o]) for s, p, o in edges]
+
+
+def compute_diff(g_old: Graph, g_new: Graph) -> DiffResult:
+    return diff_summaries(summarize_version(g_old), summarize_version(g_new))
+
+
+def diff_summaries(old: VersionSummary, new: VersionSummary) -> DiffResult:
+    """Compare two version summaries (the cross-version half of compute_diff)."""
+    df_old = old.class_stats.copy()
+    df_new = new.class_stats.copy()
+
+    # --- diff of classes --------------------------------------------------
+    df_old["key"] = df_old["URI"]
+    df_new["key"] = df_new["URI"]
+
+    cmp = df_new.merge(df_old, on="key", how="outer", suffixes=("_new", "_old"))
+    cmp["Status"] = cmp.apply(class_status, axis=1)
+
+    valid_uris = set(df_new["URI"])
+    new_nodes = {
+        uri for uri in cmp.loc[cmp["Status"] == "New", "URI_new"]
+        if uri in valid_uris
+    }
+    removed_nodes = set(cmp.loc[cmp["Status"] == "Removed", "URI_old"])
+
+    df_old["Domain"] = df_old["URI"].map(label2dom).fillna("Other")
+    df_new["Domain"] = df_new["URI"].map(label2dom).fillna("Other")
+
+    # --- diff of relations ------------------------------------------------
+    # One id space for both versions: the old term table as is, new ids mapped into it
+    interner, remap = align_terms(old.terms, new.terms)
+    edges_old = set(map(tuple, old.edges.tolist()))
+    edges_new = set(map(tuple, remap[new.edges].tolist()))
+
+    terms = interner.terms
+    added_edges = edges_new - edges_old
+    removed_edges = edges_old - edges_new
+    relation_changes = group_relation_changes(
+        [(terms[s], terms[p], terms[o]) for s, p, o in added_edges],
+        [(terms[s], terms[p], terms[o]) for s, p, o in removed_edges],
+    )
+    class_labels = {URIRef(u): lbl for u, lbl in zip(df_new["URI"], df_new["Label"])}
+    class_labels.update({URIRef(u): lbl for u, lbl in zip(df_old["URI"], df_old["Label"])})
+
+    property_deltas = object_property_deltas(
+        new.object_properties, old.object_properties,
+        [uri for uri in cmp.loc[cmp["Status"] == "Modified", "URI_new"] if pd.notna(uri)],
+    )
+
+    return DiffResult(
+        old=old,
+        new=new,
+        df_old=df_old,
+        df_new=df_new,
+        cmp=cmp,
+        new_nodes=new_nodes,
+        removed_nodes=removed_nodes,
+        interner=interner,
+        edges_old=edges_old,
+        edges_new=edges_new,
+        added_edges=added_edges,
+        removed_edges=removed_edges,
+        property_deltas=property_deltas,
+        relation_changes=relation_changes,
+        class_labels=class_labels,
+        labels_old=old.label_resolver(),
+        labels_new=new.label_resolver(),
+    )
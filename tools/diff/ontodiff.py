@@ -0,0 +1,258 @@
+"""
+Headless ontology diff for CI pipelines.
+
+Compares two ontology versions with the same helpers as the Streamlit app and
+writes the class status table, added/removed relations and per-class object
+property changes as JSON Lines or CSV. Run from the tools/diff directory:
+
+    python -m ontodiff example_data/ebucoreplus_1.owl example_data/ebucoreplus_2.owl
+    python -m ontodiff old.ttl new.ttl --format csv --output diff.csv
+
+Exit status is 0 when nothing was removed, 1 when any class, relation or
+object property was removed, and 2 on usage or parse errors.
+
+Set DIFF_WORKERS to 2 or more to parse and summarize the versions (class stats,
+relations, object properties) in parallel worker processes; by default they are
+summarized in-process.
+"""
+
+import argparse
+import csv
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ontocommon.formats import FORMAT_NAMES, sniff_format
+from ontocommon.graph_cache import load_graph
+from ontocommon.shared_graphs import get_shared_graphs
+from helpers import diff_summaries, summarize_version
+
+logger = logging.getLogger(__name__)
+
+FIELDNAMES = [
+    "record", "status", "uri", "label",
+    "subject", "predicate", "object", "property",
+    "subclasses_old", "subclasses_new",
+    "object_properties_old", "object_properties_new",
+    "total_relations_old", "total_relations_new",
+]
+
+
+def parse_graph(data, filename=None):
+    """
+    Parse Turtle, RDF/XML, N-Triples or JSON-LD bytes/str into a schema-only Graph
+    (instance data is dropped while parsing). The format is sniffed from the content
+    (``filename`` breaks ties), so the file is parsed once; raise ValueError for
+    unsupported formats and parse errors. The graph is the read-only one shared by
+    the whole process for this file content.
+    """
+    rdf_format = sniff_format(data, filename)
+    try:
+        return get_shared_graphs().get(data, rdf_format, schema_only=True).graph
+    except Exception as e:
+        raise _parse_error(rdf_format, e) from e
+
+
+def _parse_error(rdf_format, e):
+    # rdflib syntax errors quote a large chunk of the input; keep the position and reason
+    detail = " ".join(str(e).strip().splitlines()[:2])[:300] or type(e).__name__
+    return ValueError(f"could not parse as {FORMAT_NAMES[rdf_format]}: {detail}")
+
+
+def summarize_data(data, filename=None):
+    """
+    Worker half of the diff: parse one version and return its VersionSummary.
+    The graph is loaded privately (through the on-disk parse cache) and dropped
+    with the summary's return, so long-lived workers hold no ontologies.
+    """
+    rdf_format = sniff_format(data, filename)
+    try:
+        g = load_graph(data, rdf_format, schema_only=True)
+    except Exception as e:
+        # Without the rdflib cause, which need not survive pickling back to the parent
+        raise _parse_error(rdf_format, e) from None
+    return summarize_version(g)
+
+
+_pool = None
+_pool_workers = 0
+_pool_lock = threading.Lock()
+
+
+def _worker_count(jobs):
+    # Opt-in: starting spawn workers costs more than it saves on small ontologies
+    # or few cores, so the default is to stay in-process
+    workers = int(os.environ.get("DIFF_WORKERS") or 1)
+    return max(1, min(jobs, workers))
+
+
+def _get_pool(workers):
+    # One pool per process, reused by later diffs; "spawn" keeps workers free of
+    # the parent's threads (Streamlit) and loaded graphs
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is None or _pool_workers < workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            _pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+            _pool_workers = workers
+        return _pool
+
+
+def _reset_pool():
+    global _pool, _pool_workers
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+        _pool_workers = 0
+
+
+def summarize_versions(versions, workers=None):
+    """
+    Return the VersionSummary of every (data, filename) in ``versions``. With more
+    than one worker (``workers`` defaults to DIFF_WORKERS, else 1) they are computed
+    in parallel worker processes; otherwise, or when no process pool can be
+    started, in-process from the shared graphs.
+    """
+    versions = list(versions)
+    workers = workers or _worker_count(len(versions))
+    if workers > 1 and len(versions) > 1:
+        try:
+            pool = _get_pool(workers)
+            futures = [pool.submit(summarize_data, data, filename) for data, filename in versions]
+            return [future.result() for future in futures]
+        except (BrokenProcessPool, OSError) as e:
+            logger.warning("Process pool unavailable (%s); summarizing versions in-process", e)
+            _reset_pool()
+    return [summarize_version(parse_graph(data, filename)) for data, filename in versions]
+
+
+def diff_versions(data_old, data_new, filename_old=None, filename_new=None):
+    """Return the DiffResult of two ontology versions given as bytes/str."""
+    old, new = summarize_versions([(data_old, filename_old), (data_new, filename_new)])
+    return diff_summaries(old, new)
+
+
+def read_file(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def load_file(path):
+    return parse_graph(read_file(path), path)
+
+
+def diff_files(path_old, path_new):
+    """Return the DiffResult for two ontology files."""
+    return diff_versions(read_file(path_old), read_file(path_new), path_old, path_new)
+
+
+def _count(value):
+    return None if pd.isna(value) else int(value)
+
+
+def iter_records(diff, include_unchanged=False):
+    """Yield flat dicts (keys from FIELDNAMES) describing every change in ``diff``."""
+    for _, row in diff.cmp.sort_values("key").iterrows():
+        if row["Status"] == "Unchanged" and not include_unchanged:
+            continue
+        uri = row["URI_new"] if pd.notna(row["URI_new"]) else row["URI_old"]
+        label = row["Label_new"] if pd.notna(row["Label_new"]) else row["Label_old"]
+        yield {
+            "record": "class",
+            "status": row["Status"],
+            "uri": uri,
+            "label": label,
+            "subclasses_old": _count(row["Subclasses_old"]),
+            "subclasses_new": _count(row["Subclasses_new"]),
+            "object_properties_old": _count(row["ObjectProperties_old"]),
+            "object_properties_new": _count(row["ObjectProperties_new"]),
+            "total_relations_old": _count(row["TotalRelations_old"]),
+            "total_relations_new": _count(row["TotalRelations_new"]),
+        }
+    for status, edges in (("Added", diff.added_edges), ("Removed", diff.removed_edges)):
+        for subj, pred, obj in sorted(diff.decode_edges(edges)):
+            yield {
+                "record": "relation",
+                "status": status,
+                "subject": str(subj),
+                "predicate": str(pred),
+                "object": str(obj),
+            }
+    for uri in sorted(diff.property_deltas):
+        added, removed = diff.property_deltas[uri]
+        for status, props in (("Added", added), ("Removed", removed)):
+            for prop in sorted(props):
+                yield {
+                    "record": "object_property",
+                    "status": status,
+                    "uri": uri,
+                    "property": str(prop),
+                }
+
+
+def has_removals(diff):
+    return bool(
+        diff.removed_nodes
+        or diff.removed_edges
+        or any(removed for _, removed in diff.property_deltas.values())
+    )
+
+
+def write_jsonl(records, out):
+    for record in records:
+        out.write(json.dumps({k: v for k, v in record.items() if v is not None}, ensure_ascii=False))
+        out.write("\n")
+
+
+def write_csv(records, out):
+    writer = csv.DictWriter(out, fieldnames=FIELDNAMES)
+    writer.writeheader()
+    writer.writerows(records)
+
+
+WRITERS = {"jsonl": write_jsonl, "csv": write_csv}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ontodiff", description="Compare two ontology versions.")
+    parser.add_argument("old", help="old ontology version (Turtle, RDF/XML, N-Triples or JSON-LD)")
+    parser.add_argument("new", help="new ontology version (Turtle, RDF/XML, N-Triples or JSON-LD)")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="jsonl", help="output format (default: jsonl)")
+    parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    parser.add_argument("--include-unchanged", action="store_true", help="also list unchanged classes")
+    args = parser.parse_args(argv)
+
+    try:
+        diff = diff_files(args.old, args.new)
+    except (OSError, ValueError) as e:
+        print(f"ontodiff: {e}", file=sys.stderr)
+        return 2
+
+    records = iter_records(diff, include_unchanged=args.include_unchanged)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as out:
+            WRITERS[args.format](records, out)
+    else:
+        WRITERS[args.format](records, sys.stdout)
+
+    print(
+        f"ontodiff: {len(diff.new_nodes)} new, {len(diff.removed_nodes)} removed, "
+        f"{len(diff.property_deltas)} modified classes; "
+        f"{len(diff.added_edges)} added, {len(diff.removed_edges)} removed relations",
+        file=sys.stderr,
+    )
+    return 1 if has_removals(diff) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
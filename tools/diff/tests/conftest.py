@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+from rdflib import Graph
+
+TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, TOOL_DIR)
+sys.path.insert(0, os.path.join(TOOL_DIR, "benchmarks"))
+sys.path.insert(0, os.path.join(TOOL_DIR, ".."))
+
+EXAMPLE_DATA = os.path.join(TOOL_DIR, "example_data")
+OLD_VERSION = os.path.join(EXAMPLE_DATA, "ebucoreplus_1.owl")
+NEW_VERSION = os.path.join(EXAMPLE_DATA, "ebucoreplus_2.owl")
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cache_dir(tmp_path_factory):
+    # Keep the parse cache of the test run out of ~/.cache
+    directory = str(tmp_path_factory.mktemp("graph-cache"))
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("ONTOLOGY_CACHE_DIR", directory)
+        mp.setattr("ontocommon.graph_cache._default_cache", None)
+        yield directory
+
+
+@pytest.fixture(scope="session")
+def example_versions():
+    return OLD_VERSION, NEW_VERSION
+
+
+@pytest.fixture(scope="session")
+def graph_old():
+    return Graph().parse(OLD_VERSION, format="turtle")
+
+
+@pytest.fixture(scope="session")
+def graph_new():
+    return Graph().parse(NEW_VERSION, format="turtle")
+
+
+@pytest.fixture(scope="session", params=["old", "new"])
+def graph(request, graph_old, graph_new):
+    return graph_old if request.param == "old" else graph_new
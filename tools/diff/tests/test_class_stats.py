@@ -0,0 +1,47 @@
+from rdflib import RDF, RDFS, OWL, URIRef
+
+from helpers import build_class_stats, pretty
+
+
+def build_class_stats_reference(g):
+    # Previous implementation, one graph lookup per class / property / restriction
+    info = {}
+    for cls in {c for c in g.subjects(RDF.type, OWL.Class) if isinstance(c, URIRef)}:
+        info[cls] = dict(Subclasses=0, ObjectProperties=0, TotalRelations=0)
+
+    for sub, sup in g.subject_objects(RDFS.subClassOf):
+        if sup in info and (sub, RDF.type, OWL.Class) in g:
+            info[sup]["Subclasses"] += 1
+            info[sup]["TotalRelations"] += 1
+            info[sub]["TotalRelations"] += 1
+
+    for prop in g.subjects(RDF.type, OWL.ObjectProperty):
+        for cls in list(g.objects(prop, RDFS.domain)) + list(g.objects(prop, RDFS.range)):
+            if cls in info:
+                info[cls]["ObjectProperties"] += 1
+                info[cls]["TotalRelations"] += 1
+
+    for cls in info:
+        for rest in g.objects(cls, RDFS.subClassOf):
+            if (rest, RDF.type, OWL.Restriction) in g:
+                for p in (OWL.someValuesFrom, OWL.allValuesFrom, OWL.hasValue):
+                    for tgt in g.objects(rest, p):
+                        if tgt in info:
+                            info[cls]["TotalRelations"] += 1
+                            info[tgt]["TotalRelations"] += 1
+    return {str(cls): counts for cls, counts in info.items()}
+
+
+def test_counts_match_reference(graph):
+    stats = build_class_stats(graph)
+    assert list(stats.columns) == ["Label", "URI", "Subclasses", "ObjectProperties", "TotalRelations"]
+    assert stats["URI"].is_unique
+    counts = stats.set_index("URI")[["Subclasses", "ObjectProperties", "TotalRelations"]]
+    assert counts.to_dict("index") == build_class_stats_reference(graph)
+
+
+def test_labels_are_english_labels_or_prefixed_names(graph):
+    stats = build_class_stats(graph)
+    for uri, label in zip(stats["URI"], stats["Label"]):
+        english = {str(l) for l in graph.objects(URIRef(uri), RDFS.label) if getattr(l, "language", None) == "en"}
+        assert label in english if english else label == pretty(URIRef(uri))
@@ -0,0 +1,43 @@
+from rdflib import URIRef
+
+from bench_extract_edges import extract_edges_legacy
+from helpers import TermInterner, build_class_stats, extract_edges, summarize_version
+
+
+def class_set(g):
+    return {URIRef(uri) for uri in build_class_stats(g)["URI"]}
+
+
+def test_edges_match_previous_implementation(graph):
+    classes = class_set(graph)
+    assert extract_edges(graph, classes) == extract_edges_legacy(graph, classes)
+
+
+def test_interned_edges_decode_to_uriref_triples(graph):
+    classes = class_set(graph)
+    interner = TermInterner()
+    edges = extract_edges(graph, classes, interner)
+    terms = interner.terms
+    assert {(terms[s], terms[p], terms[o]) for s, p, o in edges} == extract_edges(graph, classes)
+
+
+def test_shared_interner_gives_the_same_delta(graph_old, graph_new):
+    classes_old, classes_new = class_set(graph_old), class_set(graph_new)
+    legacy_old = extract_edges_legacy(graph_old, classes_old)
+    legacy_new = extract_edges_legacy(graph_new, classes_new)
+
+    interner = TermInterner()
+    edges_new = extract_edges(graph_new, classes_new, interner)
+    edges_old = extract_edges(graph_old, classes_old, interner)
+    terms = interner.terms
+
+    def decode(edges):
+        return {(terms[s], terms[p], terms[o]) for s, p, o in edges}
+
+    assert decode(edges_new - edges_old) == legacy_new - legacy_old
+    assert decode(edges_old - edges_new) == legacy_old - legacy_new
+
+
+def test_summary_edges_decode_to_the_same_triples(graph):
+    summary = summarize_version(graph)
+    assert set(summary.edge_triples()) == extract_edges_legacy(graph, class_set(graph))
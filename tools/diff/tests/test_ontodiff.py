@@ -0,0 +1,96 @@
+import csv
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import ontodiff
+from ontodiff import FIELDNAMES, main
+
+PREFIXES = """\
+@prefix : <urn:test#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+"""
+BASE = PREFIXES + """
+:Asset a owl:Class ; rdfs:label "Asset"@en .
+:Clip a owl:Class ; rdfs:label "Clip"@en ; rdfs:subClassOf :Asset .
+"""
+EXTENDED = BASE + """
+:Series a owl:Class ; rdfs:label "Series"@en ; rdfs:subClassOf :Asset .
+"""
+
+
+@pytest.fixture
+def versions(tmp_path):
+    paths = {}
+    for name, text in (("base.ttl", BASE), ("extended.ttl", EXTENDED), ("broken.ttl", PREFIXES + ":Asset a ")):
+        paths[name] = tmp_path / name
+        paths[name].write_text(text, encoding="utf-8")
+    return {name: str(path) for name, path in paths.items()}
+
+
+def run(capsys, *argv):
+    code = main(list(argv))
+    out, err = capsys.readouterr()
+    return code, out, err
+
+
+def test_identical_versions_exit_0(capsys, versions):
+    code, out, err = run(capsys, versions["base.ttl"], versions["base.ttl"])
+    assert code == 0
+    assert out == ""
+    assert "0 new, 0 removed" in err
+
+
+def test_additions_only_exit_0(capsys, versions):
+    code, out, _ = run(capsys, versions["base.ttl"], versions["extended.ttl"])
+    assert code == 0
+    records = [json.loads(line) for line in out.splitlines()]
+    assert {"record": "class", "status": "New", "uri": "urn:test#Series", "label": "Series",
+            "subclasses_new": 0, "object_properties_new": 0, "total_relations_new": 1} in records
+    assert {"record": "relation", "status": "Added", "subject": "urn:test#Series",
+            "predicate": "subClassOf", "object": "urn:test#Asset"} in records
+
+
+def test_removals_exit_1(capsys, versions):
+    code, out, _ = run(capsys, versions["extended.ttl"], versions["base.ttl"])
+    assert code == 1
+    statuses = {(r["record"], r["status"]) for r in map(json.loads, out.splitlines())}
+    assert ("class", "Removed") in statuses and ("relation", "Removed") in statuses
+
+
+@pytest.mark.parametrize("bad", ["broken.ttl", "missing.ttl"])
+def test_unreadable_input_exit_2(capsys, versions, tmp_path, bad):
+    path = versions.get(bad, str(tmp_path / bad))
+    code, out, err = run(capsys, versions["base.ttl"], path)
+    assert code == 2
+    assert out == ""
+    assert err.startswith("ontodiff: ")
+
+
+def test_csv_output_file(capsys, versions, tmp_path):
+    output = tmp_path / "diff.csv"
+    code, out, _ = run(capsys, versions["base.ttl"], versions["extended.ttl"], "--format", "csv",
+                       "--output", str(output), "--include-unchanged")
+    assert code == 0 and out == ""
+    with open(output, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == FIELDNAMES
+    assert {(row["uri"], row["status"]) for row in rows if row["record"] == "class"} == {
+        ("urn:test#Asset", "Modified"), ("urn:test#Clip", "Unchanged"), ("urn:test#Series", "New"),
+    }
+
+
+def test_command_line_on_example_versions(cache_dir, example_versions):
+    result = subprocess.run(
+        [sys.executable, "-m", "ontodiff", *example_versions],
+        cwd=os.path.dirname(ontodiff.__file__), capture_output=True, text=True,
+        env={**os.environ, "ONTOLOGY_CACHE_DIR": cache_dir},
+    )
+    assert result.returncode == 1
+    assert "ontodiff: 29 new, 40 removed, 131 modified classes; 168 added, 176 removed relations" in result.stderr
+    records = [json.loads(line) for line in result.stdout.splitlines()]
+    assert sum(r["record"] == "class" and r["status"] == "Removed" for r in records) == 40
@@ -0,0 +1,119 @@
+import pandas as pd
+import pytest
+
+import timeline
+from timeline import TimelineCache, build_timeline, compare_versions, version_names
+
+PREFIXES = """\
+@prefix : <urn:test#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+"""
+
+
+def ontology(*subclasses):
+    # Class A, plus one subclass of A per name
+    lines = [PREFIXES, ':A a owl:Class ; rdfs:label "A"@en .']
+    lines += [f':{name} a owl:Class ; rdfs:label "{name}"@en ; rdfs:subClassOf :A .' for name in subclasses]
+    return "\n".join(lines).encode("utf-8")
+
+
+# C is removed in v2 and comes back in v3, D only exists in v2, E is new in v3 (A gains a subclass)
+VERSIONS = [
+    (ontology("B", "C"), "v1.ttl"),
+    (ontology("B", "D"), "v2.ttl"),
+    (ontology("B", "C", "E"), "v3.ttl"),
+]
+NAMES = ["v1.ttl", "v2.ttl", "v3.ttl"]
+
+
+def uri(name):
+    return f"urn:test#{name}"
+
+
+@pytest.fixture
+def result():
+    return TimelineCache().timeline(VERSIONS)
+
+
+def test_class_matrix(result):
+    matrix = result.class_matrix
+    assert list(matrix.columns) == ["Label", "Domain"] + NAMES
+    assert matrix.loc[uri("A"), NAMES].tolist() == ["Present", "Unchanged", "Modified"]
+    assert matrix.loc[uri("B"), NAMES].tolist() == ["Present", "Unchanged", "Unchanged"]
+    assert matrix.loc[uri("C"), NAMES].tolist() == ["Present", "Removed", "New"]
+    assert matrix.loc[uri("D"), NAMES].tolist() == ["", "New", "Removed"]
+    assert matrix.loc[uri("E"), NAMES].tolist() == ["", "", "New"]
+    assert matrix.loc[uri("E"), "Label"] == "E"
+    assert sorted(result.changed_classes().index) == [uri("A"), uri("C"), uri("D"), uri("E")]
+
+
+def test_relation_lifecycles(result):
+    expected = pd.DataFrame(
+        [
+            (uri("B"), "subClassOf", uri("A"), "v1.ttl", ""),
+            (uri("C"), "subClassOf", uri("A"), "v1.ttl", "v2.ttl"),
+            (uri("C"), "subClassOf", uri("A"), "v3.ttl", ""),
+            (uri("D"), "subClassOf", uri("A"), "v2.ttl", "v3.ttl"),
+            (uri("E"), "subClassOf", uri("A"), "v3.ttl", ""),
+        ],
+        columns=["Subject", "Predicate", "Object", "Introduced", "Removed"],
+    )
+    pd.testing.assert_frame_equal(result.relation_lifecycles, expected)
+
+
+def test_step_counts(result):
+    counts = result.step_counts().set_index("Step")
+    assert counts.loc["v1.ttl → v2.ttl"].tolist() == [1, 1, 0, 1, 1]
+    assert counts.loc["v2.ttl → v3.ttl"].tolist() == [2, 1, 1, 2, 1]
+
+
+def test_build_timeline_computes_missing_steps(result):
+    summaries = TimelineCache().summaries(VERSIONS)
+    rebuilt = build_timeline(NAMES, summaries)
+    pd.testing.assert_frame_equal(rebuilt.class_matrix, result.class_matrix)
+    pd.testing.assert_frame_equal(rebuilt.relation_lifecycles, result.relation_lifecycles)
+
+
+def test_adding_a_version_reuses_cached_work(monkeypatch):
+    summarized, compared = [], []
+
+    def counting_summarize(versions, summarize=timeline.summarize_versions):
+        summarized.append(len(versions))
+        return summarize(versions)
+
+    def counting_compare(old, new):
+        compared.append((old, new))
+        return compare_versions(old, new)
+
+    monkeypatch.setattr(timeline, "summarize_versions", counting_summarize)
+    monkeypatch.setattr(timeline, "compare_versions", counting_compare)
+
+    cache = TimelineCache()
+    cache.timeline(VERSIONS[:2])
+    assert (summarized, len(compared)) == ([2], 1)
+    cache.timeline(VERSIONS)
+    assert (summarized, len(compared)) == ([2, 1], 2)
+
+
+def test_version_names():
+    assert version_names(["a/v.ttl", "b/v.ttl", "c.ttl", None]) == ["v.ttl (1)", "v.ttl (2)", "c.ttl", "v4"]
+
+
+def test_command_line(tmp_path, capsys):
+    paths = []
+    for data, name in VERSIONS:
+        path = tmp_path / name
+        path.write_bytes(data)
+        paths.append(str(path))
+    output = tmp_path / "relations.csv"
+    assert timeline.main(paths + ["--relations", "--changed-only", "--output", str(output)]) == 0
+    frame = pd.read_csv(output, keep_default_na=False)
+    assert frame["Subject"].tolist() == [uri("C"), uri("C"), uri("D"), uri("E")]
+    assert "timeline: v1.ttl → v2.ttl: 1 new classes" in capsys.readouterr().err
+
+    broken = tmp_path / "broken.ttl"
+    broken.write_text(PREFIXES + ":A a ", encoding="utf-8")
+    assert timeline.main(paths[:1] + [str(broken)]) == 2
+    with pytest.raises(SystemExit):
+        timeline.main(paths[:1])
@@ -0,0 +1,256 @@
+"""
+Multi-version timeline: when each class and relation appeared, changed or disappeared.
+
+Versions are compared incrementally, each one against the next (v1→v2, v2→v3, ...),
+from their VersionSummary (class stats and edge sets), so N versions take N summaries
+and N-1 steps. Summaries and steps are cached by content hash, so adding a release to
+a timeline only computes the new summary and one step. Run from the tools/diff directory:
+
+    python -m timeline v1.owl v2.owl v3.owl --output class_matrix.csv
+    python -m timeline v1.owl v2.owl v3.owl --relations --output relations.csv
+
+Versions are taken in the order given (oldest first).
+"""
+
+import argparse
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import pandas as pd
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from ontocommon.graph_cache import content_hash
+from helpers import align_terms, class_status, label2dom, pretty
+from ontodiff import read_file, summarize_versions
+
+# Matrix cell of a class in the first version it is compared from
+PRESENT = "Present"
+CHANGE_STATUSES = ("New", "Modified", "Removed")
+DEFAULT_MAX_ENTRIES = 64
+
+
+@dataclass(frozen=True)
+class TimelineStep:
+    """Changes from one version to the next."""
+    class_status: dict          # class URI (str) -> New / Removed / Modified / Unchanged
+    added_edges: frozenset      # (subject, predicate, object) URIRefs
+    removed_edges: frozenset
+
+    def counts(self):
+        statuses = list(self.class_status.values())
+        return {
+            "New classes": statuses.count("New"),
+            "Removed classes": statuses.count("Removed"),
+            "Modified classes": statuses.count("Modified"),
+            "Added relations": len(self.added_edges),
+            "Removed relations": len(self.removed_edges),
+        }
+
+
+def compare_versions(old, new) -> TimelineStep:
+    """Class statuses and relation changes between two VersionSummary objects."""
+    cmp = new.class_stats.merge(old.class_stats, on="URI", how="outer", suffixes=("_new", "_old"))
+    statuses = cmp.apply(class_status, axis=1) if len(cmp) else pd.Series(dtype=object)
+    # Compare the integer edge sets; only the changed edges are decoded
+    interner, remap = align_terms(old.terms, new.terms)
+    edges_old = set(map(tuple, old.edges.tolist()))
+    edges_new = set(map(tuple, remap[new.edges].tolist()))
+    terms = interner.terms
+    return TimelineStep(
+        class_status=dict(zip(cmp["URI"], statuses)),
+        added_edges=frozenset((terms[s], terms[p], terms[o]) for s, p, o in edges_new - edges_old),
+        removed_edges=frozenset((terms[s], terms[p], terms[o]) for s, p, o in edges_old - edges_new),
+    )
+
+
+@dataclass
+class Timeline:
+    """
+    Lifecycles over ``versions`` (names, oldest first). ``class_matrix`` has one row
+    per class URI (Label, Domain, then one status column per version; empty while
+    the class is absent), ``relation_lifecycles`` one row per presence interval
+    of a relation (Introduced / Removed are version names, Removed is empty while
+    the relation is still present in the last version).
+    """
+    versions: list
+    steps: list                 # TimelineStep of versions[i] -> versions[i + 1]
+    class_matrix: pd.DataFrame
+    relation_lifecycles: pd.DataFrame
+
+    def step_counts(self):
+        return pd.DataFrame([
+            {"Step": f"{old} → {new}", **step.counts()}
+            for old, new, step in zip(self.versions, self.versions[1:], self.steps)
+        ])
+
+    def changed_classes(self):
+        """Rows of class_matrix for classes that were added, modified or removed at least once."""
+        changed = self.class_matrix[self.versions[1:]].isin(CHANGE_STATUSES).any(axis=1)
+        return self.class_matrix.loc[changed]
+
+
+def build_timeline(versions, summaries, steps=None) -> Timeline:
+    """
+    Assemble a Timeline from the per-version summaries (oldest first) and the steps
+    between consecutive versions (computed with compare_versions when not given).
+    Every step touches only the two versions it joins, so the cost is linear in N.
+    """
+    if steps is None:
+        steps = [compare_versions(old, new) for old, new in zip(summaries, summaries[1:])]
+
+    # --- class x version matrix -------------------------------------------
+    labels = {}
+    for summary in summaries:
+        labels.update(zip(summary.class_stats["URI"], summary.class_stats["Label"]))
+    columns = {versions[0]: pd.Series(PRESENT, index=summaries[0].class_stats["URI"], dtype=object)}
+    for name, step in zip(versions[1:], steps):
+        columns[name] = pd.Series(step.class_status, dtype=object)
+    matrix = pd.DataFrame(columns, index=sorted(labels)).fillna("")
+    matrix.insert(0, "Label", [labels[uri] for uri in matrix.index])
+    matrix.insert(1, "Domain", [label2dom.get(uri, "Other") for uri in matrix.index])
+    matrix.index.name = "URI"
+
+    # --- relation presence intervals ----------------------------------------
+    introduced = dict.fromkeys(summaries[0].edge_triples(), 0)
+    intervals = []
+    for i, step in enumerate(steps, start=1):
+        for edge in step.removed_edges:
+            intervals.append((edge, introduced.pop(edge), i))
+        for edge in step.added_edges:
+            introduced[edge] = i
+    intervals.extend((edge, start, None) for edge, start in introduced.items())
+    relations = pd.DataFrame(
+        [
+            (str(s), str(p), str(o), versions[start], versions[end] if end is not None else "")
+            for (s, p, o), start, end in intervals
+        ],
+        columns=["Subject", "Predicate", "Object", "Introduced", "Removed"],
+    ).sort_values(["Subject", "Predicate", "Object", "Introduced"], ignore_index=True)
+
+    return Timeline(list(versions), list(steps), matrix, relations)
+
+
+class TimelineCache:
+    """
+    Process-wide LRU of VersionSummary by content hash and of TimelineStep by pair
+    of hashes, so a timeline recomputes only what a new or changed version needs.
+    Missing summaries are computed together (in parallel, see summarize_versions).
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._summaries = OrderedDict()
+        self._steps = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, table, key):
+        with self._lock:
+            value = table.get(key)
+            if value is not None:
+                table.move_to_end(key)
+            return value
+
+    def _put(self, table, key, value):
+        with self._lock:
+            table[key] = value
+            while len(table) > self.max_entries:
+                table.popitem(last=False)
+
+    def summaries(self, versions, digests=None):
+        """VersionSummary of every (data, filename) in ``versions``."""
+        digests = digests or [content_hash(data) for data, _ in versions]
+        found = {digest: self._get(self._summaries, digest) for digest in digests}
+        missing = {digest: version for digest, version in zip(digests, versions) if found[digest] is None}
+        if missing:
+            for digest, summary in zip(missing, summarize_versions(missing.values())):
+                found[digest] = summary
+                self._put(self._summaries, digest, summary)
+        return [found[digest] for digest in digests]
+
+    def step(self, digest_old, digest_new, old, new):
+        key = (digest_old, digest_new)
+        step = self._get(self._steps, key)
+        if step is None:
+            step = compare_versions(old, new)
+            self._put(self._steps, key, step)
+        return step
+
+    def timeline(self, versions, names=None):
+        """Timeline of ``versions``, a list of (data, filename), oldest first."""
+        names = names or version_names([filename for _, filename in versions])
+        digests = [content_hash(data) for data, _ in versions]
+        summaries = self.summaries(versions, digests)
+        steps = [
+            self.step(digests[i], digests[i + 1], summaries[i], summaries[i + 1])
+            for i in range(len(versions) - 1)
+        ]
+        return build_timeline(names, summaries, steps)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_timeline_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TimelineCache()
+        return _cache
+
+
+def version_names(filenames):
+    """Column names for the versions: file base names, numbered when they repeat."""
+    names = [os.path.basename(str(filename or f"v{i + 1}")) for i, filename in enumerate(filenames)]
+    return [
+        f"{name} ({names[:i].count(name) + 1})" if names.count(name) > 1 else name
+        for i, name in enumerate(names)
+    ]
+
+
+def relations_frame(relation_lifecycles):
+    """relation_lifecycles with prefixed names, for display."""
+    frame = relation_lifecycles.copy()
+    for column in ("Subject", "Predicate", "Object"):
+        frame[column] = frame[column].map(pretty)
+    return frame
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m timeline", description="Class and relation lifecycles over ontology versions.")
+    parser.add_argument("versions", nargs="+", help="ontology versions, oldest first (Turtle, RDF/XML, N-Triples or JSON-LD)")
+    parser.add_argument("--relations", action="store_true", help="write relation lifecycles instead of the class matrix")
+    parser.add_argument("--changed-only", action="store_true", help="leave out classes and relations that never changed")
+    parser.add_argument("--output", "-o", help="CSV output file (default: stdout)")
+    args = parser.parse_args(argv)
+    if len(args.versions) < 2:
+        parser.error("at least two versions are needed")
+
+    try:
+        versions = [(read_file(path), path) for path in args.versions]
+        timeline = get_timeline_cache().timeline(versions)
+    except (OSError, ValueError) as e:
+        print(f"timeline: {e}", file=sys.stderr)
+        return 2
+
+    if args.relations:
+        frame = timeline.relation_lifecycles
+        if args.changed_only:
+            frame = frame.loc[(frame["Introduced"] != timeline.versions[0]) | (frame["Removed"] != "")]
+        index = False
+    else:
+        frame = timeline.changed_classes() if args.changed_only else timeline.class_matrix
+        index = True
+    frame.to_csv(args.output or sys.stdout, index=index)
+
+    for old, new, step in zip(timeline.versions, timeline.versions[1:], timeline.steps):
+        counts = ", ".join(f"{n} {what.lower()}" for what, n in step.counts().items())
+        print(f"timeline: {old} → {new}: {counts}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,5 @@
+"""
+Components shared by the EBUCorePlus tools (onto-explorer and the diff analyzer).
+
+The apps add the ``tools`` directory to ``sys.path`` and import from here.
+"""
@@ -0,0 +1,131 @@
+"""
+RDF serialization sniffing, so an upload is parsed exactly once with the right parser.
+
+``sniff_format`` looks at the first few KiB of the file (the content wins, since
+ontologies are often published as Turtle under an ``.owl`` name) and falls back to
+the file extension only when the content does not decide. OWL/XML (the OWL 2 XML
+syntax) is recognised but rdflib cannot read it, so it is rejected before parsing.
+
+    from ontocommon.formats import sniff_format
+    rdf_format = sniff_format(data, "ebucoreplus.owl")   # "turtle", "xml", "nt" or "json-ld"
+"""
+
+import json
+import os
+import re
+
+SNIFF_BYTES = 4096
+
+# rdflib parser names of the formats the tools accept
+TURTLE, RDF_XML, NTRIPLES, JSON_LD = "turtle", "xml", "nt", "json-ld"
+OWL_XML = "owl-xml"   # detected, not parseable by rdflib
+OTHER_XML = "other-xml"   # XML, but neither RDF/XML nor OWL/XML (e.g. HTML)
+UPLOAD_EXTENSIONS = ["ttl", "owl", "rdf", "xml", "nt", "jsonld", "json"]
+
+EXTENSION_FORMATS = {
+    ".ttl": TURTLE, ".n3": TURTLE,
+    ".rdf": RDF_XML, ".xml": RDF_XML, ".owl": RDF_XML, ".owx": OWL_XML,
+    ".nt": NTRIPLES,
+    ".jsonld": JSON_LD, ".json": JSON_LD,
+}
+
+FORMAT_NAMES = {
+    TURTLE: "Turtle", RDF_XML: "RDF/XML", NTRIPLES: "N-Triples", JSON_LD: "JSON-LD", OWL_XML: "OWL/XML",
+}
+
+_TURTLE_DIRECTIVE = re.compile(rb"^\s*(@prefix|@base|PREFIX\s|BASE\s)", re.IGNORECASE | re.MULTILINE)
+_NTRIPLES_LINE = re.compile(
+    rb"^\s*(<[^>\s]*>|_:\S+)\s+<[^>\s]*>\s+(<[^>\s]*>|_:\S+|\"(?:[^\"\\]|\\.)*\"(?:@[\w-]+|\^\^<[^>\s]*>)?)\s*\.\s*(#.*)?$"
+)
+_XML_ROOT = re.compile(rb"<([\w.-]+:)?([\w.-]+)[\s>/]")
+_XMLNS = re.compile(rb"\sxmlns(:[\w.-]+)?\s*=")
+_OWL_NS = b"http://www.w3.org/2002/07/owl#"
+_RDF_NS = b"http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+
+
+class UnsupportedFormatError(ValueError):
+    """The content is not an RDF serialization the tools can parse."""
+
+
+def _strip_preamble(head):
+    """Drop a UTF-8 BOM, blank lines and '#' comment lines."""
+    if head.startswith(b"\xef\xbb\xbf"):
+        head = head[3:]
+    lines = head.splitlines()
+    while lines and (not lines[0].strip() or lines[0].lstrip().startswith(b"#")):
+        lines.pop(0)
+    return b"\n".join(lines).lstrip()
+
+
+def _sniff_xml(head):
+    # The first element name is the root; declarations, comments and DOCTYPE don't match
+    match = _XML_ROOT.search(head)
+    if match is None:
+        return OTHER_XML
+    prefix, name = match.group(1), match.group(2)
+    if name == b"RDF":
+        return RDF_XML
+    if name == b"Ontology" and prefix is None and _OWL_NS in head:
+        # OWL 2 XML: <Ontology xmlns="http://www.w3.org/2002/07/owl#">
+        return OWL_XML
+    # RDF/XML may also start with a single node element, e.g. <owl:Ontology rdf:about=...>
+    return RDF_XML if _RDF_NS in head else OTHER_XML
+
+
+def _looks_like_json(head):
+    # '[' also opens an anonymous blank node in Turtle ("[ a owl:Ontology ] ."); a JSON-LD
+    # array has "@id"/"@context" style keys, or parses as JSON when the window holds it all
+    if b'"@' in head:
+        return True
+    try:
+        json.loads(head)
+    except ValueError:
+        return False
+    return True
+
+
+def sniff_content(data):
+    """
+    Guess the format from the first SNIFF_BYTES of ``data``: a format name,
+    OWL_XML / OTHER_XML for XML that rdflib cannot read, or None when undecided.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    head = _strip_preamble(data[:SNIFF_BYTES])
+    if not head:
+        return None
+    # An XML declaration, or an element start tag with namespace declarations: an IRI
+    # such as <urn:a> also reads as a prefixed start tag, but RDF/XML always declares xmlns
+    if head.startswith((b"<?xml", b"<!")) or (_XML_ROOT.match(head) and _XMLNS.search(head)):
+        return _sniff_xml(head)
+    if head[:1] == b"{" or (head[:1] == b"[" and _looks_like_json(head)):
+        return JSON_LD
+    if _TURTLE_DIRECTIVE.search(head):
+        return TURTLE
+    # N-Triples when every complete line is a single triple, Turtle otherwise
+    lines = [line for line in head.splitlines()[:-1] if line.strip() and not line.lstrip().startswith(b"#")]
+    if lines and all(_NTRIPLES_LINE.match(line) for line in lines):
+        return NTRIPLES
+    if head.startswith((b"<", b"_:", b"[")):
+        return TURTLE
+    return None
+
+
+def sniff_format(data, filename=None):
+    """
+    Return the rdflib format name of ``data`` (bytes or str), judging by content
+    first and by the extension of ``filename`` second. Raises UnsupportedFormatError
+    for OWL/XML and for content that is recognisably none of the supported formats.
+    """
+    rdf_format = sniff_content(data)
+    if rdf_format is None and filename:
+        rdf_format = EXTENSION_FORMATS.get(os.path.splitext(str(filename))[1].lower())
+    if rdf_format == OWL_XML:
+        raise UnsupportedFormatError(
+            "OWL/XML is not supported; convert the file to Turtle or RDF/XML (e.g. with Protégé or ROBOT)"
+        )
+    if rdf_format in (None, OTHER_XML):
+        raise UnsupportedFormatError(
+            "unsupported RDF format (expected Turtle, RDF/XML, N-Triples or JSON-LD)"
+        )
+    return rdf_format
@@ -0,0 +1,265 @@
+"""
+Multilingual BM25 full-text index over the textual annotations of classes and properties.
+
+Every entity gets one document per language holding its rdfs:label / skos:prefLabel,
+dcterms:description, skos:definition and skos:example literals in that language, plus
+one language-neutral document for its local name (split on camelCase) and untagged
+literals. Postings are stored as flat numpy arrays (CSR layout), so a query only
+touches the postings of its own terms. The last query term also matches as a prefix,
+which keeps results useful while the user is still typing.
+
+    from ontocommon.fulltext import load_fulltext_index
+    index = load_fulltext_index(g, digest, "turtle", schema_only=True)
+    for hit in index.search("audio channel", languages=["en", "fr"]):
+        print(hit.score, hit.kind, hit.uri, hit.label)
+
+Built indexes are persisted next to the parsed graph in the graph cache.
+"""
+
+import math
+import re
+import unicodedata
+from bisect import bisect_left
+from collections import Counter, defaultdict, namedtuple
+
+import numpy as np
+from rdflib import RDF, RDFS, OWL, URIRef
+from rdflib.namespace import SKOS
+
+from ontocommon.graph_cache import get_default_cache, graph_key
+from ontocommon.labels import local_name
+
+FULLTEXT_FORMAT_VERSION = 1
+ARTIFACT_NAME = "fulltext"
+
+DCTERMS_DESCRIPTION = URIRef("http://purl.org/dc/terms/description")
+
+# Predicate -> (field, weight); the weight multiplies the term frequency (BM25F-style)
+TEXT_FIELDS = {
+    RDFS.label: ("label", 3.0),
+    SKOS.prefLabel: ("label", 3.0),
+    SKOS.altLabel: ("label", 2.0),
+    DCTERMS_DESCRIPTION: ("description", 1.0),
+    SKOS.definition: ("definition", 1.0),
+    SKOS.example: ("example", 0.5),
+}
+NAME_WEIGHT = 2.0
+
+ENTITY_KINDS = {
+    OWL.Class: "class",
+    OWL.ObjectProperty: "object property",
+    OWL.DatatypeProperty: "datatype property",
+    OWL.AnnotationProperty: "annotation property",
+    RDF.Property: "property",
+}
+
+# Language code of the document holding local names and untagged literals
+NEUTRAL = ""
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_EXPANSIONS = 64
+
+SearchHit = namedtuple("SearchHit", "uri kind score language label")
+
+_WORD = re.compile(r"\w+")
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def fold(text):
+    """Lowercase and strip accents so "Émission" and "emission" index the same."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(text):
+    return [token for token in _WORD.findall(fold(text)) if len(token) > 1 or token.isdigit()]
+
+
+class FullTextIndex:
+    """Immutable BM25 index; build it with build_fulltext_index."""
+
+    def __init__(self, uris, kinds, labels, vocabulary, offsets, doc_ids, term_freqs,
+                 doc_entity, doc_language, doc_length):
+        self.uris = uris                  # entity id -> URI string
+        self.kinds = kinds                # entity id -> kind string
+        self.labels = labels              # entity id -> preferred label (en, else any, else local name)
+        self.vocabulary = vocabulary      # sorted terms; term id = position
+        self.offsets = offsets            # postings of term i are [offsets[i], offsets[i + 1])
+        self.doc_ids = doc_ids
+        self.term_freqs = term_freqs      # weighted term frequency per posting
+        self.doc_entity = doc_entity      # doc id -> entity id
+        self.doc_language = doc_language  # doc id -> language code (NEUTRAL for names)
+        self.doc_length = doc_length
+        self.avg_doc_length = float(doc_length.mean()) if len(doc_length) else 0.0
+        self.languages = sorted(set(doc_language) - {NEUTRAL})
+        self._language_codes = np.array(doc_language, dtype=object)
+        self._entity_kinds = np.array(kinds, dtype=object)
+
+    def __len__(self):
+        return len(self.uris)
+
+    def to_payload(self):
+        return {
+            "uris": self.uris, "kinds": self.kinds, "labels": self.labels,
+            "vocabulary": self.vocabulary, "offsets": self.offsets,
+            "doc_ids": self.doc_ids, "term_freqs": self.term_freqs,
+            "doc_entity": self.doc_entity, "doc_language": self.doc_language,
+            "doc_length": self.doc_length,
+        }
+
+    @classmethod
+    def from_payload(cls, payload):
+        return cls(**payload)
+
+    def _term_id(self, term):
+        i = bisect_left(self.vocabulary, term)
+        if i < len(self.vocabulary) and self.vocabulary[i] == term:
+            return i
+        return None
+
+    def _prefix_term_ids(self, prefix):
+        start = bisect_left(self.vocabulary, prefix)
+        end = start
+        while (end < len(self.vocabulary) and end - start < MAX_PREFIX_EXPANSIONS
+               and self.vocabulary[end].startswith(prefix)):
+            end += 1
+        return range(start, end)
+
+    def _term_scores(self, term_id, n_docs):
+        start, end = self.offsets[term_id], self.offsets[term_id + 1]
+        docs = self.doc_ids[start:end]
+        tf = self.term_freqs[start:end]
+        idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * self.doc_length[docs] / self.avg_doc_length)
+        return docs, idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    def search(self, query, languages=None, kinds=None, limit=20, prefix=True):
+        """
+        Rank entities for ``query``; returns up to ``limit`` SearchHit tuples, best first.
+
+        ``languages`` restricts the literal languages searched (local names always
+        count), ``kinds`` restricts entity kinds (e.g. {"class"}). With ``prefix``,
+        the last query term also matches longer terms ("chan" -> "channel").
+        """
+        tokens = tokenize(query or "")
+        n_docs = len(self.doc_entity)
+        if not tokens or not n_docs:
+            return []
+        scores = np.zeros(n_docs, dtype=np.float32)
+        for position, token in enumerate(tokens):
+            is_last = position == len(tokens) - 1
+            if prefix and is_last and not query[-1:].isspace():
+                term_ids = self._prefix_term_ids(token)
+            else:
+                term_id = self._term_id(token)
+                term_ids = () if term_id is None else (term_id,)
+            # A token expanded to several terms counts once, with its best match
+            token_scores = np.zeros(n_docs, dtype=np.float32)
+            for term_id in term_ids:
+                docs, term_scores = self._term_scores(term_id, n_docs)
+                np.maximum.at(token_scores, docs, term_scores)
+            scores += token_scores
+
+        # The local-name document counts towards every language document of its entity
+        neutral = self._language_codes == NEUTRAL
+        name_scores = np.zeros(len(self.uris), dtype=np.float32)
+        name_scores[self.doc_entity[neutral]] = scores[neutral]
+        scores[~neutral] += name_scores[self.doc_entity[~neutral]]
+
+        if languages is not None:
+            allowed = set(languages) | {NEUTRAL}
+            scores[~np.isin(self._language_codes, list(allowed))] = 0
+        hits = np.flatnonzero(scores)
+        if kinds is not None:
+            hits = hits[np.isin(self._entity_kinds[self.doc_entity[hits]], list(kinds))]
+        if not len(hits):
+            return []
+
+        # Best document per entity: sort by score, keep each entity's first doc
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+        _, first = np.unique(self.doc_entity[hits], return_index=True)
+        best_docs = hits[np.sort(first)][:limit]
+        return [
+            SearchHit(
+                self.uris[self.doc_entity[d]], self.kinds[self.doc_entity[d]],
+                float(scores[d]), self.doc_language[d], self.labels[self.doc_entity[d]],
+            )
+            for d in best_docs
+        ]
+
+
+def build_fulltext_index(g):
+    """Index the classes and properties of ``g`` (URIRef subjects only)."""
+    entity_ids = {}
+    uris = []
+    kinds = []
+    for rdf_type, kind in ENTITY_KINDS.items():
+        for entity in g.subjects(RDF.type, rdf_type):
+            if isinstance(entity, URIRef) and entity not in entity_ids:
+                entity_ids[entity] = len(uris)
+                uris.append(str(entity))
+                kinds.append(kind)
+
+    docs = defaultdict(Counter)
+    labels = {}
+    for entity, entity_id in entity_ids.items():
+        for token in tokenize(_CAMEL.sub(" ", local_name(entity))):
+            docs[(entity_id, NEUTRAL)][token] += NAME_WEIGHT
+    for predicate, (field, weight) in TEXT_FIELDS.items():
+        for s, o in g.subject_objects(predicate):
+            entity_id = entity_ids.get(s)
+            if entity_id is None:
+                continue
+            language = getattr(o, "language", None) or NEUTRAL
+            for token in tokenize(str(o)):
+                docs[(entity_id, language)][token] += weight
+            if field == "label" and (entity_id not in labels or (language == "en" and labels[entity_id][1] != "en")):
+                labels[entity_id] = (str(o), language)
+
+    doc_keys = sorted(docs)
+    postings = defaultdict(list)
+    for doc_id, key in enumerate(doc_keys):
+        for term, tf in docs[key].items():
+            postings[term].append((doc_id, tf))
+    vocabulary = sorted(postings)
+    offsets = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    doc_ids = []
+    term_freqs = []
+    for i, term in enumerate(vocabulary):
+        entries = postings[term]
+        offsets[i + 1] = offsets[i] + len(entries)
+        doc_ids.extend(doc_id for doc_id, _ in entries)
+        term_freqs.extend(tf for _, tf in entries)
+
+    return FullTextIndex(
+        uris=uris,
+        kinds=kinds,
+        labels=[labels[i][0] if i in labels else local_name(uri) for i, uri in enumerate(uris)],
+        vocabulary=vocabulary,
+        offsets=offsets,
+        doc_ids=np.array(doc_ids, dtype=np.int32),
+        term_freqs=np.array(term_freqs, dtype=np.float32),
+        doc_entity=np.array([entity_id for entity_id, _ in doc_keys], dtype=np.int32),
+        doc_language=[language for _, language in doc_keys],
+        doc_length=np.array([sum(docs[key].values()) for key in doc_keys], dtype=np.float32),
+    )
+
+
+def load_fulltext_index(g, digest=None, rdf_format="turtle", schema_only=False, cache=None):
+    """
+    Return the full-text index of ``g``. When the content hash ``digest`` of the
+    source file is given, the index is read from / written to the graph cache,
+    keyed like the graph it was built from (``rdf_format`` and ``schema_only``,
+    see ontocommon.graph_cache.load_graph).
+    """
+    if digest is None:
+        return build_fulltext_index(g)
+    cache = cache or get_default_cache()
+    name = f"{ARTIFACT_NAME}-{graph_key(rdf_format, schema_only)}"
+    payload = cache.get_artifact(digest, name, FULLTEXT_FORMAT_VERSION)
+    if payload is not None:
+        return FullTextIndex.from_payload(payload)
+    index = build_fulltext_index(g)
+    cache.put_artifact(digest, name, FULLTEXT_FORMAT_VERSION, index.to_payload())
+    return index
@@ -0,0 +1,341 @@
+"""
+Persistent on-disk cache of parsed RDF graphs, keyed by the SHA-256 of the file bytes.
+
+A cached entry stores the graph as an interned term table plus a flat array of
+term ids (three per triple), which reloads several times faster than parsing the
+Turtle/RDF-XML source again. Entries are invalidated automatically when the cache
+format or the rdflib version changes, and the directory is kept under a byte
+budget by evicting the least recently used entries. Structures derived from a
+graph (such as search indexes) can be stored alongside it as artifacts.
+
+Entries hold only numpy arrays and JSON (an ``.npz`` file read with
+``allow_pickle=False``), so loading one never runs code: a cache directory that
+others can write to can at worst serve wrong graphs, not execute anything.
+
+Pre-warm the cache from the ``tools`` directory with:
+
+    python -m ontocommon.graph_cache warm ../ontology/EBUCorePlus/ebucoreplus.owl
+    python -m ontocommon.graph_cache info
+    python -m ontocommon.graph_cache clear
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from array import array
+
+import numpy as np
+import rdflib
+from rdflib import Graph, URIRef, BNode, Literal
+
+from ontocommon.formats import sniff_format
+from ontocommon.schema_loader import SCHEMA_FILTER_VERSION, load_schema_graph
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 2
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ebucoreplus", "graphs")
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+ENTRY_SUFFIX = ".graph"
+ARTIFACT_SUFFIX = ".artifact"
+# npz member holding the JSON part of a payload (everything that is not a numpy array)
+JSON_MEMBER = "json"
+ARTIFACT_PREFIX = "data."
+
+_URI, _BNODE, _LITERAL = 0, 1, 2
+
+
+def content_hash(data):
+    """SHA-256 hex digest of the raw file bytes (str input is UTF-8 encoded)."""
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    return hashlib.sha256(data).hexdigest()
+
+
+def encode_graph(g):
+    """Encode a graph as (term kinds, values, languages, datatypes, triple ids)."""
+    term_ids = {}
+    kinds = bytearray()
+    values = []
+    languages = []
+    datatypes = []
+    triples = array("I")
+
+    def intern(term):
+        term_id = term_ids.get(term)
+        if term_id is None:
+            term_id = term_ids[term] = len(values)
+            if isinstance(term, Literal):
+                kinds.append(_LITERAL)
+                languages.append(term.language)
+                datatypes.append(str(term.datatype) if term.datatype else None)
+            else:
+                kinds.append(_BNODE if isinstance(term, BNode) else _URI)
+                languages.append(None)
+                datatypes.append(None)
+            values.append(str(term))
+        return term_id
+
+    for s, p, o in g:
+        triples.append(intern(s))
+        triples.append(intern(p))
+        triples.append(intern(o))
+    return bytes(kinds), values, languages, datatypes, triples
+
+
+def decode_graph(kinds, values, languages, datatypes, triples):
+    """Rebuild an rdflib Graph from the output of encode_graph."""
+    datatype_terms = {}
+    terms = []
+    for kind, value, language, datatype in zip(kinds, values, languages, datatypes):
+        if kind == _URI:
+            terms.append(URIRef(value))
+        elif kind == _BNODE:
+            terms.append(BNode(value))
+        else:
+            if datatype is not None and datatype not in datatype_terms:
+                datatype_terms[datatype] = URIRef(datatype)
+            terms.append(Literal(value, lang=language, datatype=datatype_terms.get(datatype)))
+    g = Graph()
+    g.addN(
+        (terms[triples[i]], terms[triples[i + 1]], terms[triples[i + 2]], g)
+        for i in range(0, len(triples), 3)
+    )
+    return g
+
+
+class GraphCache:
+    """Directory of encoded graphs with LRU eviction under a byte budget."""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.environ.get("ONTOLOGY_CACHE_DIR", DEFAULT_CACHE_DIR)
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("ONTOLOGY_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.max_bytes = max_bytes
+
+    def path_for(self, digest, rdf_format):
+        return os.path.join(self.directory, f"{digest}-{rdf_format}{ENTRY_SUFFIX}")
+
+    def artifact_path(self, digest, name):
+        return os.path.join(self.directory, f"{digest}-{name}{ARTIFACT_SUFFIX}")
+
+    def get(self, digest, rdf_format):
+        """Return the cached graph or None; stale or unreadable entries are dropped."""
+        payload = self._read(self.path_for(digest, rdf_format), CACHE_FORMAT_VERSION)
+        if payload is None:
+            return None
+        triples = array("I")
+        triples.frombytes(payload["triples"].astype(np.uint32, copy=False).tobytes())
+        return decode_graph(
+            payload["kinds"].tobytes(), payload["values"], payload["languages"], payload["datatypes"], triples
+        )
+
+    def put(self, digest, rdf_format, g):
+        """Store ``g`` under the given key; failures (e.g. read-only disk) only log a warning."""
+        kinds, values, languages, datatypes, triples = encode_graph(g)
+        self._write(self.path_for(digest, rdf_format), CACHE_FORMAT_VERSION, {
+            "kinds": np.frombuffer(kinds, dtype=np.uint8),
+            "values": values,
+            "languages": languages,
+            "datatypes": datatypes,
+            "triples": np.asarray(triples, dtype=np.uint32),
+        })
+
+    def get_artifact(self, digest, name, version):
+        """
+        Return the dict of a derived structure (e.g. a search index) stored for a
+        content hash, or None when missing or written with another ``version``.
+        """
+        payload = self._read(self.artifact_path(digest, name), version)
+        if payload is None:
+            return None
+        return {key[len(ARTIFACT_PREFIX):]: value for key, value in payload.items() if key.startswith(ARTIFACT_PREFIX)}
+
+    def put_artifact(self, digest, name, version, data):
+        """
+        Store a derived structure next to the cached graphs, under the same budget.
+        ``data`` is a dict of numpy arrays (numeric dtypes) and JSON-serializable values.
+        """
+        self._write(self.artifact_path(digest, name), version,
+                    {ARTIFACT_PREFIX + key: value for key, value in data.items()})
+
+    def _read(self, path, version):
+        try:
+            with np.load(path, allow_pickle=False) as npz:
+                payload = json.loads(npz[JSON_MEMBER].tobytes().decode("utf-8"))
+                if isinstance(payload, dict):
+                    payload.update((name, npz[name]) for name in npz.files if name != JSON_MEMBER)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning("Dropping unreadable cache entry %s: %s", path, e)
+            self._remove(path)
+            return None
+        if not isinstance(payload, dict):
+            logger.warning("Dropping corrupt cache entry %s: not a cache payload", path)
+            self._remove(path)
+            return None
+        if (payload.get("version") != version
+                or payload.get("rdflib") != rdflib.__version__):
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return payload
+
+    def _write(self, path, version, payload):
+        payload = {"version": version, "rdflib": rdflib.__version__, **payload}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            arrays = {name: value for name, value in payload.items() if isinstance(value, np.ndarray)}
+            rest = {name: value for name, value in payload.items() if name not in arrays}
+            arrays[JSON_MEMBER] = np.frombuffer(json.dumps(rest).encode("utf-8"), dtype=np.uint8)
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, **arrays)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not write cache entry %s: %s", path, e)
+            return
+        self.evict()
+
+    def entries(self):
+        """Return [(path, size, last_used)] for all entries, least recently used first."""
+        found = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return found
+        for name in names:
+            if not name.endswith((ENTRY_SUFFIX, ARTIFACT_SUFFIX)):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            found.append((path, stat.st_size, stat.st_mtime))
+        return sorted(found, key=lambda entry: entry[2])
+
+    def total_bytes(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """Remove least recently used entries until the directory fits in max_bytes."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in entries:
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def invalidate(self, digest=None):
+        """Drop the entries of one content hash, or every entry when ``digest`` is None."""
+        removed = 0
+        for path, _, _ in self.entries():
+            if digest is None or os.path.basename(path).startswith(f"{digest}-"):
+                self._remove(path)
+                removed += 1
+        return removed
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+_default_cache = None
+
+
+def get_default_cache():
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = GraphCache()
+    return _default_cache
+
+
+def graph_key(rdf_format="turtle", schema_only=False):
+    """
+    Cache key of a graph loaded as ``rdf_format``, in full or schema-only. The filter
+    version is part of the key, so graphs kept by an older filter (and anything
+    derived from them) are not reused.
+    """
+    return f"{rdf_format}-schema{SCHEMA_FILTER_VERSION}" if schema_only else rdf_format
+
+
+def load_graph(data, rdf_format="turtle", cache=None, schema_only=False):
+    """
+    Parse ``data`` (bytes or str) as ``rdf_format``, going through the on-disk cache.
+    With ``schema_only``, instance data is dropped while parsing (see
+    ontocommon.schema_loader) and the result is cached under its own key.
+    Parse errors propagate and nothing is cached for them.
+    """
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    cache = cache or get_default_cache()
+    digest = content_hash(data)
+    key = graph_key(rdf_format, schema_only)
+    g = cache.get(digest, key)
+    if g is None:
+        if schema_only:
+            g = load_schema_graph(data, rdf_format)
+        else:
+            g = Graph()
+            g.parse(data=data, format=rdf_format)
+        cache.put(digest, key, g)
+    return g
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ontocommon.graph_cache", description=__doc__.split("\n\n")[1])
+    parser.add_argument("--dir", help=f"cache directory (default: $ONTOLOGY_CACHE_DIR or {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--max-bytes", type=int, help="size cap in bytes (default: $ONTOLOGY_CACHE_MAX_BYTES or 256 MiB)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    warm = commands.add_parser("warm", help="parse files and store them in the cache")
+    warm.add_argument("paths", nargs="+")
+    warm.add_argument("--format", help="rdflib format name (default: sniffed from each file)")
+    warm.add_argument("--schema-only", action="store_true", help="cache the schema-only graph the apps load")
+    commands.add_parser("info", help="list cache entries")
+    commands.add_parser("clear", help="remove every cache entry")
+    args = parser.parse_args(argv)
+
+    cache = GraphCache(args.dir, args.max_bytes)
+    if args.command == "warm":
+        failed = 0
+        for path in args.paths:
+            with open(path, "rb") as f:
+                data = f.read()
+            try:
+                rdf_format = args.format or sniff_format(data, path)
+                g = load_graph(data, rdf_format, cache, schema_only=args.schema_only)
+            except Exception as e:
+                print(f"{path}: could not parse: {e}", file=sys.stderr)
+                failed += 1
+                continue
+            print(f"{path}: {len(g)} triples cached as {content_hash(data)[:12]}")
+        return 1 if failed else 0
+    if args.command == "info":
+        entries = cache.entries()
+        for path, size, _ in entries:
+            print(f"{size:>12,}  {os.path.basename(path)}")
+        print(f"{len(entries)} entries, {sum(size for _, size, _ in entries):,} of {cache.max_bytes:,} bytes in {cache.directory}")
+        return 0
+    removed = cache.invalidate()
+    print(f"Removed {removed} entries from {cache.directory}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
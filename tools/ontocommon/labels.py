@@ -0,0 +1,153 @@
+"""
+Shared URI -> label resolution for the ontology tools.
+
+A LabelResolver holds the label/description tables of one ontology and a
+namespace table, and memoizes everything derived for a URI (short name, prefixed
+name, display label, tooltip), so rendering a large graph or table resolves each
+URI once and never goes back to rdflib.
+"""
+
+from collections import defaultdict, namedtuple
+from functools import lru_cache
+
+from rdflib import RDFS, URIRef
+from rdflib.term import Identifier
+
+DCTERMS_DESCRIPTION = URIRef("http://purl.org/dc/terms/description")
+
+# Namespace to prefix mapping used for prefixed names and display labels
+NAMESPACE_PREFIXES = {
+    "http://www.ebu.ch/metadata/ontologies/ebucoreplus#": "ec",
+    "http://purl.org/dc/elements/1.1/": "dc",
+    "http://purl.org/dc/terms/": "dcterms",
+    "http://www.w3.org/2004/02/skos/core#": "skos",
+    "http://www.w3.org/2001/XMLSchema#": "xsd",
+    "http://www.w3.org/2002/07/owl#": "owl",
+    "http://www.w3.org/1999/02/22-rdf-syntax-ns#": "rdf",
+    "http://www.w3.org/2000/01/rdf-schema#": "rdfs",
+}
+
+TOOLTIP_MAX_LENGTH = 200
+
+# name: fragment after the last '#' (or '/'); qname: "prefix:local" or None for unknown namespaces
+ResolvedUri = namedtuple("ResolvedUri", "name prefix local qname label display tooltip")
+
+
+def local_name(uri):
+    uri_str = str(uri)
+    if "#" in uri_str:
+        return uri_str.split("#")[-1]
+    elif "/" in uri_str:
+        return uri_str.rstrip("/").split("/")[-1]
+    return uri_str
+
+
+class NamespaceTable:
+    """
+    Longest-prefix namespace matching. Namespaces ending in '#' or '/' are found
+    with one dict lookup per separator of the URI (right to left); any other
+    namespaces are checked longest first.
+    """
+
+    def __init__(self, prefixes=None):
+        prefixes = NAMESPACE_PREFIXES if prefixes is None else prefixes
+        self.by_namespace = {ns: pre for ns, pre in prefixes.items() if ns[-1:] in "#/"}
+        self.irregular = sorted(
+            ((ns, pre) for ns, pre in prefixes.items() if ns[-1:] not in "#/"),
+            key=lambda item: -len(item[0]),
+        )
+
+    def match(self, uri_str):
+        """Return (namespace, prefix) of the longest matching namespace, or (None, None)."""
+        end = len(uri_str)
+        while True:
+            end = max(uri_str.rfind("#", 0, end), uri_str.rfind("/", 0, end))
+            if end < 0:
+                break
+            prefix = self.by_namespace.get(uri_str[:end + 1])
+            if prefix is not None:
+                return uri_str[:end + 1], prefix
+        for ns, prefix in self.irregular:
+            if uri_str.startswith(ns):
+                return ns, prefix
+        return None, None
+
+
+class LabelResolver:
+    """
+    Memoized labels for one ontology.
+
+    ``labels``, ``labels_en`` and ``descriptions_en`` map URIRefs to sequences of
+    literals; the display label prefers the first English label, then the first
+    label of any language. Without tables, only names and prefixes are resolved.
+    """
+
+    def __init__(self, labels=None, labels_en=None, descriptions_en=None,
+                 namespaces=None, max_entries=None, tooltip_length=TOOLTIP_MAX_LENGTH):
+        self.labels = labels or {}
+        self.labels_en = labels_en or {}
+        self.descriptions_en = descriptions_en or {}
+        self.namespaces = namespaces if isinstance(namespaces, NamespaceTable) else NamespaceTable(namespaces)
+        self.tooltip_length = tooltip_length
+        self.resolve = lru_cache(maxsize=max_entries)(self._resolve)
+
+    @classmethod
+    def from_graph(cls, g, **kwargs):
+        """Collect the label and description tables of ``g`` in one pass over each predicate."""
+        labels = defaultdict(list)
+        labels_en = defaultdict(list)
+        descriptions_en = defaultdict(list)
+        for s, o in g.subject_objects(RDFS.label):
+            labels[s].append(o)
+            if getattr(o, "language", None) == "en":
+                labels_en[s].append(o)
+        for s, o in g.subject_objects(DCTERMS_DESCRIPTION):
+            if getattr(o, "language", None) == "en":
+                descriptions_en[s].append(o)
+        return cls(dict(labels), dict(labels_en), dict(descriptions_en), **kwargs)
+
+    def _resolve(self, uri):
+        uri_str = str(uri)
+        term = uri if isinstance(uri, Identifier) else URIRef(uri_str)
+        name = local_name(uri_str)
+        ns, prefix = self.namespaces.match(uri_str)
+        local = uri_str[len(ns):] if ns is not None else name
+        qname = f"{prefix}:{local}" if prefix else None
+
+        en_labels = self.labels_en.get(term, ())
+        all_labels = self.labels.get(term, ())
+        label = str(en_labels[0]) if en_labels else (str(all_labels[0]) if all_labels else None)
+        short = qname or local
+        display = f"{label} ({short})" if label else short
+
+        label_text = "; ".join(str(lbl) for lbl in en_labels) or "None"
+        desc_text = "; ".join(str(desc) for desc in self.descriptions_en.get(term, ())) or "None"
+        if len(desc_text) > self.tooltip_length:
+            desc_text = desc_text[:self.tooltip_length] + "..."
+        tooltip = f"Label: {label_text}\nDescription: {desc_text}"
+        return ResolvedUri(name, prefix, local, qname, label, display, tooltip)
+
+    def name(self, uri):
+        return self.resolve(uri).name
+
+    def prefixed(self, uri):
+        """Prefixed name ("ec:Asset"), or "<uri>" for namespaces without a prefix."""
+        return self.resolve(uri).qname or f"<{uri}>"
+
+    def display(self, uri):
+        return self.resolve(uri).display
+
+    def label(self, uri):
+        return self.resolve(uri).label
+
+    def tooltip(self, uri):
+        return self.resolve(uri).tooltip
+
+
+# Names and prefixes only; shared by helpers that have no ontology at hand
+_names = LabelResolver(max_entries=65536)
+
+
+def short_name(uri):
+    """Memoized local name of ``uri`` (the part after the last '#' or '/')."""
+    return _names.name(uri)
@@ -0,0 +1,229 @@
+"""
+Streaming, schema-only ontology loading.
+
+The parser feeds its triples one by one into a filtering store instead of a full
+rdflib Graph. Only schema-level triples are kept: class / property / restriction
+declarations, subclass and domain/range axioms, restriction and list structure,
+SKOS concept schemes and their concepts, and the labels, descriptions, SKOS and
+rdfs:isDefinedBy annotations of schema entities, named individuals and the
+terms kept triples refer to. Instance data (individuals typed with domain
+classes and their property values) is dropped as it streams past, so loading
+an ontology mixed with large amounts of instance data needs memory for its
+schema only. Kept terms are interned and triples held as a flat id array until
+the (small) result Graph is built.
+
+Compare the peak memory of a full parse and a schema-only parse from the
+``tools`` directory with:
+
+    python -m ontocommon.schema_loader ../ontology/EBUCorePlus/ebucoreplus.owl
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from array import array
+from collections import namedtuple
+
+from rdflib import Graph, Namespace, RDF, RDFS, OWL
+from rdflib.namespace import SKOS, DC, DCTERMS, VANN
+from rdflib.store import Store
+
+from ontocommon.formats import SNIFF_BYTES, sniff_format
+
+# Bumped whenever the kept triples change; part of the parse cache key
+SCHEMA_FILTER_VERSION = 3
+
+CC = Namespace("http://creativecommons.org/ns#")
+VS = Namespace("http://www.w3.org/2003/06/sw-vocab-status/ns#")
+
+# rdf:type objects that make the subject a schema entity
+SCHEMA_TYPES = frozenset({
+    OWL.Class, RDFS.Class, RDFS.Datatype, OWL.Restriction, OWL.Ontology,
+    OWL.ObjectProperty, OWL.DatatypeProperty, OWL.AnnotationProperty, RDF.Property,
+    OWL.FunctionalProperty, OWL.InverseFunctionalProperty, OWL.TransitiveProperty,
+    OWL.SymmetricProperty, OWL.AsymmetricProperty, OWL.ReflexiveProperty, OWL.IrreflexiveProperty,
+    OWL.AllDisjointClasses, OWL.AllDisjointProperties, OWL.Axiom,
+    OWL.NamedIndividual, SKOS.Concept, SKOS.ConceptScheme, SKOS.Collection,
+})
+
+# Axioms and structure; always kept, and their subject counts as a schema entity
+STRUCTURAL_PREDICATES = frozenset({
+    RDFS.subClassOf, RDFS.subPropertyOf, RDFS.domain, RDFS.range,
+    OWL.equivalentClass, OWL.equivalentProperty, OWL.disjointWith, OWL.propertyDisjointWith, OWL.inverseOf,
+    OWL.unionOf, OWL.intersectionOf, OWL.complementOf, OWL.oneOf, OWL.members,
+    OWL.onProperty, OWL.someValuesFrom, OWL.allValuesFrom, OWL.hasValue,
+    OWL.onClass, OWL.onDataRange, OWL.cardinality, OWL.minCardinality, OWL.maxCardinality,
+    OWL.qualifiedCardinality, OWL.minQualifiedCardinality, OWL.maxQualifiedCardinality,
+    OWL.annotatedSource, OWL.annotatedProperty, OWL.annotatedTarget,
+    OWL.imports, OWL.versionIRI, OWL.versionInfo, RDF.first, RDF.rest,
+    SKOS.inScheme, SKOS.hasTopConcept, SKOS.topConceptOf,
+})
+
+# Annotations; kept only for schema entities and the terms (including predicates)
+# their kept triples refer to
+ANNOTATION_PREDICATES = frozenset({
+    RDFS.label, RDFS.comment, RDFS.isDefinedBy, RDFS.seeAlso,
+    DCTERMS.description, DCTERMS.title, DC.description, DC.title, OWL.deprecated,
+    DC.creator, DC.contributor, DC.publisher, DC.rights,
+    DCTERMS.creator, DCTERMS.contributor, DCTERMS.publisher, DCTERMS.rights, DCTERMS.license,
+    DCTERMS.created, DCTERMS.modified, DCTERMS.issued,
+    VANN.preferredNamespaceUri, VANN.preferredNamespacePrefix, CC.license, CC.licence, VS.term_status,
+    SKOS.prefLabel, SKOS.altLabel, SKOS.definition, SKOS.example, SKOS.scopeNote, SKOS.note,
+    SKOS.editorialNote, SKOS.changeNote, SKOS.historyNote,
+    SKOS.broader, SKOS.narrower, SKOS.related,
+})
+
+SchemaLoadStats = namedtuple("SchemaLoadStats", "seen kept deferred dropped")
+
+
+class SchemaFilterStore(Store):
+    """
+    Write-only rdflib store that keeps the schema triples of a parse.
+
+    Annotations whose subject is not (yet) known to be a schema entity are held
+    back as id triples and settled by ``finish`` once the whole source is read,
+    so the order of statements in the file does not matter. Terms referenced by
+    kept triples (e.g. an owl:hasValue individual, or an annotation property in
+    use) keep their annotations too.
+    """
+
+    context_aware = True
+
+    def __init__(self):
+        super().__init__()
+        self.term_ids = {}
+        self.terms = []
+        self.kept = array("I")
+        self.deferred = array("I")
+        self.schema_subjects = set()   # term ids
+        self.prefixes = {}
+        self.seen = 0
+
+    def _intern(self, term):
+        term_id = self.term_ids.get(term)
+        if term_id is None:
+            term_id = self.term_ids[term] = len(self.terms)
+            self.terms.append(term)
+        return term_id
+
+    def add(self, triple, context=None, quoted=False):
+        s, p, o = triple
+        self.seen += 1
+        if (p == RDF.type and o in SCHEMA_TYPES) or p in STRUCTURAL_PREDICATES:
+            subject_id = self._intern(s)
+            self.schema_subjects.add(subject_id)
+            self.kept.extend((subject_id, self._intern(p), self._intern(o)))
+        elif p in ANNOTATION_PREDICATES:
+            subject_id = self._intern(s)
+            target = self.kept if subject_id in self.schema_subjects else self.deferred
+            target.extend((subject_id, self._intern(p), self._intern(o)))
+
+    def addN(self, quads):
+        for s, p, o, _ in quads:
+            self.add((s, p, o))
+
+    def finish(self):
+        """Settle the deferred annotations; returns the kept id triples."""
+        deferred = self.deferred
+        referenced = self.schema_subjects.union(self.kept[1::3], self.kept[2::3])
+        for i in range(0, len(deferred), 3):
+            if deferred[i] in referenced:
+                self.kept.extend(deferred[i:i + 3])
+        self.deferred = array("I")
+        return self.kept
+
+    def stats(self):
+        kept = len(self.kept) // 3
+        deferred = len(self.deferred) // 3
+        return SchemaLoadStats(self.seen, kept, deferred, self.seen - kept - deferred)
+
+    # --- namespace bindings, so prefixes survive into the result graph ---
+
+    def bind(self, prefix, namespace, override=True):
+        if override or prefix not in self.prefixes:
+            self.prefixes[prefix] = namespace
+
+    def namespace(self, prefix):
+        return self.prefixes.get(prefix)
+
+    def prefix(self, namespace):
+        return next((p for p, ns in self.prefixes.items() if ns == namespace), None)
+
+    def namespaces(self):
+        return iter(list(self.prefixes.items()))
+
+    # --- nothing to read back while parsing ---
+
+    def triples(self, triple_pattern, context=None):
+        return iter(())
+
+    def contexts(self, triple=None):
+        return iter(())
+
+    def __len__(self, context=None):
+        return len(self.kept) // 3
+
+
+def parse_schema(source=None, rdf_format="turtle", data=None):
+    """
+    Parse ``source`` (a path or file object) or ``data`` (bytes/str) keeping only
+    schema-level triples. Returns (Graph, SchemaLoadStats).
+    """
+    store = SchemaFilterStore()
+    Graph(store=store).parse(source=source, data=data, format=rdf_format)
+    kept = store.finish()
+    terms = store.terms
+    g = Graph()
+    for prefix, namespace in store.namespaces():
+        g.bind(prefix, namespace, override=True, replace=True)
+    g.addN((terms[kept[i]], terms[kept[i + 1]], terms[kept[i + 2]], g) for i in range(0, len(kept), 3))
+    return g, store.stats()
+
+
+def load_schema_graph(data, rdf_format="turtle"):
+    """Schema-only counterpart of ``Graph().parse(data=data, format=rdf_format)``."""
+    return parse_schema(data=data, rdf_format=rdf_format)[0]
+
+
+def measure(path, rdf_format):
+    """Peak traced memory (bytes) and time of a full parse and of a schema-only parse of ``path``."""
+    results = {}
+    for name, parse in (
+        ("full", lambda: Graph().parse(path, format=rdf_format)),
+        ("schema", lambda: parse_schema(path, rdf_format)[0]),
+    ):
+        tracemalloc.start()
+        start = time.perf_counter()
+        g = parse()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = (len(g), peak, elapsed)
+        del g
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m ontocommon.schema_loader", description=__doc__.split("\n\n")[1])
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--format", help="rdflib format name (default: sniffed from each file)")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        with open(path, "rb") as f:
+            rdf_format = args.format or sniff_format(f.read(SNIFF_BYTES), path)
+        results = measure(path, rdf_format)
+        full_triples, full_peak, full_time = results["full"]
+        schema_triples, schema_peak, schema_time = results["schema"]
+        print(f"{os.path.basename(path)}:")
+        print(f"  full parse:   {full_triples:>9,} triples  peak {full_peak / 2**20:8.1f} MiB  {full_time:6.2f} s")
+        print(f"  schema parse: {schema_triples:>9,} triples  peak {schema_peak / 2**20:8.1f} MiB  {schema_time:6.2f} s")
+        print(f"  saved:        {full_triples - schema_triples:>9,} triples       "
+              f"{(full_peak - schema_peak) / 2**20:8.1f} MiB ({1 - schema_peak / full_peak:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
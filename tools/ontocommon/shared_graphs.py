@@ -0,0 +1,145 @@
+"""
+Process-wide, read-only ontology handles shared by every session of an app.
+
+Streamlit's ``st.cache_data`` pickles a returned Graph and hands each session and
+rerun its own copy. The handles here are plain objects kept once per process, keyed
+by the content hash of the file (plus format and loading mode), so concurrent users
+of the same ontology share one in-memory model. Graphs are wrapped as ReadOnlyGraph
+views on the loaded store: nothing is copied, and accidental writes raise.
+
+    from ontocommon.shared_graphs import get_shared_graphs
+    handle = get_shared_graphs().get(data, "turtle", schema_only=True)
+    handle.graph, handle.digest, get_shared_graphs().stats()
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+from rdflib import Graph
+
+from ontocommon.graph_cache import content_hash, load_graph
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 16
+
+OntologyHandle = namedtuple("OntologyHandle", "digest rdf_format schema_only graph triples source_bytes")
+
+
+class ReadOnlyGraph(Graph):
+    """A Graph view on an existing store that rejects every modification."""
+
+    def __init__(self, g):
+        super().__init__(store=g.store, identifier=g.identifier, namespace_manager=g.namespace_manager)
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("shared ontology graphs are read-only; copy the triples into a new Graph to modify them")
+
+    add = addN = remove = set = parse = update = _read_only
+    __iadd__ = __isub__ = _read_only
+
+
+class SharedGraphs:
+    """
+    LRU map of content key -> OntologyHandle, shared by all threads (sessions).
+
+    A miss parses through the on-disk graph cache (load_graph); concurrent misses
+    for the same key wait for a single load. ``stats()`` reports entries, triples,
+    source bytes and hit/miss/eviction counters.
+    """
+
+    def __init__(self, max_entries=None):
+        if max_entries is None:
+            max_entries = int(os.environ.get("ONTOLOGY_SHARED_MAX_ENTRIES", DEFAULT_MAX_ENTRIES))
+        self.max_entries = max_entries
+        self._handles = OrderedDict()
+        self._lock = threading.Lock()
+        self._loading = {}   # key -> lock held while that key is being loaded
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, data, rdf_format="turtle", schema_only=False, digest=None):
+        """Return the handle of ``data`` (bytes or str), loading it on first use."""
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        digest = digest or content_hash(data)
+        key = (digest, rdf_format, schema_only)
+        with self._lock:
+            handle = self._lookup(key)
+            if handle is not None:
+                return handle
+            key_lock = self._loading.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._lock:
+                handle = self._lookup(key)
+                if handle is not None:
+                    return handle
+                self.misses += 1
+            try:
+                g = load_graph(data, rdf_format, schema_only=schema_only)
+            except BaseException:
+                with self._lock:
+                    self._loading.pop(key, None)
+                raise
+            handle = OntologyHandle(digest, rdf_format, schema_only, ReadOnlyGraph(g), len(g), len(data))
+            with self._lock:
+                # Publish the handle before dropping the key lock, so a thread arriving
+                # in between finds it instead of starting a second load
+                self._handles[key] = handle
+                self._loading.pop(key, None)
+                self._evict()
+        return handle
+
+    def _lookup(self, key):
+        # Call with the lock held
+        handle = self._handles.get(key)
+        if handle is not None:
+            self.hits += 1
+            self._handles.move_to_end(key)
+        return handle
+
+    def _evict(self):
+        while len(self._handles) > self.max_entries:
+            (digest, rdf_format, _), handle = self._handles.popitem(last=False)
+            self.evictions += 1
+            logger.info("Shared ontology %s (%s, %d triples) evicted", digest[:12], rdf_format, handle.triples)
+
+    def clear(self):
+        with self._lock:
+            self._handles.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self._handles),
+                "max_entries": self.max_entries,
+                "triples": sum(handle.triples for handle in self._handles.values()),
+                "source_bytes": sum(handle.source_bytes for handle in self._handles.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_graphs():
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedGraphs()
+        return _shared
+
+
+def format_stats(stats):
+    """One-line summary of SharedGraphs.stats() for the apps."""
+    return (
+        f"{stats['entries']} of {stats['max_entries']} ontologies, {stats['triples']:,} triples "
+        f"from {stats['source_bytes'] / 2**20:.1f} MiB of source · {stats['hits']} hits, "
+        f"{stats['misses']} misses, {stats['evictions']} evictions"
+    )
@@ -0,0 +1,5 @@
+import os
+import sys
+
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, TOOLS_DIR)
@@ -0,0 +1,85 @@
+import os
+
+import pytest
+from rdflib import Graph, Literal, Namespace, RDF, RDFS, OWL
+from rdflib.compare import isomorphic
+
+from ontocommon.formats import (
+    JSON_LD, NTRIPLES, RDF_XML, TURTLE, UnsupportedFormatError, sniff_content, sniff_format,
+)
+
+TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+EXAMPLE_FILES = [
+    os.path.join(TOOLS_DIR, "diff", "example_data", "ebucoreplus_1.owl"),
+    os.path.join(TOOLS_DIR, "vis", "onto-explorer", "example_data", "ebucoreplus-1-07.ttl"),
+]
+EX = Namespace("urn:example#")
+
+
+@pytest.fixture(scope="module")
+def graph():
+    g = Graph()
+    g.bind("ex", EX)
+    g.add((EX.Ontology, RDF.type, OWL.Ontology))
+    g.add((EX.Asset, RDF.type, OWL.Class))
+    g.add((EX.Asset, RDFS.label, Literal("Asset", lang="en")))
+    g.add((EX.Clip, RDFS.subClassOf, EX.Asset))
+    return g
+
+
+# Every syntax is sniffed under a misleading name: the content must win
+@pytest.mark.parametrize("rdf_format, filename", [
+    (TURTLE, "ontology.owl"),
+    (RDF_XML, "ontology.ttl"),
+    (NTRIPLES, "ontology.ttl"),
+    (JSON_LD, "ontology.owl"),
+])
+def test_each_syntax_is_sniffed_and_parses(graph, rdf_format, filename):
+    data = graph.serialize(format=rdf_format, encoding="utf-8")
+    assert sniff_format(data, filename) == rdf_format
+    assert isomorphic(Graph().parse(data=data, format=rdf_format), graph)
+
+
+@pytest.mark.parametrize("path", EXAMPLE_FILES, ids=os.path.basename)
+def test_example_files_are_turtle(path):
+    with open(path, "rb") as f:
+        assert sniff_format(f.read(), path) == TURTLE
+
+
+@pytest.mark.parametrize("data, expected", [
+    (b"\xef\xbb\xbf# comment\n\n@prefix ex: <urn:example#> .\n", TURTLE),
+    (b"PREFIX ex: <urn:example#>\nex:a ex:b ex:c .\n", TURTLE),
+    (b"[ a <http://www.w3.org/2002/07/owl#Ontology> ] .\n", TURTLE),
+    (b"<urn:a> <urn:b> <urn:c> ;\n  <urn:d> <urn:e> .\n", TURTLE),
+    (b"<urn:a> <urn:b> <urn:c> .\n_:x <urn:b> \"v\"@en .\n", NTRIPLES),
+    (b'[{"@id": "urn:a", "urn:b": [{"@id": "urn:c"}]}]', JSON_LD),
+    (b'{"@context": {}, "@graph": []}', JSON_LD),
+    (b'<owl:Ontology xmlns:owl="http://www.w3.org/2002/07/owl#" '
+     b'xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#" rdf:about="urn:a"/>', RDF_XML),
+    (b'<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"/>', RDF_XML),
+    (b"", None),
+    (b"ex:a ex:b ex:c .\n", None),
+])
+def test_sniff_content(data, expected):
+    assert sniff_content(data) == expected
+
+
+def test_extension_decides_when_content_does_not():
+    assert sniff_format(b"ex:a ex:b ex:c .\n", "ontology.ttl") == TURTLE
+    with pytest.raises(UnsupportedFormatError):
+        sniff_format(b"ex:a ex:b ex:c .\n", "ontology")
+
+
+@pytest.mark.parametrize("data", [
+    b'<?xml version="1.0"?>\n<Ontology xmlns="http://www.w3.org/2002/07/owl#" ontologyIRI="urn:a"/>',
+    b"<Ontology xmlns='http://www.w3.org/2002/07/owl#'>\n<Declaration/>\n</Ontology>",
+])
+def test_owl_xml_is_rejected(data):
+    assert sniff_content(data) == "owl-xml"
+    with pytest.raises(UnsupportedFormatError, match="OWL/XML"):
+        sniff_format(data, "ontology.owl")
+
+
+def test_other_xml_is_rejected():
+    with pytest.raises(UnsupportedFormatError):
+        sniff_format(b"<!DOCTYPE html>\n<html><body></body></html>", "ontology.owl")
@@ -0,0 +1,142 @@
+import os
+import pickle
+
+import numpy as np
+import pytest
+from rdflib import BNode, Graph, Literal, Namespace, RDF, RDFS, OWL, XSD
+from rdflib.compare import isomorphic
+
+import ontocommon.graph_cache as graph_cache
+from ontocommon.graph_cache import GraphCache, content_hash, graph_key, load_graph
+from ontocommon.schema_loader import SCHEMA_FILTER_VERSION
+
+EX = Namespace("urn:example#")
+TURTLE = b"""\
+@prefix ex: <urn:example#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+ex:Asset a owl:Class ; rdfs:label "Asset"@en .
+ex:Clip a owl:Class ; rdfs:subClassOf ex:Asset , [ a owl:Restriction ; owl:onProperty ex:hasPart ; owl:someValuesFrom ex:Asset ] .
+ex:clip1 a ex:Clip ; ex:duration 12 .
+"""
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return GraphCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+
+
+@pytest.fixture
+def graph():
+    g = Graph()
+    node = BNode()
+    g.add((EX.Asset, RDF.type, OWL.Class))
+    g.add((EX.Asset, RDFS.label, Literal("Asset", lang="en")))
+    g.add((EX.Asset, RDFS.comment, Literal("untagged")))
+    g.add((EX.Asset, EX.duration, Literal(3, datatype=XSD.integer)))
+    g.add((EX.Clip, RDFS.subClassOf, node))
+    g.add((node, OWL.onProperty, EX.hasPart))
+    return g
+
+
+def test_round_trip(cache, graph):
+    cache.put("abc", "turtle", graph)
+    assert isomorphic(cache.get("abc", "turtle"), graph)
+    assert cache.get("abc", "xml") is None
+    assert cache.get("def", "turtle") is None
+
+
+def test_load_graph_parses_once(cache, monkeypatch):
+    first = load_graph(TURTLE, "turtle", cache)
+    monkeypatch.setattr(graph_cache.Graph, "parse", lambda *args, **kwargs: pytest.fail("parsed again"))
+    assert isomorphic(load_graph(TURTLE, "turtle", cache), first)
+
+
+def test_schema_only_entries_are_keyed_by_filter_version(cache, monkeypatch):
+    digest = content_hash(TURTLE)
+    full = load_graph(TURTLE, "turtle", cache)
+    schema = load_graph(TURTLE, "turtle", cache, schema_only=True)
+    assert len(schema) < len(full)
+    assert os.path.exists(cache.path_for(digest, f"turtle-schema{SCHEMA_FILTER_VERSION}"))
+
+    # A new filter version must not reuse graphs kept by the previous one
+    monkeypatch.setattr(graph_cache, "SCHEMA_FILTER_VERSION", SCHEMA_FILTER_VERSION + 1)
+    assert graph_key("turtle", schema_only=True) == f"turtle-schema{SCHEMA_FILTER_VERSION + 1}"
+    assert cache.get(digest, graph_key("turtle", schema_only=True)) is None
+    load_graph(TURTLE, "turtle", cache, schema_only=True)
+    assert os.path.exists(cache.path_for(digest, f"turtle-schema{SCHEMA_FILTER_VERSION + 1}"))
+
+
+@pytest.mark.parametrize("attribute, value", [
+    ("CACHE_FORMAT_VERSION", graph_cache.CACHE_FORMAT_VERSION + 1),
+    ("rdflib", type("rdflib", (), {"__version__": "0.0.0"})),
+])
+def test_entries_from_another_version_are_dropped(cache, graph, monkeypatch, attribute, value):
+    cache.put("abc", "turtle", graph)
+    monkeypatch.setattr(graph_cache, attribute, value)
+    assert cache.get("abc", "turtle") is None
+    assert not os.path.exists(cache.path_for("abc", "turtle"))
+
+
+@pytest.mark.parametrize("content", [b"", b"not a cache entry", b"PK\x03\x04truncated"])
+def test_unreadable_entries_are_dropped(cache, content):
+    os.makedirs(cache.directory, exist_ok=True)
+    with open(cache.path_for("abc", "turtle"), "wb") as f:
+        f.write(content)
+    assert cache.get("abc", "turtle") is None
+    assert not os.path.exists(cache.path_for("abc", "turtle"))
+
+
+class Planted:
+    # Unpickling this object would create the marker directory
+    def __init__(self, marker):
+        self.marker = marker
+
+    def __reduce__(self):
+        return os.makedirs, (self.marker,)
+
+
+def test_pickled_entries_are_never_unpickled(cache, tmp_path):
+    marker = str(tmp_path / "executed")
+    os.makedirs(cache.directory, exist_ok=True)
+    for path in (cache.path_for("abc", "turtle"), cache.artifact_path("abc", "fulltext")):
+        with open(path, "wb") as f:
+            pickle.dump({"version": 1, "data": Planted(marker)}, f)
+    assert cache.get("abc", "turtle") is None
+    assert cache.get_artifact("abc", "fulltext", 1) is None
+    assert not os.path.exists(marker)
+
+
+def test_artifacts(cache):
+    data = {"ids": np.arange(5, dtype=np.int32), "weights": np.ones(2, dtype=np.float32),
+            "names": ["a", "b"], "languages": ["en", None], "count": 2}
+    cache.put_artifact("abc", "index", 3, data)
+    stored = cache.get_artifact("abc", "index", 3)
+    assert sorted(stored) == sorted(data)
+    assert stored["ids"].dtype == np.int32 and stored["ids"].tolist() == list(range(5))
+    assert stored["names"] == ["a", "b"] and stored["languages"] == ["en", None] and stored["count"] == 2
+    assert cache.get_artifact("abc", "index", 4) is None
+    assert cache.get_artifact("abc", "index", 3) is None   # the stale entry was dropped
+
+
+def test_invalidate(cache, graph):
+    for digest in ("abc", "def"):
+        cache.put(digest, "turtle", graph)
+        cache.put_artifact(digest, "index", 1, {"ids": np.arange(3)})
+    assert cache.invalidate("abc") == 2
+    assert cache.get("abc", "turtle") is None and cache.get("def", "turtle") is not None
+    assert cache.invalidate() == 2
+    assert cache.entries() == []
+
+
+def test_evicts_least_recently_used(tmp_path, graph):
+    cache = GraphCache(str(tmp_path), max_bytes=10 * 1024 * 1024)
+    for age, digest in enumerate(("old", "mid", "new")):
+        cache.put(digest, "turtle", graph)
+        os.utime(cache.path_for(digest, "turtle"), (1000 + age, 1000 + age))
+    cache.get("old", "turtle")   # a hit marks the entry as recently used
+    size = os.path.getsize(cache.path_for("mid", "turtle"))
+    cache.max_bytes = 2 * size + size // 2
+    assert cache.evict() == 1
+    assert cache.get("mid", "turtle") is None
+    assert cache.get("old", "turtle") is not None and cache.get("new", "turtle") is not None
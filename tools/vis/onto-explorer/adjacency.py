@@ -0,0 +1,144 @@
+# adjacency.py
+
+import numpy as np
+from rdflib import RDFS, URIRef
+from rdflib.namespace import SKOS
+
+# Edge types of the class graph; the value is the code stored per edge
+EDGE_KINDS = {
+    "restriction": 0,
+    "subclass": 1,
+    "skos": 2,
+    "domain/range": 3,
+}
+
+
+class ClassAdjacency:
+    """
+    Integer-ID adjacency of the class graph in compressed sparse row form.
+
+    Nodes are URIRefs numbered 0..n-1; edges are stored once in parallel arrays
+    (source, target, predicate, kind). ``out_offsets``/``out_edges`` list the edge
+    ids leaving each node, ``in_offsets``/``in_edges`` those entering it, so a BFS
+    step over a whole frontier is a handful of numpy gathers.
+    """
+
+    def __init__(self, triples):
+        # triples: iterable of (source, predicate, target, kind name), URIRefs only
+        triples = sorted(set(triples), key=lambda t: (str(t[0]), str(t[2]), str(t[1]), t[3]))
+        self.nodes = []
+        self.node_id = {}
+        self.predicates = []
+        predicate_id = {}
+
+        def intern(term, table, ids):
+            if term not in ids:
+                ids[term] = len(table)
+                table.append(term)
+            return ids[term]
+
+        sources, targets, predicates, kinds = [], [], [], []
+        for source, predicate, target, kind in triples:
+            sources.append(intern(source, self.nodes, self.node_id))
+            targets.append(intern(target, self.nodes, self.node_id))
+            predicates.append(intern(predicate, self.predicates, predicate_id))
+            kinds.append(EDGE_KINDS[kind])
+
+        self.source = np.array(sources, dtype=np.int32)
+        self.target = np.array(targets, dtype=np.int32)
+        self.predicate = np.array(predicates, dtype=np.int32)
+        self.kind = np.array(kinds, dtype=np.int8)
+        self.out_offsets, self.out_edges = self._csr(self.source)
+        self.in_offsets, self.in_edges = self._csr(self.target)
+
+    def _csr(self, endpoint):
+        order = np.argsort(endpoint, kind="stable").astype(np.int32)
+        counts = np.bincount(endpoint, minlength=len(self.nodes))
+        offsets = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return offsets, order
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _kind_mask(self, kinds):
+        if kinds is None:
+            return np.ones(len(self.kind), dtype=bool)
+        return np.isin(self.kind, [EDGE_KINDS[kind] for kind in kinds])
+
+    @staticmethod
+    def _gather(offsets, edges, frontier):
+        # Concatenate edges[offsets[v]:offsets[v + 1]] for every v in frontier
+        starts = offsets[frontier]
+        lengths = offsets[frontier + 1] - starts
+        total = int(lengths.sum())
+        if not total:
+            return edges[:0]
+        shift = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+        return edges[shift + np.arange(total)]
+
+    def neighbourhood(self, start, hops=1, kinds=None):
+        """
+        Nodes within ``hops`` edges of ``start`` (following edges in both directions)
+        and the edges among them, restricted to the edge ``kinds`` (names of
+        EDGE_KINDS, None for all).
+
+        Returns (distance, edges): distance maps each URIRef to its hop count,
+        edges is a list of (source, predicate, target, kind) tuples.
+        """
+        start_id = self.node_id.get(start)
+        if start_id is None:
+            return {start: 0}, []
+        allowed = self._kind_mask(kinds)
+        distance = np.full(len(self.nodes), -1, dtype=np.int32)
+        distance[start_id] = 0
+        frontier = np.array([start_id], dtype=np.int32)
+        for hop in range(1, hops + 1):
+            out_ids = self._gather(self.out_offsets, self.out_edges, frontier)
+            in_ids = self._gather(self.in_offsets, self.in_edges, frontier)
+            reached = np.concatenate((self.target[out_ids[allowed[out_ids]]], self.source[in_ids[allowed[in_ids]]]))
+            reached = np.unique(reached)
+            frontier = reached[distance[reached] < 0]
+            if not len(frontier):
+                break
+            distance[frontier] = hop
+
+        inside = distance >= 0
+        edge_ids = np.flatnonzero(allowed & inside[self.source] & inside[self.target])
+        kind_names = {code: name for name, code in EDGE_KINDS.items()}
+        edges = [
+            (self.nodes[s], self.predicates[p], self.nodes[t], kind_names[k])
+            for s, p, t, k in zip(self.source[edge_ids].tolist(), self.predicate[edge_ids].tolist(),
+                                  self.target[edge_ids].tolist(), self.kind[edge_ids].tolist())
+        ]
+        found = np.flatnonzero(inside)
+        return {self.nodes[i]: int(distance[i]) for i in found.tolist()}, edges
+
+
+def build_class_adjacency(restrictions, superclasses, broader, narrower, domains, ranges):
+    """
+    Collect the typed class-graph edges from the OntologyIndex tables:
+    restriction (class -property-> value / onClass), subclass (child -> parent),
+    skos (broader / narrower) and domain/range (domain -property-> range).
+    """
+    triples = []
+    for cls, props in restrictions.items():
+        for prop, rtype, rvalue in props:
+            target = rvalue["on_class"] if rtype == "qualified_cardinality" else rvalue
+            if isinstance(cls, URIRef) and isinstance(prop, URIRef) and isinstance(target, URIRef):
+                triples.append((cls, prop, target, "restriction"))
+    for cls, parents in superclasses.items():
+        for parent in parents:
+            if isinstance(cls, URIRef):
+                triples.append((cls, RDFS.subClassOf, parent, "subclass"))
+    for predicate, table in ((SKOS.broader, broader), (SKOS.narrower, narrower)):
+        for s, objects in table.items():
+            for o in objects:
+                if isinstance(s, URIRef) and isinstance(o, URIRef):
+                    triples.append((s, predicate, o, "skos"))
+    for prop, prop_domains in domains.items():
+        for domain in prop_domains:
+            for range_ in ranges.get(prop, ()):
+                if isinstance(prop, URIRef) and isinstance(domain, URIRef) and isinstance(range_, URIRef):
+                    triples.append((domain, prop, range_, "domain/range"))
+    return ClassAdjacency(triples)
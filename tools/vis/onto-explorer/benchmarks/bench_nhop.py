@@ -0,0 +1,74 @@
+"""
+Compare the rdflib BFS previously done by get_nodes_and_all_edges_within_n_hops
+with the CSR adjacency of the OntologyIndex.
+
+Run from the onto-explorer directory:
+
+    python benchmarks/bench_nhop.py [ontology.ttl]
+"""
+
+import os
+import sys
+import time
+from collections import deque
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+
+from rdflib import Graph, RDF, URIRef
+from ontology_index import build_ontology_index
+
+DEFAULT_ONTOLOGY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "example_data", "ebucoreplus-2-0.owl"
+)
+SAMPLE_CLASS = URIRef("http://www.ebu.ch/metadata/ontologies/ebucoreplus#EditorialObject")
+
+
+def rdflib_nodes_and_edges_within_n_hops(g, start_class, hops=1):
+    # Previous implementation: BFS over every predicate, then a re-scan of every node's edges
+    nodes = {start_class}
+    queue = deque([(start_class, 0)])
+    while queue:
+        current, depth = queue.popleft()
+        if depth >= hops:
+            continue
+        for p, o in g.predicate_objects(current):
+            if isinstance(o, URIRef) and o not in nodes:
+                nodes.add(o)
+                queue.append((o, depth + 1))
+        for s, p in g.subject_predicates(current):
+            if isinstance(s, URIRef) and s not in nodes:
+                nodes.add(s)
+                queue.append((s, depth + 1))
+    edges = []
+    for src in nodes:
+        for p, tgt in g.predicate_objects(src):
+            if isinstance(tgt, URIRef) and tgt in nodes and str(p) != str(RDF.type):
+                edges.append((src, p, tgt))
+    return nodes, edges
+
+
+def timed(func, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main(path=DEFAULT_ONTOLOGY):
+    g = Graph()
+    g.parse(path, format="turtle")
+    idx = build_ontology_index(g)
+    adjacency = idx.adjacency
+    print(f"{os.path.basename(path)}: {len(g)} triples, CSR adjacency with "
+          f"{len(adjacency)} nodes and {len(adjacency.source)} edges")
+
+    for hops in (1, 2, 3):
+        (nodes, edges), scan_time = timed(rdflib_nodes_and_edges_within_n_hops, g, SAMPLE_CLASS, hops, repeat=5)
+        (distance, csr_edges), csr_time = timed(adjacency.neighbourhood, SAMPLE_CLASS, hops, None, repeat=50)
+        print(f"{hops} hops  rdflib BFS: {scan_time * 1000:8.2f} ms ({len(nodes)} nodes, {len(edges)} edges)   "
+              f"CSR: {csr_time * 1000:6.2f} ms ({len(distance)} nodes, {len(csr_edges)} edges)")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:])
@@ -0,0 +1,77 @@
+"""
+Compare the full-ontology scan previously done by get_reverse_restriction_properties
+with the inverted map built by build_reverse_restriction_map.
+
+Run from the onto-explorer directory:
+
+    python benchmarks/bench_reverse_restrictions.py [ontology.ttl]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+
+from rdflib import Graph, RDF, RDFS, OWL, URIRef
+from ontology_index import build_reverse_restriction_map
+
+DEFAULT_ONTOLOGY = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "example_data", "ebucoreplus-2-0.owl"
+)
+SAMPLE_CLASS = URIRef("http://www.ebu.ch/metadata/ontologies/ebucoreplus#EditorialObject")
+
+
+def scan_reverse_restriction_properties(g, target_class):
+    # Previous implementation: O(classes x restrictions) per selected class
+    links = []
+    for cls in g.subjects(RDF.type, OWL.Class):
+        for restriction in g.objects(cls, RDFS.subClassOf):
+            if (restriction, RDF.type, OWL.Restriction) in g:
+                prop = next(g.objects(restriction, OWL.onProperty), None)
+                if (restriction, OWL.allValuesFrom, target_class) in g:
+                    links.append((cls, prop, "owl:allValuesFrom"))
+                elif (restriction, OWL.someValuesFrom, target_class) in g:
+                    links.append((cls, prop, "owl:someValuesFrom"))
+                elif (restriction, OWL.hasValue, target_class) in g:
+                    links.append((cls, prop, "owl:hasValue"))
+                elif (restriction, OWL.onClass, target_class) in g:
+                    links.append((cls, prop, "owl:onClass"))
+    return links
+
+
+def timed(func, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+
+def main(path=DEFAULT_ONTOLOGY):
+    g = Graph()
+    g.parse(path, format="turtle")
+    classes = list(set(g.subjects(RDF.type, OWL.Class)))
+    print(f"{os.path.basename(path)}: {len(g)} triples, {len(classes)} classes")
+
+    reverse, build_time = timed(build_reverse_restriction_map, g)
+    print(f"inverted map build:          {build_time * 1000:8.2f} ms (once per ontology)")
+
+    _, scan_time = timed(scan_reverse_restriction_properties, g, SAMPLE_CLASS, repeat=20)
+    _, lookup_time = timed(reverse.get, SAMPLE_CLASS, (), repeat=20)
+    print(f"scan per selected class:     {scan_time * 1000:8.2f} ms")
+    print(f"lookup per selected class:   {lookup_time * 1000:8.4f} ms")
+
+    mismatches = 0
+    start = time.perf_counter()
+    for cls in classes:
+        expected = sorted(map(str, scan_reverse_restriction_properties(g, cls)))
+        if expected != sorted(map(str, reverse.get(cls, ()))):
+            mismatches += 1
+    print(f"scan over all classes:       {(time.perf_counter() - start) * 1000:8.2f} ms")
+    print(f"classes with differing links: {mismatches}")
+    return mismatches
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main(*sys.argv[1:2]) else 0)
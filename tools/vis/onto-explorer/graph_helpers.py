@@ -1,12 +1,55 @@
 # graph_helpers.py
 
 from pyvis.network import Network
-from ontology_helpers import pretty_print_uri, get_label_and_description
+from ontology_helpers import pretty_print_uri, get_label_and_description, get_subclasses, get_superclasses
 from config import grouped_main_classes, group_colors, get_class_color
+from layout import layered_layout, force_layout
+from overview import OTHER_DOMAIN
+
+# Dragging a node pins it in place, double-clicking releases it
+PIN_NODES_SCRIPT = """
+<script type="text/javascript">
+  network.on("dragEnd", function(params) {
+    if (params.nodes.length > 0) {
+      params.nodes.forEach(function(nodeId) {
+        network.body.data.nodes.update({id: nodeId, fixed: {x:true, y:true}});
+      });
+    }
+  });
+  network.on("doubleClick", function(params) {
+    if (params.nodes.length > 0) {
+      params.nodes.forEach(function(nodeId) {
+        network.body.data.nodes.update({id: nodeId, fixed: {x:false, y:false}});
+      });
+    }
+  });
+</script>
+"""
+
+
+def network_structure(net):
+    """Hashable (nodes, edges) of a pyvis Network, the cache key of the layout functions."""
+    nodes = tuple(node["id"] for node in net.nodes)
+    edges = tuple(sorted({(edge["from"], edge["to"]) for edge in net.edges}))
+    return nodes, edges
+
+
+def apply_layout(net, positions):
+    for node in net.nodes:
+        node["x"], node["y"] = positions[node["id"]]
+
+
+def network_to_html(net, pin_nodes=False):
+    """Render a pyvis Network straight to an HTML string (no file written)."""
+    html = net.generate_html()
+    if pin_nodes:
+        end = html.rfind("</body>")
+        html = html[:end] + PIN_NODES_SCRIPT + html[end:]
+    return html
 
 
 def build_graph_base(
-    g,
+    idx,
     class_uri,
     subclasses,
     superclasses,
@@ -18,6 +61,7 @@ def build_graph_base(
     show_reverse_links=False       
 ):
     net = Network(height="800px", width="100%", notebook=False, directed=True)
+    # Positions are computed server-side (force_layout), so the browser skips physics
     net.set_options("""
         {
           "interaction": {
@@ -26,20 +70,7 @@ def build_graph_base(
             "zoomView": true
           },
           "physics": {
-            "enabled": true,
-            "barnesHut": {
-              "gravitationalConstant": -6000,
-              "centralGravity": 0.001,
-              "springLength": 350,
-              "springConstant": 0.04,
-              "damping": 0.09,
-              "avoidOverlap": 1
-            },
-            "minVelocity": 0.75,
-            "stabilization": {
-              "enabled": true,
-              "iterations": 250
-            }
+            "enabled": false
           },
           "nodes": {
             "font": {
@@ -53,7 +84,9 @@ def build_graph_base(
               "background": "white",
               "strokeWidth": 2
             },
-            "smooth": true
+            "smooth": {
+              "type": "continuous"
+            }
           }
         }
     """)
@@ -61,7 +94,7 @@ def build_graph_base(
     def add_node_with_metadata(uri, color=None):
         label = pretty_print_uri(uri)
         node_color = color or get_class_color(label)
-        title = get_label_and_description(g, uri)
+        title = get_label_and_description(idx, uri)
         net.add_node(str(uri), label=label, title=title, color=node_color)
 
     add_node_with_metadata(class_uri, color="red")
@@ -69,10 +102,10 @@ def build_graph_base(
     # Subclasses and superclasses (always shown)
     for sub in subclasses:
         add_node_with_metadata(sub)
-        net.add_edge(str(class_uri), str(sub), title="Subclass", label="Subclass", color="purple", arrows="to", smooth=True)
+        net.add_edge(str(class_uri), str(sub), title="Subclass", label="Subclass", color="purple", arrows="to")
     for sup in superclasses:
         add_node_with_metadata(sup)
-        net.add_edge(str(sup), str(class_uri), title="Superclass", label="Superclass", color="purple", arrows="to", smooth=True)
+        net.add_edge(str(sup), str(class_uri), title="Superclass", label="Superclass", color="purple", arrows="to")
 
     # Add restriction-based edges (only if expand_all)
     if expand_all:
@@ -83,7 +116,7 @@ def build_graph_base(
                     prop_label = pretty_print_uri(prop)
                     net.add_edge(
                         str(class_uri), str(rvalue["on_class"]),
-                        title=prop_label, label=prop_label, color="blue", arrows="to", smooth=True,
+                        title=prop_label, label=prop_label, color="blue", arrows="to",
                         font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2}
                     )
             elif rvalue:
@@ -91,7 +124,7 @@ def build_graph_base(
                 prop_label = pretty_print_uri(prop)
                 net.add_edge(
                     str(class_uri), str(rvalue),
-                    title=prop_label, label=prop_label, color="blue", arrows="to", smooth=True,
+                    title=prop_label, label=prop_label, color="blue", arrows="to",
                     font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2}
                 )
 
@@ -101,7 +134,7 @@ def build_graph_base(
             prop_label = pretty_print_uri(prop)
             net.add_edge(
                 str(src_cls), str(class_uri),
-                title=prop_label, label=prop_label, color="blue", arrows="to", smooth=True,
+                title=prop_label, label=prop_label, color="blue", arrows="to",
                 font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2}
             )
 
@@ -109,9 +142,143 @@ def build_graph_base(
     broader, narrower = skos_info
     for b in broader:
         add_node_with_metadata(b, color="green")
-        net.add_edge(str(b), str(class_uri), title="broader", label="broader", smooth=True, font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2})
+        net.add_edge(str(b), str(class_uri), title="broader", label="broader", font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2})
     for n in narrower:
         add_node_with_metadata(n, color="green")
-        net.add_edge(str(class_uri), str(n), title="narrower", label="narrower", smooth=True, font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2})
+        net.add_edge(str(class_uri), str(n), title="narrower", label="narrower", font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2})
+
+    apply_layout(net, force_layout(*network_structure(net), center=str(class_uri)))
+    return net
+
+
+def build_class_hierarchy_graph(idx, selected_class):
+    """Class View: every ancestor and descendant of ``selected_class`` with subclass edges."""
+    net = Network(height="700px", width="100%", notebook=False, directed=True)
+    net.set_options("""
+        {
+          "interaction": {"dragNodes": true, "dragView": true, "zoomView": true},
+          "physics": {"enabled": false},
+          "nodes": {"font": {"size": 18}},
+          "edges": {"font": {"size": 16, "align": "top", "background": "white", "strokeWidth": 2},
+                    "smooth": {"type": "cubicBezier", "forceDirection": "vertical", "roundness": 0.4}}
+        }
+    """)
+
+    visited_up = set()
+    visited_down = set()
+
+    def add_superclasses(child):
+        if child in visited_up:
+            return
+        visited_up.add(child)
+        label = pretty_print_uri(child)
+        color = "red" if child == selected_class else get_class_color(label)
+        title = get_label_and_description(idx, child)
+        net.add_node(str(child), label=label, title=title, color=color)
+        for parent in get_superclasses(idx, child):
+            add_superclasses(parent)
+            net.add_edge(str(parent), str(child), label="Superclass", color="purple", arrows="to")
+
+    def add_subclasses(parent):
+        if parent in visited_down:
+            return
+        visited_down.add(parent)
+        label = pretty_print_uri(parent)
+        color = "red" if parent == selected_class else get_class_color(label)
+        title = get_label_and_description(idx, parent)
+        net.add_node(str(parent), label=label, title=title, color=color)
+        for child in get_subclasses(idx, parent):
+            add_subclasses(child)
+            net.add_edge(str(parent), str(child), label="Subclass", color="purple", arrows="to")
+
+    # Add the upward path (all ancestors)
+    add_superclasses(selected_class)
+    # Add the downward tree (all descendants)
+    add_subclasses(selected_class)
+
+    apply_layout(net, layered_layout(*network_structure(net)))
+    return net
+
+
+def build_overview_graph(overview, expanded=()):
+    """
+    Whole-ontology overview: one super-node per collapsed domain, one node per main
+    class of each domain in ``expanded``. Node size follows the class count, edge
+    width the number of bundled restriction / subclass links.
+    """
+    net = Network(height="800px", width="100%", notebook=False, directed=True)
+    net.set_options("""
+        {
+          "interaction": {"dragNodes": true, "dragView": true, "zoomView": true},
+          "physics": {"enabled": false},
+          "nodes": {"font": {"size": 18}, "scaling": {"min": 15, "max": 60}},
+          "edges": {"font": {"size": 14, "align": "top", "background": "white", "strokeWidth": 2},
+                    "smooth": {"type": "curvedCW", "roundness": 0.15},
+                    "scaling": {"min": 1, "max": 12}}
+        }
+    """)
+
+    nodes, bundles = overview.aggregate(expanded)
+    for key, node in nodes.items():
+        color = group_colors.get(node["domain"], "gray")
+        internal = f"\n{node['internal']} links inside" if node["internal"] else ""
+        if node["unit"] is None:
+            label = node["domain"]
+            title = f"{node['domain']} domain\n{node['classes']} classes{internal}"
+            shape = "box" if node["domain"] != OTHER_DOMAIN else "ellipse"
+        else:
+            label = pretty_print_uri(node["unit"])
+            title = f"{label} ({node['domain']})\n{node['classes']} classes{internal}"
+            shape = "dot"
+        net.add_node(str(key), label=label, title=title, color=color, shape=shape, value=node["classes"])
+
+    for (source, target, kind), count in sorted(bundles.items(), key=lambda item: str(item[0])):
+        if kind == "restriction":
+            net.add_edge(str(source), str(target), value=count, label=str(count),
+                         title=f"{count} restrictions", color="blue", arrows="to")
+        else:
+            net.add_edge(str(source), str(target), value=count,
+                         title=f"{count} subclass links", color="purple", arrows="to", dashes=True)
+
+    apply_layout(net, force_layout(*network_structure(net)))
+    return net
+
+
+# Edge colors per adjacency edge type in the N-hop view
+NHOP_EDGE_COLORS = {
+    "restriction": "blue",
+    "subclass": "purple",
+    "skos": "green",
+    "domain/range": "orange",
+}
+
+
+def build_nhop_graph(idx, selected_class, distance, edges):
+    """
+    N-hop view: the classes in ``distance`` (URI -> hop count from ``selected_class``)
+    and the typed ``edges`` (source, predicate, target, kind) among them.
+    """
+    net = Network(height="800px", width="100%", notebook=False, directed=True)
+    net.set_options("""
+        {
+          "interaction": {"dragNodes": true, "dragView": true, "zoomView": true},
+          "physics": {"enabled": false},
+          "nodes": {"font": {"size": 18}},
+          "edges": {"font": {"size": 14, "align": "top", "background": "white", "strokeWidth": 2},
+                    "smooth": {"type": "continuous"}}
+        }
+    """)
+
+    for uri, hops in sorted(distance.items(), key=lambda item: (item[1], str(item[0]))):
+        label = pretty_print_uri(uri)
+        color = "red" if uri == selected_class else get_class_color(label)
+        title = f"{get_label_and_description(idx, uri)}\n{hops} hop{'s' if hops != 1 else ''} away"
+        net.add_node(str(uri), label=label, title=title, color=color)
+
+    for source, predicate, target, kind in edges:
+        prop_label = pretty_print_uri(predicate)
+        net.add_edge(str(source), str(target), title=f"{prop_label} ({kind})", label=prop_label,
+                     color=NHOP_EDGE_COLORS[kind], arrows="to")
 
+    apply_layout(net, force_layout(*network_structure(net), center=str(selected_class)))
     return net
@@ -0,0 +1,152 @@
+# hierarchy.py
+
+
+class ClassHierarchy:
+    """
+    Precomputed subclass closure of an ontology.
+
+    The superclass graph is condensed into strongly connected components (so
+    subclass cycles are handled), then ancestor and descendant sets are built
+    once in topological order. Every member of a component shares the same
+    frozenset, and membership tests are O(1).
+    """
+
+    def __init__(self, superclasses, subclasses):
+        # superclasses / subclasses: node -> tuple of direct parents / children
+        self.superclasses = superclasses
+        self.subclasses = subclasses
+        nodes = set(superclasses) | set(subclasses)
+        for parents in superclasses.values():
+            nodes.update(parents)
+        for children in subclasses.values():
+            nodes.update(children)
+
+        components = strongly_connected_components(sorted(nodes, key=str), superclasses)
+        # Components come out parents-first, so their position is a topological rank
+        self.rank = {}
+        for rank, members in enumerate(components):
+            for node in members:
+                self.rank[node] = rank
+
+        self.ancestors = {}
+        for rank, members in enumerate(components):
+            closure = set()
+            for node in members:
+                for parent in superclasses.get(node, ()):
+                    if self.rank[parent] != rank:
+                        closure.add(parent)
+                        closure.update(self.ancestors[parent])
+            if self._is_cyclic(members, superclasses):
+                closure.update(members)
+            closure = frozenset(closure)
+            for node in members:
+                self.ancestors[node] = closure
+
+        self.descendants = {}
+        for rank in range(len(components) - 1, -1, -1):
+            members = components[rank]
+            closure = set()
+            for node in members:
+                for child in subclasses.get(node, ()):
+                    if self.rank[child] != rank:
+                        closure.add(child)
+                        closure.update(self.descendants[child])
+            if self._is_cyclic(members, superclasses):
+                closure.update(members)
+            closure = frozenset(closure)
+            for node in members:
+                self.descendants[node] = closure
+
+    @staticmethod
+    def _is_cyclic(members, edges):
+        return len(members) > 1 or members[0] in edges.get(members[0], ())
+
+    def ancestors_of(self, node):
+        """All transitive superclasses, nearest first (by topological rank)."""
+        found = self.ancestors.get(node, ())
+        return sorted(found, key=lambda n: (-self.rank[n], str(n)))
+
+    def descendants_of(self, node):
+        """All transitive subclasses, nearest first (by topological rank)."""
+        found = self.descendants.get(node, ())
+        return sorted(found, key=lambda n: (self.rank[n], str(n)))
+
+    def is_ancestor(self, ancestor, node):
+        return ancestor in self.ancestors.get(node, ())
+
+    def is_descendant(self, descendant, node):
+        return descendant in self.descendants.get(node, ())
+
+    def primary_path(self, node):
+        """
+        Follow the first direct superclass up from ``node`` and return the chain
+        root-first, ending with ``node``. Stops at a node already on the chain.
+        """
+        path = [node]
+        seen = {node}
+        current = node
+        while True:
+            supers = self.superclasses.get(current, ())
+            if not supers or supers[0] in seen:
+                break
+            current = supers[0]
+            seen.add(current)
+            path.append(current)
+        path.reverse()
+        return path
+
+    def top_ancestor(self, node):
+        return self.primary_path(node)[0]
+
+
+def strongly_connected_components(nodes, edges):
+    """
+    Iterative Tarjan: return the SCCs of the graph ``edges`` (node -> successors),
+    each as a list, with every component listed after the components it reaches.
+    """
+    index = {}
+    low = {}
+    stack = []
+    on_stack = set()
+    components = []
+    counter = 0
+
+    def visit(node):
+        nonlocal counter
+        index[node] = low[node] = counter
+        counter += 1
+        stack.append(node)
+        on_stack.add(node)
+
+    for root in nodes:
+        if root in index:
+            continue
+        visit(root)
+        work = [(root, iter(edges.get(root, ())))]
+        while work:
+            node, successors = work[-1]
+            descended = False
+            for succ in successors:
+                if succ not in index:
+                    visit(succ)
+                    work.append((succ, iter(edges.get(succ, ()))))
+                    descended = True
+                    break
+                if succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+            if descended:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                members = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    members.append(member)
+                    if member == node:
+                        break
+                components.append(members)
+    return components
@@ -0,0 +1,144 @@
+# layout.py
+
+from collections import defaultdict, deque
+from functools import lru_cache
+import math
+
+import numpy as np
+
+LAYER_GAP = 160      # vertical distance between hierarchy levels (px)
+NODE_GAP = 240       # horizontal distance between siblings (px)
+MAX_ROW = 12         # wider levels wrap onto extra rows
+EDGE_LENGTH = 300    # target mean edge length of force layouts (px)
+
+
+@lru_cache(maxsize=512)
+def layered_layout(nodes, edges, sweeps=4):
+    """
+    Layered (Sugiyama-style) layout for a subclass DAG.
+
+    ``nodes`` is a tuple of node ids, ``edges`` a tuple of (parent, child) pairs.
+    Levels come from the longest path from the roots (cycles are broken where
+    Kahn's algorithm gets stuck), node order inside a level from a few
+    barycenter sweeps. Returns {node: (x, y)} with parents above children.
+    """
+    children = defaultdict(list)
+    parents = defaultdict(list)
+    for parent, child in edges:
+        if parent != child:
+            children[parent].append(child)
+            parents[child].append(parent)
+
+    # --- levels: longest path layering, cycle-safe ---
+    indegree = {node: len(parents[node]) for node in nodes}
+    level = {node: 0 for node in nodes}
+    queue = deque(sorted((n for n in nodes if indegree[n] == 0), key=str))
+    remaining = set(nodes)
+    while remaining:
+        if not queue:
+            # Only cycles left: release the remaining node with the fewest unplaced parents
+            stuck = min(remaining, key=lambda n: (indegree[n], str(n)))
+            queue.append(stuck)
+        node = queue.popleft()
+        if node not in remaining:
+            continue
+        remaining.discard(node)
+        for child in children[node]:
+            if child in remaining:
+                level[child] = max(level[child], level[node] + 1)
+                indegree[child] -= 1
+                if indegree[child] == 0:
+                    queue.append(child)
+
+    layers = defaultdict(list)
+    for node in sorted(nodes, key=str):
+        layers[level[node]].append(node)
+    depth = max(layers) + 1 if layers else 0
+
+    # --- ordering: barycenter sweeps, down then up ---
+    position = {}
+    for lvl in range(depth):
+        for i, node in enumerate(layers[lvl]):
+            position[node] = i
+
+    def reorder(lvl, neighbours):
+        def barycenter(node):
+            placed = [position[n] for n in neighbours[node] if n in position]
+            return sum(placed) / len(placed) if placed else position[node]
+        layers[lvl].sort(key=lambda n: (barycenter(n), str(n)))
+        for i, node in enumerate(layers[lvl]):
+            position[node] = i
+
+    for _ in range(sweeps):
+        for lvl in range(1, depth):
+            reorder(lvl, parents)
+        for lvl in range(depth - 2, -1, -1):
+            reorder(lvl, children)
+
+    # --- coordinates: wide levels wrap onto several rows ---
+    coords = {}
+    y = 0.0
+    for lvl in range(depth):
+        layer = layers[lvl]
+        for start in range(0, len(layer), MAX_ROW):
+            row = layer[start:start + MAX_ROW]
+            offset = (len(row) - 1) / 2
+            for i, node in enumerate(row):
+                coords[node] = ((i - offset) * NODE_GAP, y)
+            y += LAYER_GAP
+    return coords
+
+
+@lru_cache(maxsize=512)
+def force_layout(nodes, edges, center=None, iterations=200, seed=0):
+    """
+    Fruchterman-Reingold layout (NumPy) for small property graphs.
+
+    ``nodes`` is a tuple of ids, ``edges`` a tuple of (source, target) pairs;
+    ``center`` is kept at the origin. Deterministic for a given seed.
+    Returns {node: (x, y)} scaled to a mean edge length of EDGE_LENGTH.
+    """
+    n = len(nodes)
+    if n == 0:
+        return {}
+    if n == 1:
+        return {nodes[0]: (0.0, 0.0)}
+    index = {node: i for i, node in enumerate(nodes)}
+    adjacency = np.zeros((n, n))
+    for source, target in edges:
+        i, j = index[source], index[target]
+        if i != j:
+            adjacency[i, j] = adjacency[j, i] = 1.0
+
+    rng = np.random.default_rng(seed)
+    pos = rng.uniform(-0.5, 0.5, size=(n, 2))
+    pinned = index.get(center)
+    if pinned is not None:
+        pos[pinned] = 0.0
+    k = math.sqrt(1.0 / n)
+    temperature = 0.1
+    cooling = temperature / (iterations + 1)
+    for _ in range(iterations):
+        delta = pos[:, None, :] - pos[None, :, :]
+        distance = np.linalg.norm(delta, axis=-1)
+        np.fill_diagonal(distance, 1.0)
+        distance = np.maximum(distance, 0.01)
+        # Repulsion between every pair, attraction along edges
+        strength = k * k / distance ** 2 - adjacency * distance / k
+        np.fill_diagonal(strength, 0.0)
+        displacement = np.einsum("ijk,ij->ik", delta, strength)
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-9)
+        pos += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        if pinned is not None:
+            pos[pinned] = 0.0
+        temperature -= cooling
+
+    if pinned is None:
+        pos -= pos.mean(axis=0)
+    rows, cols = np.nonzero(np.triu(adjacency))
+    if len(rows):
+        mean_edge = np.linalg.norm(pos[rows] - pos[cols], axis=1).mean()
+    else:
+        mean_edge = k
+    pos *= EDGE_LENGTH / max(mean_edge, 1e-9)
+    return {node: (float(x), float(y)) for node, (x, y) in zip(nodes, pos)}
@@ -1,20 +1,137 @@
 
 import os 
+import sys
 import streamlit as st
+from streamlit import runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from rdflib import Graph, RDF, RDFS, OWL, URIRef, Literal
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
+from ontocommon.graph_cache import content_hash
+from ontocommon.shared_graphs import get_shared_graphs, format_stats
+from ontocommon.formats import UPLOAD_EXTENSIONS, sniff_format
+from ontocommon.fulltext import load_fulltext_index
+
 from ontology_helpers import *
-from graph_helpers import build_graph_base
-import tempfile
+from ontology_index import build_ontology_index
+from graph_helpers import build_graph_base, build_class_hierarchy_graph, build_overview_graph, build_nhop_graph, network_to_html
 from config import grouped_main_classes, group_colors, get_class_color
 from streamlit_searchbox import st_searchbox
-from rapidfuzz import process
-
-
-@st.cache_data
-def load_ontology(uploaded_file):
-    g = Graph()
-    g.parse(uploaded_file, format="turtle")
-    return g
+from search_index import build_class_search_index
+from render_store import RenderStore
+from overview import DomainOverview
+from adjacency import EDGE_KINDS
+
+
+def read_uploaded_bytes(uploaded_file):
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    with open(uploaded_file, "rb") as f:
+        return f.read()
+
+def file_key(uploaded_file):
+    # Cheap identity of a file version: the upload id, or the path with its size and mtime
+    if hasattr(uploaded_file, "file_id"):
+        return uploaded_file.file_id
+    stat = os.stat(uploaded_file)
+    return f"{uploaded_file}:{stat.st_size}:{stat.st_mtime_ns}"
+
+@st.cache_data(max_entries=64)
+def digest_for_key(key, _uploaded_file):
+    # Content hash of one file version; the file itself is not hashed by Streamlit (leading _)
+    return content_hash(read_uploaded_bytes(_uploaded_file))
+
+def file_digest(uploaded_file):
+    # Resolved once per file version, so reruns neither re-read nor re-hash the file
+    return digest_for_key(file_key(uploaded_file), uploaded_file)
+
+def load_ontology_handle(uploaded_file, digest=None):
+    # One read-only graph per file content, shared by all sessions without copying; parsed
+    # graphs are also kept on disk across restarts and instance data is dropped while parsing.
+    # The format is sniffed from the content (the name only breaks ties), so it is parsed once.
+    data = read_uploaded_bytes(uploaded_file)
+    rdf_format = sniff_format(data, getattr(uploaded_file, "name", uploaded_file))
+    return get_shared_graphs().get(data, rdf_format, schema_only=True, digest=digest or file_digest(uploaded_file))
+
+def load_ontology(uploaded_file, digest=None):
+    return load_ontology_handle(uploaded_file, digest).graph
+
+# The indexes below hold (or are built from) a shared graph: keep as many as the shared
+# registry keeps graphs, keyed by content digest, so an evicted graph is not pinned here
+MAX_CACHED_ONTOLOGIES = get_shared_graphs().max_entries
+
+@st.cache_resource(max_entries=MAX_CACHED_ONTOLOGIES)
+def load_ontology_index(digest, _uploaded_file):
+    # Shared, read-only lookup tables; built once per loaded file
+    return build_ontology_index(load_ontology(_uploaded_file, digest))
+
+@st.cache_resource(max_entries=MAX_CACHED_ONTOLOGIES)
+def load_search_index(digest, _uploaded_file):
+    # Preprocessed choices + trigram/prefix postings; searched on every keystroke
+    return build_class_search_index(load_ontology_index(digest, _uploaded_file))
+
+@st.cache_resource(max_entries=MAX_CACHED_ONTOLOGIES)
+def load_fulltext(digest, _uploaded_file):
+    # BM25 index over labels/descriptions/definitions/examples, persisted with the parse cache
+    # Keyed like the graph it is built from (content, format, schema-only filter version)
+    handle = load_ontology_handle(_uploaded_file, digest)
+    return load_fulltext_index(handle.graph, handle.digest, handle.rdf_format, handle.schema_only)
+
+@st.cache_resource(max_entries=MAX_CACHED_ONTOLOGIES)
+def load_overview(digest, _uploaded_file):
+    # Class counts and edge bundles per main class, folded per level of detail on demand
+    return DomainOverview(load_ontology_index(digest, _uploaded_file), grouped_main_classes)
+
+def build_graph_html(uploaded_file, digest, class_uri, view_mode, expand_all=False, show_reverse_links=False,
+                     **view_options):
+    if view_mode == "overview":
+        overview = load_overview(digest, uploaded_file)
+        return network_to_html(build_overview_graph(overview, view_options["expanded_domains"]))
+    idx = load_ontology_index(digest, uploaded_file)
+    selected_class = URIRef(class_uri)
+    if view_mode == "class":
+        return network_to_html(build_class_hierarchy_graph(idx, selected_class))
+    if view_mode == "nhop":
+        distance, edges = idx.adjacency.neighbourhood(selected_class, view_options["hops"], view_options["edge_kinds"])
+        return network_to_html(build_nhop_graph(idx, selected_class, distance, edges), pin_nodes=True)
+    net = build_graph_base(
+        idx, selected_class,
+        get_subclasses(idx, selected_class),
+        get_superclasses(idx, selected_class),
+        get_restriction_properties(idx, selected_class),
+        get_reverse_restriction_properties(idx, selected_class),
+        get_skos_broader_narrower(idx, selected_class),
+        [label for group in grouped_main_classes.values() for label in group],
+        expand_all=expand_all,
+        show_reverse_links=show_reverse_links
+    )
+    return network_to_html(net, pin_nodes=True)
+
+def current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx else None
+
+def is_session_active(session_id):
+    # Without a running server (e.g. bare script runs) sessions are never considered gone
+    return not runtime.exists() or runtime.get_instance().is_active_session(session_id)
+
+@st.cache_resource
+def get_render_store():
+    return RenderStore(is_session_active=is_session_active)
+
+def render_graph_html(uploaded_file, digest, class_uri, view_mode, expand_all=False, show_reverse_links=False,
+                      **view_options):
+    # Graph View HTML, kept per (file digest, class, view mode, toggles) in the bounded render store;
+    # view_options are the extra settings of the overview / N-hop modes and must be hashable
+    store = get_render_store()
+    store.cleanup_sessions()
+    key = (digest, class_uri, view_mode, expand_all, show_reverse_links, tuple(sorted(view_options.items())))
+    return store.get_or_render(
+        key,
+        lambda: build_graph_html(uploaded_file, digest, class_uri, view_mode, expand_all, show_reverse_links,
+                                 **view_options),
+        session_id=current_session_id()
+    )
 
 def main():
 
@@ -31,38 +148,27 @@ def main():
 
     # Load pre-uploaded default file from example_data
     default_ontology_path = os.path.join(os.path.dirname(__file__), "example_data", "ebucoreplus-2-0.owl")
-    uploaded_file = st.sidebar.file_uploader("Upload your Turtle (.ttl) or OWL file", type=["ttl", "owl"])
+    uploaded_file = st.sidebar.file_uploader(
+        "Upload your ontology (Turtle, RDF/XML, N-Triples or JSON-LD)", type=UPLOAD_EXTENSIONS
+    )
 
     if uploaded_file is None and os.path.exists(default_ontology_path):
         uploaded_file = default_ontology_path
 
     if uploaded_file is not None:
         try:
-            g = load_ontology(uploaded_file)
+            digest = file_digest(uploaded_file)
+            idx = load_ontology_index(digest, uploaded_file)
             namespace_uri = "http://www.ebu.ch/metadata/ontologies/ebucoreplus#"
-            main_classes_list = [label for group in grouped_main_classes.values() for label in group]
 
             # === Sidebar: Global class search ===
             st.sidebar.subheader("Global Class Search")
 
-            all_class_uris = set(s for s in g.subjects(RDF.type, OWL.Class))
-            dropdown = []
-            for uri in all_class_uris:
-                frag = pretty_print_uri(uri)
-                lbls = list(g.objects(uri, RDFS.label))
-                if re.match(r"^n[0-9a-f]{32}$", frag):
-                    if lbls:
-                        dropdown.append((get_class_display_label(g, uri), uri))
-                else:
-                    dropdown.append((get_class_display_label(g, uri), uri))
-
-            dropdown = [(lbl, uri) for lbl, uri in dropdown if lbl and lbl.strip()]
-            dropdown = sorted(dropdown, key=lambda x: x[0].lower())
-            label_to_uri = {label: uri for label, uri in dropdown}
+            search_index = load_search_index(digest, uploaded_file)
+            label_to_uri = search_index.label_to_uri
 
             def search_func(query):
-                matches = process.extract(query, label_to_uri.keys(), limit=10)
-                return [m[0] for m in matches if m[1] >= 50]
+                return search_index.search(query, limit=10, score_cutoff=50)
 
             fuzzy_label = st_searchbox(
                 search_func,
@@ -73,6 +179,31 @@ def main():
 
             dropdown_label = st.sidebar.selectbox("Or browse all classes", list(label_to_uri.keys()), key="global_fallback")
 
+            # === Sidebar: Full-text search ===
+            st.sidebar.markdown("---")
+            st.sidebar.subheader("Full-text Search")
+            fulltext = load_fulltext(digest, uploaded_file)
+            fulltext_query = st.sidebar.text_input(
+                "Labels, descriptions, definitions, examples", key="fulltext_query",
+                placeholder="e.g. audio channel, Sendung, émission"
+            )
+            fulltext_languages = st.sidebar.multiselect(
+                "Languages", fulltext.languages, default=fulltext.languages, key="fulltext_languages"
+            )
+            fulltext_hit = None
+            if fulltext_query:
+                hits = fulltext.search(fulltext_query, languages=fulltext_languages, limit=20)
+                hit_options = {
+                    f"{hit.label} ({pretty_print_uri(hit.uri)}) · {hit.kind}": hit for hit in hits
+                }
+                if hit_options:
+                    fulltext_choice = st.sidebar.selectbox("Matches", list(hit_options), key="fulltext_choice")
+                    fulltext_hit = hit_options[fulltext_choice]
+                    if fulltext_hit.kind != "class":
+                        st.sidebar.caption(f"{fulltext_hit.kind}: [{fulltext_hit.uri}]({fulltext_hit.uri})")
+                else:
+                    st.sidebar.caption("No matches.")
+
             # === Sidebar: Domain selection ===
             st.sidebar.markdown("---")
             st.sidebar.subheader("Main Class Browser")
@@ -85,6 +216,12 @@ def main():
                 selected_class_label = fuzzy_label
                 selected_class = label_to_uri[fuzzy_label]
                 st.session_state["selection_source"] = "fuzzy"
+            elif (fulltext_hit is not None and fulltext_hit.kind == "class"
+                    and st.session_state.get("fulltext_choice") != st.session_state.get("last_fulltext_choice")):
+                selected_class = URIRef(fulltext_hit.uri)
+                selected_class_label = get_class_display_label(idx, selected_class)
+                st.session_state["selection_source"] = "fulltext"
+                st.session_state["last_fulltext_choice"] = st.session_state.get("fulltext_choice")
             elif st.session_state.get("global_fallback") != st.session_state.get("last_global_fallback"):
                 selected_class_label = dropdown_label
                 selected_class = label_to_uri[dropdown_label]
@@ -117,12 +254,12 @@ def main():
 
             st.info(f"Selected class: {selected_class_label}")
 
-            subclasses = get_subclasses(g, selected_class)
-            superclasses = get_superclasses(g, selected_class)
-            restriction_props = get_restriction_properties(g, selected_class)
-            reverse_links = get_reverse_restriction_properties(g, selected_class)
-            labels, descriptions = get_skos_labels_and_descriptions(g, selected_class)
-            broader, narrower = get_skos_broader_narrower(g, selected_class)
+            subclasses = get_subclasses(idx, selected_class)
+            superclasses = get_superclasses(idx, selected_class)
+            restriction_props = get_restriction_properties(idx, selected_class)
+            reverse_links = get_reverse_restriction_properties(idx, selected_class)
+            labels, descriptions = get_skos_labels_and_descriptions(idx, selected_class)
+            broader, narrower = get_skos_broader_narrower(idx, selected_class)
 
             tabs = st.tabs([
                 "Graph View", "Overview", "Properties", "Reverse Properties",
@@ -136,129 +273,75 @@ def main():
                 show_all_restrictions = st.checkbox("Show properties ", value=False)
                 show_reverse_links = st.checkbox("Show incoming properties", value=False)
 
-                cols = st.columns(2)
+                cols = st.columns(4)
                 if cols[0].button("Property View"):
                     st.session_state['expand_level'] = 0
                 if cols[1].button("Class View"):
                     st.session_state['expand_level'] = -1
+                if cols[2].button("Ontology Overview"):
+                    st.session_state['expand_level'] = -2
+                if cols[3].button("N-hop View"):
+                    st.session_state['expand_level'] = -3
 
                 expand_level = st.session_state.get('expand_level', 0)
 
                 if expand_level == 0:
-
-                    net = build_graph_base(
-                        g, selected_class, subclasses, superclasses,
-                        restriction_props, reverse_links, (broader, narrower),
-                        main_classes_list,
-                        expand_all=show_all_restrictions,
-                        show_reverse_links=show_reverse_links
-                        )
-
-                     # Render graph
-
-                    def patch_html_for_pinning(html_path):
-                        with open(html_path, "r", encoding="utf-8") as f:
-                            html = f.read()
-                        pin_script = """
-                        <script type="text/javascript">
-                          network.on("dragEnd", function(params) {
-                            if (params.nodes.length > 0) {
-                              params.nodes.forEach(function(nodeId) {
-                                network.body.data.nodes.update({id: nodeId, fixed: {x:true, y:true}});
-                              });
-                            }
-                          });
-                          network.on("doubleClick", function(params) {
-                            if (params.nodes.length > 0) {
-                              params.nodes.forEach(function(nodeId) {
-                                network.body.data.nodes.update({id: nodeId, fixed: {x:false, y:false}});
-                              });
-                            }
-                          });
-                        </script>
-                        """
-                        html = html.replace("</body>", pin_script + "</body>")
-                        with open(html_path, "w", encoding="utf-8") as f:
-                            f.write(html)
-
-                    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-                   
-                    net.save_graph(tmp_file.name)
-                    patch_html_for_pinning(tmp_file.name)
-                    st.components.v1.html(open(tmp_file.name, 'r', encoding='utf-8').read(), height=800, width=1600, scrolling=True)
-
-                    # ---- Legend ----
-                    st.markdown("### Main Classes Legend")
-                    legend_html = ""
-                    for group, color in group_colors.items():
-                        legend_html += f'<span style="display:inline-block;width:20px;height:20px;background:{color};border-radius:5px;margin-right:8px;border:1px solid #333"></span> {group}<br>'
-                    legend_html += '<span style="display:inline-block;width:20px;height:20px;background:red;border-radius:5px;margin-right:8px;border:1px solid #333"></span> Selected class<br>'
-                    st.markdown(legend_html, unsafe_allow_html=True)
-
-
+                    graph_html = render_graph_html(
+                        uploaded_file, digest, str(selected_class), "property",
+                        expand_all=show_all_restrictions, show_reverse_links=show_reverse_links
+                    )
                 elif expand_level == -1:
-
                     st.markdown("### Class Hierarchy Graph")
-                    net = Network(height="700px", width="100%", notebook=False, directed=True)
-                    net.set_options("""
-                        {
-                          "interaction": {"dragNodes": true, "dragView": true, "zoomView": true},
-                          "physics": {"enabled": true, "barnesHut": {"springLength": 350}},
-                          "nodes": {"font": {"size": 18}},
-                          "edges": {"font": {"size": 16, "align": "top", "background": "white", "strokeWidth": 2}, "smooth": true}
-                        }
-                    """)
-
-                    visited_up = set()
-                    visited_down = set()
-
-                    def add_superclasses(child):
-                        if child in visited_up:
-                            return
-                        visited_up.add(child)
-                        label = pretty_print_uri(child)
-                        color = "red" if child == selected_class else get_class_color(label)
-                        title = get_label_and_description(g, child)
-                        net.add_node(str(child), label=label, title=title, color=color)
-                        for parent in get_superclasses(g, child):
-                            add_superclasses(parent)
-                            net.add_edge(str(parent), str(child), label="Superclass", color="purple", arrows="to")
-
-                    def add_subclasses(parent):
-                        if parent in visited_down:
-                            return
-                        visited_down.add(parent)
-                        label = pretty_print_uri(parent)
-                        color = "red" if parent == selected_class else get_class_color(label)
-                        title = get_label_and_description(g, parent)
-                        net.add_node(str(parent), label=label, title=title, color=color)
-                        for child in get_subclasses(g, parent):
-                            add_subclasses(child)
-                            net.add_edge(str(parent), str(child), label="Subclass", color="purple", arrows="to")
-
-                    # Add the upward path (all ancestors)
-                    add_superclasses(selected_class)
-                    # Add the downward tree (all descendants)
-                    add_subclasses(selected_class)
-
-                    # Render graph
-                    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix=".html")
-                    net.save_graph(tmp_file.name)
-                    st.components.v1.html(open(tmp_file.name, 'r', encoding='utf-8').read(), height=800, width=1600, scrolling=True)
-
-                    # ---- Legend ----
-                    st.markdown("### Main Classes Legend")
-                    legend_html = ""
-                    for group, color in group_colors.items():
-                        legend_html += f'<span style="display:inline-block;width:20px;height:20px;background:{color};border-radius:5px;margin-right:8px;border:1px solid #333"></span> {group}<br>'
-                    legend_html += '<span style="display:inline-block;width:20px;height:20px;background:red;border-radius:5px;margin-right:8px;border:1px solid #333"></span> Selected class<br>'
-                    st.markdown(legend_html, unsafe_allow_html=True)
+                    graph_html = render_graph_html(uploaded_file, digest, str(selected_class), "class")
+                elif expand_level == -3:
+                    st.markdown("### N-hop Neighbourhood")
+                    hops = st.slider("Hops", min_value=1, max_value=5, value=2, key="nhop_hops")
+                    edge_kinds = st.multiselect(
+                        "Edge types", list(EDGE_KINDS), default=list(EDGE_KINDS), key="nhop_kinds"
+                    )
+                    graph_html = render_graph_html(
+                        uploaded_file, digest, str(selected_class), "nhop",
+                        hops=hops, edge_kinds=tuple(k for k in EDGE_KINDS if k in edge_kinds)
+                    )
+                else:
+                    st.markdown("### Ontology Overview")
+                    overview = load_overview(digest, uploaded_file)
+                    expanded_domains = st.multiselect(
+                        "Drill into domains", overview.domains, key="overview_expanded",
+                        help="Expanded domains show their main classes; the others stay collapsed."
+                    )
+                    st.caption(
+                        f"{len(overview.unit_of)} classes in {len(overview.domains)} domains · "
+                        "node size = classes, blue edges = restrictions, dashed purple = subclass links"
+                    )
+                    graph_html = render_graph_html(
+                        uploaded_file, digest, None, "overview",
+                        expanded_domains=tuple(d for d in overview.domains if d in expanded_domains)
+                    )
+                st.components.v1.html(graph_html, height=800, width=1600, scrolling=True)
+
+                # ---- Legend ----
+                st.markdown("### Main Classes Legend")
+                legend_html = ""
+                for group, color in group_colors.items():
+                    legend_html += f'<span style="display:inline-block;width:20px;height:20px;background:{color};border-radius:5px;margin-right:8px;border:1px solid #333"></span> {group}<br>'
+                legend_html += '<span style="display:inline-block;width:20px;height:20px;background:red;border-radius:5px;margin-right:8px;border:1px solid #333"></span> Selected class<br>'
+                st.markdown(legend_html, unsafe_allow_html=True)
+
+                with st.expander("Render cache", expanded=False):
+                    stats = get_render_store().stats()
+                    st.caption(
+                        f"{stats['artifacts']} graphs, {stats['bytes'] / 2**20:.2f} of {stats['max_bytes'] / 2**20:.0f} MiB, "
+                        f"{stats['sessions']} sessions · {stats['hits']} hits, {stats['misses']} misses, "
+                        f"{stats['evictions']} evictions"
+                    )
+                    st.caption(f"Shared ontologies: {format_stats(get_shared_graphs().stats())}")
 
 
             with tabs[1]:  # Overview
                 st.subheader("Class Overview")
                 st.markdown(f"**Full URI:** `{selected_class}`")
-                defined_by = list(g.objects(selected_class, RDFS.isDefinedBy))
+                defined_by = idx.defined_by.get(selected_class, ())
                 if defined_by:
                     st.markdown("**Reference/Defined by:**")
                     for ref in defined_by:
@@ -266,21 +349,19 @@ def main():
                     st.info("This is a documentation/reference link, not inheritance.")
 
                 # SKOS concept badge
-                if is_skos_concept_class(g, selected_class):
+                if is_skos_concept_class(idx, selected_class):
                     st.success("This class is a SKOS Concept.")
 
                 # SKOS & descriptive properties (only English)
                 st.markdown("**Labels :**")
-                english_labels = [l for l in g.objects(selected_class, RDFS.label) if getattr(l, 'language', None) == 'en']
-                st.write([format_node(l) for l in english_labels] or "_None_")
+                st.write([format_node(l) for l in labels] or "_None_")
 
                 st.markdown("**Descriptions :**")
-                english_descriptions = [d for d in g.objects(selected_class, URIRef("http://purl.org/dc/terms/description")) if getattr(d, 'language', None) == 'en']
-                st.write([format_node(d) for d in english_descriptions] or "_None_")
+                st.write([format_node(d) for d in descriptions] or "_None_")
 
                 # Add SKOS-specific fields (optional: only English )
-                skos_definitions = [str(d) for d in g.objects(selected_class, SKOS.definition) if getattr(d, 'language', None) == 'en']
-                skos_examples = [str(e) for e in g.objects(selected_class, SKOS.example) if getattr(e, 'language', None) == 'en']
+                skos_definitions = list(idx.definitions_en.get(selected_class, ()))
+                skos_examples = list(idx.examples_en.get(selected_class, ()))
                 if skos_definitions:
                     st.markdown("**SKOS Definitions:**")
                     st.write(skos_definitions)
@@ -288,7 +369,6 @@ def main():
                     st.markdown("**SKOS Examples:**")
                     st.write(skos_examples)
 
-                broader, narrower = get_skos_broader_narrower(g, selected_class)
                 st.markdown("**Broader Concepts:**")
                 st.write([format_node(b) for b in broader] or "_None_")
                 st.markdown("**Narrower Concepts:**")
@@ -332,13 +412,18 @@ def main():
             # In your Hierarchy tab:
             with tabs[4]:
                 st.subheader("Class Hierarchy")
-                show_class_hierarchy_tree(g, selected_class)
+                hierarchy_depth = st.number_input(
+                    "Subclass levels to show", min_value=1, max_value=50,
+                    value=HIERARCHY_DEFAULT_DEPTH, key="hierarchy_depth",
+                    help="Deeper branches are collapsed into a subclass count until you raise this."
+                )
+                show_class_hierarchy_tree(idx, selected_class, max_depth=hierarchy_depth)
 
               
         except Exception as e:
             st.error(f"⚠️ Error loading ontology: {e}")
     else:
-        st.info("👈 Upload a Turtle file to begin.")
+        st.info("👈 Upload an ontology file to begin.")
 
 if __name__ == "__main__":
     main()
@@ -1,76 +1,39 @@
-import re
+import html
 import streamlit as st
-from rdflib import Graph, RDF, RDFS, OWL, URIRef, Literal
-from rdflib.namespace import SKOS
-from pyvis.network import Network
-import tempfile
-import math
-import pandas as pd
-from rapidfuzz import process, fuzz
-from config import grouped_main_classes, group_colors, get_class_color
-
-
-
-def get_label_and_description(g, uri, max_length=200):
-    labels = [str(lbl) for lbl in g.objects(uri, RDFS.label) if getattr(lbl, 'language', None) == 'en']
-    descriptions = [str(desc) for desc in g.objects(uri, URIRef("http://purl.org/dc/terms/description")) if getattr(desc, 'language', None) == 'en']
-    label_text = "; ".join(labels) if labels else "None"
-    desc_text = "; ".join(descriptions) if descriptions else "None"
-    if len(desc_text) > max_length:
-        desc_text = desc_text[:max_length] + "..."
-    return f"Label: {label_text}\nDescription: {desc_text}"
-
-def get_transitive_superclasses(g, cls, visited=None):
-    if visited is None:
-        visited = set()
-    supers = list(g.objects(cls, RDFS.subClassOf))
-    all_supers = []
-    for s in supers:
-        if isinstance(s, URIRef) and s not in visited:
-            visited.add(s)
-            all_supers.append(s)
-            all_supers.extend(get_transitive_superclasses(g, s, visited))
-    return all_supers
-
-def get_transitive_subclasses(g, cls, visited=None):
-    if visited is None:
-        visited = set()
-    subs = list(g.subjects(RDFS.subClassOf, cls))
-    all_subs = []
-    for s in subs:
-        if isinstance(s, URIRef) and s not in visited:
-            visited.add(s)
-            all_subs.append(s)
-            all_subs.extend(get_transitive_subclasses(g, s, visited))
-    return all_subs
-
-def show_class_hierarchy(g, selected_class):
+from rdflib import URIRef, Literal
+from ontocommon.labels import short_name
+
+# All helpers below take an OntologyIndex (see ontology_index.py) rather than the
+# raw rdflib Graph, so per-class lookups are plain dict reads.
+
+
+def get_label_and_description(idx, uri):
+    return idx.label_resolver.tooltip(uri)
+
+def get_transitive_superclasses(idx, cls):
+    return idx.hierarchy.ancestors_of(cls)
+
+def get_transitive_subclasses(idx, cls):
+    return idx.hierarchy.descendants_of(cls)
+
+def show_class_hierarchy(idx, selected_class):
     st.markdown("### Superclasses")
-    supers = get_transitive_superclasses(g, selected_class)
+    supers = get_transitive_superclasses(idx, selected_class)
     if supers:
-        for s in supers:
-            st.markdown(f"- {format_node(s)}")
+        st.markdown("\n".join(f"- {format_node(s)}" for s in supers))
     else:
         st.write("_No superclasses found._")
 
     st.markdown("### Subclasses")
-    subs = get_transitive_subclasses(g, selected_class)
+    subs = get_transitive_subclasses(idx, selected_class)
     if subs:
-        for s in subs:
-            st.markdown(f"- {format_node(s)}")
+        st.markdown("\n".join(f"- {format_node(s)}" for s in subs))
     else:
         st.write("_No subclasses found._")
 
-from collections import deque
-
 
 def pretty_print_uri(uri):
-    uri_str = str(uri)
-    if "#" in uri_str:
-        return uri_str.split("#")[-1]
-    elif "/" in uri_str:
-        return uri_str.rstrip("/").split("/")[-1]
-    return uri_str
+    return short_name(uri)
 
 def format_node(node):
     if isinstance(node, URIRef):
@@ -80,197 +43,40 @@ def format_node(node):
     else:
         return str(node)
 
-def get_subclasses(g, cls):
-    return sorted([s for s in g.subjects(RDFS.subClassOf, cls) if isinstance(s, URIRef)])
-
-def get_superclasses(g, cls):
-    return sorted([s for s in g.objects(cls, RDFS.subClassOf) if isinstance(s, URIRef)])
-
-def get_reverse_restriction_properties(g, target_class):
-    links = []
-    for cls in g.subjects(RDF.type, OWL.Class):
-        for restriction in g.objects(cls, RDFS.subClassOf):
-            if (restriction, RDF.type, OWL.Restriction) in g:
-                prop = next(g.objects(restriction, OWL.onProperty), None)
-                if (restriction, OWL.allValuesFrom, target_class) in g:
-                    links.append((cls, prop, "owl:allValuesFrom"))
-                elif (restriction, OWL.someValuesFrom, target_class) in g:
-                    links.append((cls, prop, "owl:someValuesFrom"))
-                elif (restriction, OWL.hasValue, target_class) in g:
-                    links.append((cls, prop, "owl:hasValue"))
-                # catch owl:onClass!
-                elif (restriction, OWL.onClass, target_class) in g:
-                    links.append((cls, prop, "owl:onClass"))
-    return links
-
-
-def is_skos_concept_class(g, cls):
-    return (cls, RDFS.subClassOf, SKOS.Concept) in g
-
-def get_skos_labels_and_descriptions(g, cls):
-    labels = [l for l in g.objects(cls, RDFS.label) if getattr(l, 'language', None) == 'en']
-    descriptions = [d for d in g.objects(cls, URIRef("http://purl.org/dc/terms/description")) if getattr(d, 'language', None) == 'en']
+def get_subclasses(idx, cls):
+    return idx.subclasses.get(cls, ())
+
+def get_superclasses(idx, cls):
+    return idx.superclasses.get(cls, ())
+
+def get_reverse_restriction_properties(idx, target_class):
+    return idx.reverse_restrictions.get(target_class, ())
+
+
+def is_skos_concept_class(idx, cls):
+    return cls in idx.skos_concepts
+
+def get_skos_labels_and_descriptions(idx, cls):
+    labels = list(idx.labels_en.get(cls, ()))
+    descriptions = list(idx.descriptions_en.get(cls, ()))
     return labels, descriptions
 
-def get_skos_broader_narrower(g, cls):
-    broader = list(g.objects(cls, SKOS.broader))
-    narrower = list(g.objects(cls, SKOS.narrower))
+def get_skos_broader_narrower(idx, cls):
+    broader = list(idx.broader.get(cls, ()))
+    narrower = list(idx.narrower.get(cls, ()))
     return broader, narrower
 
-def build_graph_base(
-    g,
-    class_uri,
-    subclasses,
-    superclasses,
-    restriction_props,
-    reverse_links,
-    skos_info,
-    main_classes_list=None,
-    expand_all=False,              
-    show_reverse_links=False       
-):
-    net = Network(height="700px", width="100%", notebook=False, directed=True)
-    net.set_options("""
-        {
-          "interaction": {
-            "dragNodes": true,
-            "dragView": true,
-            "zoomView": true
-          },
-          "physics": {
-            "enabled": true,
-            "barnesHut": {
-              "gravitationalConstant": -6000,
-              "centralGravity": 0.001,
-              "springLength": 350,
-              "springConstant": 0.04,
-              "damping": 0.09,
-              "avoidOverlap": 1
-            },
-            "minVelocity": 0.75,
-            "stabilization": {
-              "enabled": true,
-              "iterations": 250
-            }
-          },
-          "nodes": {
-            "font": {
-              "size": 18
-            }
-          },
-          "edges": {
-            "font": {
-              "size": 16,
-              "align": "top",
-              "background": "white",
-              "strokeWidth": 2
-            },
-            "smooth": true
-          }
-        }
-    """)
-
-    def add_node_with_metadata(uri, color=None):
-        label = pretty_print_uri(uri)
-        node_color = color or get_class_color(label)
-        title = get_label_and_description(g, uri)
-        net.add_node(str(uri), label=label, title=title, color=node_color)
-
-    add_node_with_metadata(class_uri, color="red")
-
-    # Subclasses and superclasses (always shown)
-    for sub in subclasses:
-        add_node_with_metadata(sub)
-        net.add_edge(str(class_uri), str(sub), title="Subclass", label="Subclass", color="purple", arrows="to", smooth=True)
-    for sup in superclasses:
-        add_node_with_metadata(sup)
-        net.add_edge(str(sup), str(class_uri), title="Superclass", label="Superclass", color="purple", arrows="to", smooth=True)
-
-    # Add restriction-based edges (only if expand_all)
-    if expand_all:
-        for prop, rtype, rvalue in restriction_props:
-            if rtype == "qualified_cardinality" and isinstance(rvalue, dict):
-                if rvalue["on_class"]:
-                    add_node_with_metadata(rvalue["on_class"])
-                    prop_label = pretty_print_uri(prop)
-                    net.add_edge(
-                        str(class_uri), str(rvalue["on_class"]),
-                        title=prop_label, label=prop_label, color="blue", arrows="to", smooth=True,
-                        font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2}
-                    )
-            elif rvalue:
-                add_node_with_metadata(rvalue)
-                prop_label = pretty_print_uri(prop)
-                net.add_edge(
-                    str(class_uri), str(rvalue),
-                    title=prop_label, label=prop_label, color="blue", arrows="to", smooth=True,
-                    font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2}
-                )
-
-    if show_reverse_links:
-        for src_cls, prop, _ in reverse_links:
-            add_node_with_metadata(src_cls)
-            prop_label = pretty_print_uri(prop)
-            net.add_edge(
-                str(src_cls), str(class_uri),
-                title=prop_label, label=prop_label, color="blue", arrows="to", smooth=True,
-                font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2}
-            )
-
-    # SKOS broader/narrower
-    broader, narrower = skos_info
-    for b in broader:
-        add_node_with_metadata(b, color="green")
-        net.add_edge(str(b), str(class_uri), title="broader", label="broader", smooth=True, font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2})
-    for n in narrower:
-        add_node_with_metadata(n, color="green")
-        net.add_edge(str(class_uri), str(n), title="narrower", label="narrower", smooth=True, font={"size": 16, "align": "top", "background": "white", "strokeWidth": 2})
-
-    return net
-
-def has_human_label(g, uri):
-    return any(g.objects(uri, RDFS.label))
-
-def get_class_display_label(g, uri):
-
-    # Namespace to prefix mapping
-    nsmap = {
-    "http://www.ebu.ch/metadata/ontologies/ebucoreplus#": "ec",
-    "http://purl.org/dc/elements/1.1/": "dc",
-    "http://purl.org/dc/terms/": "dcterms",
-    "http://www.w3.org/2004/02/skos/core#": "skos",
-    "http://www.w3.org/2001/XMLSchema#": "xsd",
-    "http://www.w3.org/2002/07/owl#": "owl",
-    "http://www.w3.org/1999/02/22-rdf-syntax-ns#": "rdf",
-    "http://www.w3.org/2000/01/rdf-schema#": "rdfs",
-    }
-
-    uri_str = str(uri)
-    prefix = None
-    frag = pretty_print_uri(uri)
-    for ns, pre in nsmap.items():
-        if uri_str.startswith(ns):
-            prefix = pre
-            local = uri_str[len(ns):]
-            break
-    if not prefix:
-        # Fallback to just fragment if unknown namespace
-        prefix = ""
-        local = frag
-    label = None
-    lbls = list(g.objects(uri, RDFS.label))
-    for l in lbls:
-        if getattr(l, 'language', None) == 'en':
-            label = str(l)
-            break
-    if not label and lbls:
-        label = str(lbls[0])
-    if label:
-        return f"{label} ({prefix}:{local})" if prefix else f"{label} ({local})"
-    else:
-        return f"{prefix}:{local}" if prefix else local
+def has_human_label(idx, uri):
+    return bool(idx.labels.get(uri))
+
+def get_class_display_label(idx, uri):
+    label = idx.display_labels.get(uri)
+    if label is None:
+        label = idx.label_resolver.display(uri)
+    return label
 
-def get_all_connected_classes(g, selected_class):
+def get_all_connected_classes(idx, selected_class):
+    g = idx.graph
     connected = set()
     # Outgoing links
     for p, o in g.predicate_objects(selected_class):
@@ -282,158 +88,61 @@ def get_all_connected_classes(g, selected_class):
             connected.add(s)
     return connected
 
-def get_nodes_and_all_edges_within_n_hops(g, start_class, hops=1):
-    from collections import deque
+def get_nodes_and_all_edges_within_n_hops(idx, start_class, hops=1, kinds=None):
+    """
+    Classes within ``hops`` typed edges of ``start_class`` (either direction) and
+    every edge among them, from the CSR adjacency. ``kinds`` filters edge types
+    (see adjacency.EDGE_KINDS). Returns (nodes, [(source, predicate, target)]).
+    """
+    distance, edges = idx.adjacency.neighbourhood(start_class, hops, kinds)
+    return set(distance), [(s, p, o) for s, p, o, _ in edges]
 
-    nodes = set([start_class])
-    queue = deque([(start_class, 0)])
-    while queue:
-        current, depth = queue.popleft()
-        if depth >= hops:
-            continue
-        # Outgoing
-        for p, o in g.predicate_objects(current):
-            if isinstance(o, URIRef) and o not in nodes:
-                nodes.add(o)
-                queue.append((o, depth+1))
-        # Incoming
-        for s, p in g.subject_predicates(current):
-            if isinstance(s, URIRef) and s not in nodes:
-                nodes.add(s)
-                queue.append((s, depth+1))
-    edges = []
-    for src in nodes:
-        for p, tgt in g.predicate_objects(src):
-            if isinstance(tgt, URIRef) and tgt in nodes and str(p) != str(RDF.type):
-                edges.append((src, p, tgt))
-    return nodes, edges
-
-def get_connected_subgraph_bfs(g, start_class, hops=2):
+def get_connected_subgraph_bfs(idx, start_class, hops=2, kinds=None):
     """
     Return the set of nodes and edges reachable from start_class within 'hops' steps (BFS).
-    Only nodes actually connected by at least one edge will appear.
+    Only edges traversed by the BFS appear, i.e. edges touching a node closer than 'hops'.
     """
-    from collections import deque
+    distance, edges = idx.adjacency.neighbourhood(start_class, hops, kinds)
+    return set(distance), [
+        (s, p, o) for s, p, o, _ in edges if min(distance[s], distance[o]) < hops
+    ]
 
-    visited_nodes = set([start_class])
-    edges = []
-    queue = deque([(start_class, 0)])
+def get_restriction_properties(idx, cls):
+    return idx.restrictions.get(cls, ())
 
-    while queue:
-        current, depth = queue.popleft()
-        if depth >= hops:
-            continue
-        # Outgoing edges
-        for p, o in g.predicate_objects(current):
-            if isinstance(o, URIRef):
-                edges.append((current, p, o))
-                if o not in visited_nodes:
-                    visited_nodes.add(o)
-                    queue.append((o, depth + 1))
-        # Incoming edges
-        for s, p in g.subject_predicates(current):
-            if isinstance(s, URIRef):
-                edges.append((s, p, current))
-                if s not in visited_nodes:
-                    visited_nodes.add(s)
-                    queue.append((s, depth + 1))
-    return visited_nodes, edges
-
-def get_restriction_properties(g, cls):
-    props = []
-    for restriction in g.objects(cls, RDFS.subClassOf):
-        if (restriction, RDF.type, OWL.Restriction) in g:
-            prop = next(g.objects(restriction, OWL.onProperty), None)
-            range_all = next(g.objects(restriction, OWL.allValuesFrom), None)
-            range_some = next(g.objects(restriction, OWL.someValuesFrom), None)
-            range_has = next(g.objects(restriction, OWL.hasValue), None)
-            # Qualified cardinality patterns
-            q_min = next(g.objects(restriction, OWL.minQualifiedCardinality), None)
-            q_max = next(g.objects(restriction, OWL.maxQualifiedCardinality), None)
-            q_exact = next(g.objects(restriction, OWL.qualifiedCardinality), None)
-            on_class = next(g.objects(restriction, OWL.onClass), None)
-
-            if prop:
-                if range_all:
-                    props.append((prop, "owl:allValuesFrom", range_all))
-                elif range_some:
-                    props.append((prop, "owl:someValuesFrom", range_some))
-                elif range_has:
-                    props.append((prop, "owl:hasValue", range_has))
-                elif q_exact or q_min or q_max:
-                    props.append((
-                        prop,
-                        "qualified_cardinality",
-                        {
-                            "q_exact": q_exact,
-                            "q_min": q_min,
-                            "q_max": q_max,
-                            "on_class": on_class
-                        }
-                    ))
-                else:
-                    props.append((prop, None, None))
-    return props
-
-def get_ancestor_path(g, node):
-    path = []
-    current = node
-    visited = set()
-    while True:
-        supers = get_superclasses(g, current)
-        if supers and supers[0] not in visited:
-            current = supers[0]
-            path.insert(0, current)
-            visited.add(current)
-        else:
-            break
-    path.append(node)
-    return path
-
-
-def get_ancestors_path(g, node):
+def get_ancestor_path(idx, node):
+    return idx.hierarchy.primary_path(node)
+
+
+def get_ancestors_path(idx, node):
     """Return the list of ancestor nodes from the topmost superclass to the node itself."""
-    path = []
-    current = node
-    visited = set()
-    while True:
-        supers = get_superclasses(g, current)
-        if supers and supers[0] not in visited:
-            current = supers[0]
-            path.insert(0, current)
-            visited.add(current)
-        else:
-            break
-    path.append(node)
-    return path
-
-def print_subtree_with_uris(g, node, prefix="", selected_class=None):
+    return idx.hierarchy.primary_path(node)
+
+def emit_lines(lines):
+    # One markdown element for a whole block instead of one per line
+    if lines:
+        st.markdown("\n\n".join(lines), unsafe_allow_html=True)
+
+def print_subtree_with_uris(idx, node, prefix="", selected_class=None, lines=None):
+    top = lines is None
+    lines = [] if top else lines
     # Subclasses, direct only
-    subclasses = get_subclasses(g, node)
+    subclasses = get_subclasses(idx, node)
     for i, sub in enumerate(subclasses):
         is_selected = (sub == selected_class)
         color_style = "color:red; font-weight:bold;" if is_selected else ""
         label = pretty_print_uri(sub)
         uri = str(sub)
-        st.markdown(
-            f"{prefix} &nbsp;&nbsp;&nbsp; <span style='{color_style}'>{label}</span> &nbsp; <span style='font-size:12px; color:grey'>{uri}</span>",
-            unsafe_allow_html=True
+        lines.append(
+            f"{prefix} &nbsp;&nbsp;&nbsp; <span style='{color_style}'>{label}</span> &nbsp; <span style='font-size:12px; color:grey'>{uri}</span>"
         )
-        print_subtree_with_uris(g, sub, prefix + "&nbsp;&nbsp;&nbsp;&nbsp;", selected_class)
+        print_subtree_with_uris(idx, sub, prefix + "&nbsp;&nbsp;&nbsp;&nbsp;", selected_class, lines)
+    if top:
+        emit_lines(lines)
 
-def show_ancestor_path(g, node, selected_class):
-    path = []
-    current = node
-    visited = set()
-    while True:
-        supers = get_superclasses(g, current)
-        if supers and supers[0] not in visited:
-            current = supers[0]
-            path.insert(0, current)
-            visited.add(current)
-        else:
-            break
-    path.append(node)
+def show_ancestor_path(idx, node, selected_class):
+    path = idx.hierarchy.primary_path(node)
+    lines = []
     for i, ancestor in enumerate(path):
         indent = '-' * i  # 0, 1, 2, ...
         is_selected = (ancestor == selected_class)
@@ -441,14 +150,16 @@ def show_ancestor_path(g, node, selected_class):
         weight = "bold" if is_selected else "normal"
         label = pretty_print_uri(ancestor)
         uri = str(ancestor)
-        st.markdown(
-            f"{indent} <a href='{uri}' style='color:{color};font-weight:{weight};text-decoration:underline'>{label}</a>",
-            unsafe_allow_html=True
+        lines.append(
+            f"{indent} <a href='{uri}' style='color:{color};font-weight:{weight};text-decoration:underline'>{label}</a>"
         )
+    emit_lines(lines)
     return len(path)  # so we know how deep the indent is
 
-def print_subtree_links(g, node, level=0, selected_class=None):
-    subclasses = get_subclasses(g, node)
+def print_subtree_links(idx, node, level=0, selected_class=None, lines=None):
+    top = lines is None
+    lines = [] if top else lines
+    subclasses = get_subclasses(idx, node)
     for sub in subclasses:
         is_selected = (sub == selected_class)
         color = "red" if is_selected else "#222"
@@ -456,14 +167,17 @@ def print_subtree_links(g, node, level=0, selected_class=None):
         label = pretty_print_uri(sub)
         uri = str(sub)
         indent = '-' * (level+1)  # child of current
-        st.markdown(
-            f"{indent} <a href='{uri}' style='color:{color};font-weight:{weight};text-decoration:underline'>{label}</a>",
-            unsafe_allow_html=True
+        lines.append(
+            f"{indent} <a href='{uri}' style='color:{color};font-weight:{weight};text-decoration:underline'>{label}</a>"
         )
-        print_subtree_links(g, sub, level=level+1, selected_class=selected_class)
+        print_subtree_links(idx, sub, level=level+1, selected_class=selected_class, lines=lines)
+    if top:
+        emit_lines(lines)
 
 
-def print_ascii_tree(g, node, selected_class, prefix="", is_last=True):
+def print_ascii_tree(idx, node, selected_class, prefix="", is_last=True, lines=None):
+    top = lines is None
+    lines = [] if top else lines
     # Prefix: "" for root, "   " for next, etc.
     label = pretty_print_uri(node)
     uri = str(node)
@@ -474,141 +188,90 @@ def print_ascii_tree(g, node, selected_class, prefix="", is_last=True):
         rendered = f"<a href='{uri}' style='color:#222;text-decoration:underline'>{label}</a>"
 
     branch = "└─" if is_last else "├─"
-    st.markdown(f"{prefix}{branch} {rendered}", unsafe_allow_html=True)
+    lines.append(f"{prefix}{branch} {rendered}")
 
-    children = get_subclasses(g, node)
+    children = get_subclasses(idx, node)
     for i, child in enumerate(children):
         next_prefix = prefix + ("   " if is_last else "│  ")
-        print_ascii_tree(g, child, selected_class, next_prefix, i == len(children)-1)
-
-def is_descendant(g, node, target):
-    if node == target:
-        return True
-    for child in get_subclasses(g, node):
-        if is_descendant(g, child, target):
-            return True
-    return False
-
-def get_top_ancestor(g, node):
-    supers = get_superclasses(g, node)
-    if supers:
-        return get_top_ancestor(g, supers[0])
-    return node
-
-def show_class_hierarchy_tree(g, selected_class):
-    def get_label_or_local(uri):
-        for l in g.objects(uri, RDFS.label):
-            if getattr(l, 'language', None) == 'en':
-                return str(l)
-        return pretty_print_uri(uri)
-
-    def get_ancestry_list(g, cls):
-        # Return [root, ..., selected_class]
-        path = []
-        while True:
-            parents = [p for p in g.objects(cls, RDFS.subClassOf) if isinstance(p, URIRef)]
-            if not parents:
-                break
-            parent = parents[0]  # Just pick one (if multiple, could be improved)
-            path.append(parent)
-            cls = parent
-        return path[::-1] + [selected_class]
-
-    def print_tree_with_ancestry(g, ancestry, idx=0, prefix=""):
-        node = ancestry[idx]
-        label = get_label_or_local(node)
-        url = str(node)
-        is_last = (idx == len(ancestry) - 1)
-        branch = "└─ " if is_last else "├─ "
-        html_label = f'<a href="{url}">{label}</a>'
-        if is_last:  # Target class in red
-            html_label = f'<span style="color:red">{html_label}</span>'
-        st.markdown(f"{prefix}{branch}{html_label}", unsafe_allow_html=True)
-        # If not at end of ancestry, go down ancestry
-        if not is_last:
-            next_prefix = prefix + ("   " if not is_last else "   ")
-            print_tree_with_ancestry(g, ancestry, idx+1, next_prefix)
-        else:
-            # Print all subclasses of selected_class as tree
-            print_subtree(g, node, prefix + "   ")
-
-    def print_subtree(g, node, prefix=""):
-        subclasses = [s for s in g.subjects(RDFS.subClassOf, node) if isinstance(s, URIRef)]
-        subclasses = sorted(subclasses, key=lambda u: get_label_or_local(u).lower())
-        for i, sub in enumerate(subclasses):
-            last = (i == len(subclasses) - 1)
-            branch = "└─ " if last else "├─ "
-            next_prefix = prefix + ("   " if last else "│  ")
-            label = get_label_or_local(sub)
-            url = str(sub)
-            html_label = f'<a href="{url}">{label}</a>'
-            st.markdown(f"{prefix}{branch}{html_label}", unsafe_allow_html=True)
-            print_subtree(g, sub, next_prefix)
-
-    # 1. Build ancestry path from root to selected_class
-    ancestry = get_ancestry_list(g, selected_class)
-    print_tree_with_ancestry(g, ancestry)
-
-def show_class_hierarchy_tree(g, selected_class):
-    def get_label_or_local(uri):
-        for l in g.objects(uri, RDFS.label):
-            if getattr(l, 'language', None) == 'en':
-                return str(l)
-        return pretty_print_uri(uri)
-
-    def get_superclass(g, node):
-        supers = [p for p in g.objects(node, RDFS.subClassOf) if isinstance(p, URIRef)]
-        return supers[0] if supers else None
-
-    def build_ancestor_path(g, node):
-        # Returns [root, ..., selected_class]
-        path = []
-        while True:
-            parent = get_superclass(g, node)
-            if parent is None:
-                break
-            path.append(parent)
-            node = parent
-        return path[::-1]  # root-first
-
-    def print_ancestor_chain_with_tree(g, path, target, prefix="", visited=None):
-        # Print each ancestor in path as one chain; then expand the selected node as a tree
-        if visited is None:
-            visited = set()
-        if not path:
-            # Reached selected_class
-            print_hierarchy_subtree(g, target, prefix=prefix, selected_class=target, visited=visited)
-            return
-        node = path[0]
-        label = get_label_or_local(node)
-        url = str(node)
-        st.markdown(f"{prefix}└─ <a href='{url}'>{label}</a>", unsafe_allow_html=True)
-        print_ancestor_chain_with_tree(g, path[1:], target, prefix + "   ", visited=visited)
-
-    def print_hierarchy_subtree(g, node, prefix="", selected_class=None, visited=None):
-        if visited is None:
-            visited = set()
-        label = get_label_or_local(node)
-        url = str(node)
-        # Print the selected class in red, others normally
-        if node == selected_class:
-            st.markdown(f"{prefix}└─ <span style='color:red'><a href='{url}'>{label}</a></span>", unsafe_allow_html=True)
-        else:
-            st.markdown(f"{prefix}└─ <a href='{url}'>{label}</a>", unsafe_allow_html=True)
-        # Print subclasses
-        subclasses = [s for s in g.subjects(RDFS.subClassOf, node) if isinstance(s, URIRef)]
-        subclasses = sorted(subclasses, key=lambda u: get_label_or_local(u).lower())
-        for idx, sub in enumerate(subclasses):
-            if sub in visited:
-                continue
-            visited.add(sub)
-            last = idx == len(subclasses) - 1
-            branch = "└─ " if last else "├─ "
-            print_hierarchy_subtree(g, sub, prefix + ("   " if last else "│  "), selected_class=None, visited=visited)
-
-    # Build the ancestor chain up to the selected class
-    ancestor_path = build_ancestor_path(g, selected_class)
-    # Print the chain, then expand the tree below
-    print_ancestor_chain_with_tree(g, ancestor_path, selected_class)
+        print_ascii_tree(idx, child, selected_class, next_prefix, i == len(children)-1, lines)
+    if top:
+        emit_lines(lines)
+
+def is_descendant(idx, node, target):
+    """True if ``target`` is ``node`` or one of its transitive subclasses."""
+    return node == target or idx.hierarchy.is_descendant(target, node)
+
+def get_top_ancestor(idx, node):
+    return idx.hierarchy.top_ancestor(node)
+
+HIERARCHY_DEFAULT_DEPTH = 3
 
+def hierarchy_label(idx, uri):
+    for l in idx.labels_en.get(uri, ()):
+        return str(l)
+    return pretty_print_uri(uri)
 
+def build_hierarchy_tree(idx, selected_class, max_depth=HIERARCHY_DEFAULT_DEPTH):
+    """
+    Nested dict for the Hierarchy tab: the primary ancestor chain down to
+    ``selected_class``, then its subclasses up to ``max_depth`` levels. Deeper
+    branches are not expanded; their node only records how many subclasses it hides.
+    """
+    visited = set()
+
+    def node_dict(uri):
+        return {"uri": str(uri), "label": hierarchy_label(idx, uri),
+                "selected": uri == selected_class, "children": [], "hidden": 0}
+
+    def subtree(uri, depth):
+        node = node_dict(uri)
+        subclasses = sorted(
+            (sub for sub in get_subclasses(idx, uri) if sub not in visited),
+            key=lambda u: hierarchy_label(idx, u).lower()
+        )
+        if depth >= max_depth:
+            node["hidden"] = len(subclasses)
+            return node
+        visited.update(subclasses)
+        node["children"] = [subtree(sub, depth + 1) for sub in subclasses]
+        return node
+
+    path = idx.hierarchy.primary_path(selected_class)
+    visited.update(path)
+    tree = subtree(selected_class, 0)
+    for ancestor in reversed(path[:-1]):
+        parent = node_dict(ancestor)
+        parent["children"] = [tree]
+        tree = parent
+    return tree
+
+def render_hierarchy_html(tree):
+    """Render a build_hierarchy_tree dict as one block of nested, collapsible <details>."""
+    parts = ["<div style='line-height:1.7'>"]
+    # Iterative walk: (node, closing) items; closing=True emits the end tags of a branch
+    stack = [(tree, False)]
+    while stack:
+        node, closing = stack.pop()
+        if closing:
+            parts.append("</div></details>")
+            continue
+        style = "color:red;font-weight:bold" if node["selected"] else ""
+        link = f"<a href='{html.escape(node['uri'], quote=True)}' style='{style}'>{html.escape(node['label'])}</a>"
+        if node["hidden"]:
+            link += f" <span style='color:grey;font-size:12px'>(+{node['hidden']} subclasses)</span>"
+        if not node["children"]:
+            parts.append(f"<div>{link}</div>")
+            continue
+        parts.append(
+            f"<details open><summary>{link}</summary>"
+            "<div style='margin-left:0.6em;padding-left:1em;border-left:1px solid #ddd'>"
+        )
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(node["children"]))
+    parts.append("</div>")
+    return "".join(parts)
+
+def show_class_hierarchy_tree(idx, selected_class, max_depth=HIERARCHY_DEFAULT_DEPTH):
+    # The whole tree goes to the frontend as a single markdown element
+    tree = build_hierarchy_tree(idx, selected_class, max_depth)
+    st.markdown(render_hierarchy_html(tree), unsafe_allow_html=True)
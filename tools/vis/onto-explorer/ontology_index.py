@@ -0,0 +1,240 @@
+# ontology_index.py
+
+from collections import defaultdict
+from dataclasses import dataclass
+
+from rdflib import Graph, RDF, RDFS, OWL, URIRef
+from rdflib.namespace import SKOS
+
+from ontocommon.labels import LabelResolver
+from hierarchy import ClassHierarchy
+from adjacency import ClassAdjacency, build_class_adjacency
+
+DCTERMS_DESCRIPTION = URIRef("http://purl.org/dc/terms/description")
+
+# Restriction predicates recorded per owl:Restriction node
+RESTRICTION_PREDICATES = (
+    OWL.onProperty,
+    OWL.allValuesFrom,
+    OWL.someValuesFrom,
+    OWL.hasValue,
+    OWL.minQualifiedCardinality,
+    OWL.maxQualifiedCardinality,
+    OWL.qualifiedCardinality,
+    OWL.onClass,
+)
+
+# Order matters: a restriction links back to a target through the first kind that mentions it
+REVERSE_RESTRICTION_KINDS = (
+    (OWL.allValuesFrom, "owl:allValuesFrom"),
+    (OWL.someValuesFrom, "owl:someValuesFrom"),
+    (OWL.hasValue, "owl:hasValue"),
+    (OWL.onClass, "owl:onClass"),
+)
+
+
+@dataclass(frozen=True)
+class OntologyIndex:
+    """
+    Read-only lookup tables derived from an ontology graph in a single pass.
+
+    Every per-class question the explorer asks (hierarchy, restrictions, reverse
+    links, labels, SKOS info) is answered from these plain dicts and tuples, so
+    selecting a class never walks the rdflib graph again.
+    """
+    graph: Graph
+    classes: tuple
+    subclasses: dict
+    superclasses: dict
+    hierarchy: ClassHierarchy
+    restrictions: dict
+    reverse_restrictions: dict
+    labels: dict
+    labels_en: dict
+    descriptions: dict
+    descriptions_en: dict
+    display_labels: dict
+    label_resolver: LabelResolver
+    definitions_en: dict
+    examples_en: dict
+    defined_by: dict
+    broader: dict
+    narrower: dict
+    skos_concepts: frozenset
+    adjacency: ClassAdjacency
+
+
+def _freeze(mapping, sort=False):
+    if sort:
+        return {key: tuple(sorted(values)) for key, values in mapping.items()}
+    return {key: tuple(values) for key, values in mapping.items()}
+
+
+def _parse_restriction(values):
+    """Turn the recorded predicate values of one owl:Restriction into the (prop, kind, value) form."""
+    prop = values.get(OWL.onProperty)
+    if not prop:
+        return None
+    if values.get(OWL.allValuesFrom):
+        return (prop, "owl:allValuesFrom", values[OWL.allValuesFrom])
+    if values.get(OWL.someValuesFrom):
+        return (prop, "owl:someValuesFrom", values[OWL.someValuesFrom])
+    if values.get(OWL.hasValue):
+        return (prop, "owl:hasValue", values[OWL.hasValue])
+    q_exact = values.get(OWL.qualifiedCardinality)
+    q_min = values.get(OWL.minQualifiedCardinality)
+    q_max = values.get(OWL.maxQualifiedCardinality)
+    if q_exact or q_min or q_max:
+        return (
+            prop,
+            "qualified_cardinality",
+            {
+                "q_exact": q_exact,
+                "q_min": q_min,
+                "q_max": q_max,
+                "on_class": values.get(OWL.onClass)
+            }
+        )
+    return (prop, None, None)
+
+
+def build_reverse_restriction_map(g):
+    """
+    Invert every owl:Restriction in one pass: target -> [(source class, property, kind)].
+
+    A restriction contributes one link per target, through the first of
+    allValuesFrom / someValuesFrom / hasValue / onClass that names it.
+    """
+    reverse = defaultdict(list)
+    for restriction in g.subjects(RDF.type, OWL.Restriction):
+        sources = [
+            cls for cls in g.subjects(RDFS.subClassOf, restriction)
+            if (cls, RDF.type, OWL.Class) in g
+        ]
+        if not sources:
+            continue
+        prop = next(g.objects(restriction, OWL.onProperty), None)
+        linked = set()
+        for pred, kind in REVERSE_RESTRICTION_KINDS:
+            for target in g.objects(restriction, pred):
+                if target in linked:
+                    continue
+                linked.add(target)
+                for cls in sources:
+                    reverse[target].append((cls, prop, kind))
+    return {target: tuple(links) for target, links in reverse.items()}
+
+
+def build_ontology_index(g):
+    """
+    Build an OntologyIndex from one sweep over all triples of ``g`` (plus the
+    restriction pass of build_reverse_restriction_map).
+    """
+    class_nodes = []
+    class_set = set()
+    restriction_nodes = set()
+    skos_concepts = set()
+    subclass_of = defaultdict(list)
+    restriction_values = defaultdict(dict)
+    labels = defaultdict(list)
+    labels_en = defaultdict(list)
+    descriptions = defaultdict(list)
+    descriptions_en = defaultdict(list)
+    definitions_en = defaultdict(list)
+    examples_en = defaultdict(list)
+    defined_by = defaultdict(list)
+    broader = defaultdict(list)
+    narrower = defaultdict(list)
+    domains = defaultdict(list)
+    ranges = defaultdict(list)
+
+    for s, p, o in g:
+        if p == RDF.type:
+            if o == OWL.Class and s not in class_set:
+                class_set.add(s)
+                class_nodes.append(s)
+            elif o == OWL.Restriction:
+                restriction_nodes.add(s)
+        elif p == RDFS.subClassOf:
+            subclass_of[s].append(o)
+            if o == SKOS.Concept:
+                skos_concepts.add(s)
+        elif p == RDFS.label:
+            labels[s].append(o)
+            if getattr(o, "language", None) == "en":
+                labels_en[s].append(o)
+        elif p == DCTERMS_DESCRIPTION:
+            descriptions[s].append(o)
+            if getattr(o, "language", None) == "en":
+                descriptions_en[s].append(o)
+        elif p == SKOS.definition:
+            if getattr(o, "language", None) == "en":
+                definitions_en[s].append(str(o))
+        elif p == SKOS.example:
+            if getattr(o, "language", None) == "en":
+                examples_en[s].append(str(o))
+        elif p == RDFS.isDefinedBy:
+            defined_by[s].append(o)
+        elif p == SKOS.broader:
+            broader[s].append(o)
+        elif p == SKOS.narrower:
+            narrower[s].append(o)
+        elif p == RDFS.domain:
+            domains[s].append(o)
+        elif p == RDFS.range:
+            ranges[s].append(o)
+
+        if p in RESTRICTION_PREDICATES:
+            restriction_values[s].setdefault(p, o)
+
+    subclasses = defaultdict(set)
+    superclasses = defaultdict(set)
+    restrictions = defaultdict(list)
+    for cls, parents in subclass_of.items():
+        for parent in parents:
+            if isinstance(parent, URIRef):
+                superclasses[cls].add(parent)
+                if isinstance(cls, URIRef):
+                    subclasses[parent].add(cls)
+            if parent not in restriction_nodes:
+                continue
+            parsed = _parse_restriction(restriction_values.get(parent, {}))
+            if parsed:
+                restrictions[cls].append(parsed)
+
+    subclasses = _freeze(subclasses, sort=True)
+    superclasses = _freeze(superclasses, sort=True)
+    labels = _freeze(labels)
+    labels_en = _freeze(labels_en)
+    descriptions_en = _freeze(descriptions_en)
+    label_resolver = LabelResolver(labels, labels_en, descriptions_en)
+    display_labels = {cls: label_resolver.display(cls) for cls in class_nodes}
+    restrictions = {
+        cls: tuple(sorted(props, key=lambda r: str(r[0])))
+        for cls, props in restrictions.items()
+    }
+    broader = _freeze(broader)
+    narrower = _freeze(narrower)
+
+    return OntologyIndex(
+        graph=g,
+        classes=tuple(class_nodes),
+        subclasses=subclasses,
+        superclasses=superclasses,
+        hierarchy=ClassHierarchy(superclasses, subclasses),
+        restrictions=restrictions,
+        reverse_restrictions=build_reverse_restriction_map(g),
+        labels=labels,
+        labels_en=labels_en,
+        descriptions=_freeze(descriptions),
+        descriptions_en=descriptions_en,
+        display_labels=display_labels,
+        label_resolver=label_resolver,
+        definitions_en=_freeze(definitions_en),
+        examples_en=_freeze(examples_en),
+        defined_by=_freeze(defined_by),
+        broader=broader,
+        narrower=narrower,
+        skos_concepts=frozenset(skos_concepts),
+        adjacency=build_class_adjacency(restrictions, superclasses, broader, narrower, domains, ranges),
+    )
@@ -0,0 +1,102 @@
+# overview.py
+
+from collections import Counter, defaultdict
+
+from rdflib import URIRef
+
+from ontocommon.labels import local_name
+
+OTHER_DOMAIN = "Other"
+
+
+class DomainOverview:
+    """
+    Precomputed aggregates for the whole-ontology overview.
+
+    Every class is assigned to a unit: the main class (from ``grouped_main_classes``)
+    it is, or its nearest main-class ancestor; classes outside every domain fall back
+    to the root of their superclass chain and the OTHER_DOMAIN group. Class counts
+    and edge bundles (restriction links and subclass links, counted per unit pair)
+    are built once; ``aggregate`` then folds them to any level of detail without
+    touching the ontology again.
+    """
+
+    def __init__(self, idx, grouped_main_classes):
+        main_domain = {
+            name: group for group, names in grouped_main_classes.items() for name in names
+        }
+        classes = [cls for cls in idx.classes if isinstance(cls, URIRef)]
+        mains = {cls: main_domain[local_name(cls)] for cls in classes if local_name(cls) in main_domain}
+
+        self.domains = list(grouped_main_classes)
+        self.unit_of = {}
+        self.domain_of_unit = dict(mains)
+        for cls in classes:
+            if cls in mains:
+                unit = cls
+            else:
+                unit = next((a for a in idx.hierarchy.ancestors_of(cls) if a in mains), None)
+                if unit is None:
+                    unit = idx.hierarchy.top_ancestor(cls)
+                    self.domain_of_unit.setdefault(unit, OTHER_DOMAIN)
+            self.unit_of[cls] = unit
+        if OTHER_DOMAIN in self.domain_of_unit.values():
+            self.domains.append(OTHER_DOMAIN)
+
+        self.unit_size = Counter(self.unit_of.values())
+        self.domain_size = Counter()
+        for unit, size in self.unit_size.items():
+            self.domain_size[self.domain_of_unit[unit]] += size
+        self.units = defaultdict(list)
+        for unit in sorted(self.unit_size, key=str):
+            self.units[self.domain_of_unit[unit]].append(unit)
+
+        # (source unit, target unit) -> number of restrictions / subclass axioms between their classes
+        self.restriction_bundles = Counter()
+        for cls, props in idx.restrictions.items():
+            source = self.unit_of.get(cls)
+            if source is None:
+                continue
+            for _, rtype, rvalue in props:
+                target = rvalue["on_class"] if rtype == "qualified_cardinality" else rvalue
+                if target in self.unit_of:
+                    self.restriction_bundles[(source, self.unit_of[target])] += 1
+        self.subclass_bundles = Counter()
+        for cls, parents in idx.superclasses.items():
+            for parent in parents:
+                if cls in self.unit_of and parent in self.unit_of:
+                    self.subclass_bundles[(self.unit_of[cls], self.unit_of[parent])] += 1
+
+    def aggregate(self, expanded=()):
+        """
+        Fold the unit-level aggregates for one level of detail.
+
+        Domains in ``expanded`` are shown as their units, every other domain as a
+        single super-node. Returns (nodes, bundles): nodes maps a node key (domain
+        name or unit URI) to {"domain", "unit", "classes", "internal"}, bundles maps
+        (source key, target key, kind) to a count, kind being "restriction" or
+        "subclass". Links inside one super-node are counted in its "internal".
+        """
+        expanded = set(expanded)
+
+        def node_of(unit):
+            domain = self.domain_of_unit[unit]
+            return unit if domain in expanded else domain
+
+        nodes = {}
+        for domain in self.domains:
+            if domain in expanded:
+                for unit in self.units[domain]:
+                    nodes[unit] = {"domain": domain, "unit": unit, "classes": self.unit_size[unit], "internal": 0}
+            else:
+                nodes[domain] = {"domain": domain, "unit": None, "classes": self.domain_size[domain], "internal": 0}
+
+        bundles = Counter()
+        for kind, counts in (("restriction", self.restriction_bundles), ("subclass", self.subclass_bundles)):
+            for (source, target), count in counts.items():
+                source, target = node_of(source), node_of(target)
+                if source == target:
+                    nodes[source]["internal"] += count
+                else:
+                    bundles[(source, target, kind)] += count
+        return nodes, dict(bundles)
@@ -0,0 +1,131 @@
+# render_store.py
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class RenderStore:
+    """
+    Process-wide, in-memory store of rendered artifacts (Graph View HTML).
+
+    Entries are kept under a byte budget with LRU eviction. Each entry also
+    records the sessions that requested it; once none of those sessions is
+    active any more (``is_session_active`` returns False), the entry is dropped
+    without waiting for eviction. ``stats()`` reports count, bytes and hit/miss
+    counters for monitoring.
+    """
+
+    def __init__(self, max_bytes=None, is_session_active=None):
+        if max_bytes is None:
+            max_bytes = int(os.environ.get("EXPLORER_RENDER_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+        self.max_bytes = max_bytes
+        self.is_session_active = is_session_active
+        self._entries = OrderedDict()  # key -> (artifact, size)
+        self._sessions = {}            # session id -> set of keys it requested
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def size_of(artifact):
+        return len(artifact.encode("utf-8")) if isinstance(artifact, str) else len(artifact)
+
+    def get(self, key, session_id=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            self._track(key, session_id)
+            return entry[0]
+
+    def put(self, key, artifact, session_id=None):
+        size = self.size_of(artifact)
+        with self._lock:
+            if size > self.max_bytes:
+                logger.warning("Render artifact of %d bytes exceeds the %d byte budget; not stored", size, self.max_bytes)
+                return artifact
+            self._drop(key)
+            self._entries[key] = (artifact, size)
+            self.bytes += size
+            self._track(key, session_id)
+            self._evict()
+        return artifact
+
+    def get_or_render(self, key, render, session_id=None):
+        """Return the stored artifact for ``key``, calling ``render()`` and storing it on a miss."""
+        artifact = self.get(key, session_id)
+        if artifact is None:
+            artifact = self.put(key, render(), session_id)
+        return artifact
+
+    def release_session(self, session_id):
+        """Forget a session and drop the entries no other session still uses."""
+        with self._lock:
+            self._release(session_id)
+
+    def cleanup_sessions(self):
+        """Release every tracked session that ``is_session_active`` reports as gone."""
+        if self.is_session_active is None:
+            return 0
+        with self._lock:
+            ended = [sid for sid in self._sessions if not self.is_session_active(sid)]
+            for session_id in ended:
+                self._release(session_id)
+        return len(ended)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sessions.clear()
+            self.bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "artifacts": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "sessions": len(self._sessions),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    # --- internals (call with the lock held) ---
+
+    def _track(self, key, session_id):
+        if session_id is not None:
+            self._sessions.setdefault(session_id, set()).add(key)
+
+    def _release(self, session_id):
+        keys = self._sessions.pop(session_id, set())
+        still_used = set().union(*self._sessions.values()) if self._sessions else set()
+        for key in keys - still_used:
+            self._drop(key)
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[1]
+
+    def _evict(self):
+        evicted = 0
+        while self.bytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            evicted += 1
+        if evicted:
+            self.evictions += evicted
+            logger.info("Render store evicted %d artifacts; %d left, %d of %d bytes",
+                        evicted, len(self._entries), self.bytes, self.max_bytes)
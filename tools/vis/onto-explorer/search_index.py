@@ -0,0 +1,148 @@
+# search_index.py
+
+import re
+from bisect import bisect_left
+from collections import defaultdict
+
+import numpy as np
+from rapidfuzz import process, fuzz, utils
+
+from ontocommon.labels import local_name
+
+SEARCH_LANGUAGES = ("en", "fr", "de")
+MAX_CANDIDATES = 400
+BNODE_LABEL = re.compile(r"^n[0-9a-f]{32}$")
+
+
+def trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ClassSearchIndex:
+    """
+    Fuzzy class search built once per ontology.
+
+    Choice strings (class display labels, en/fr/de labels, local names and
+    descriptions) are preprocessed once and kept in a flat list so every
+    keystroke only runs rapidfuzz over a small candidate set picked by a
+    trigram index (labels and names) or a word-prefix index (descriptions).
+    """
+
+    def __init__(self, label_to_uri, short_choices, long_choices):
+        # label_to_uri: display label -> class URI, in dropdown order
+        # short_choices / long_choices: [(display label, text)]
+        self.label_to_uri = label_to_uri
+        self.choices = []
+        self.owners = []
+        postings = defaultdict(list)
+        for owner, text in short_choices:
+            processed = utils.default_process(text)
+            if not processed:
+                continue
+            choice_id = len(self.choices)
+            self.choices.append(processed)
+            self.owners.append(owner)
+            for gram in trigrams(processed):
+                postings[gram].append(choice_id)
+        self.trigram_postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+
+        words = defaultdict(set)
+        for owner, text in long_choices:
+            processed = utils.default_process(text)
+            if not processed:
+                continue
+            choice_id = len(self.choices)
+            self.choices.append(processed)
+            self.owners.append(owner)
+            for word in processed.split():
+                words[word].add(choice_id)
+        self.vocabulary = sorted(words)
+        self.word_postings = [np.fromiter(words[w], dtype=np.int32) for w in self.vocabulary]
+        self.n_choices = len(self.choices)
+
+    def _prefix_postings(self, token):
+        start = bisect_left(self.vocabulary, token)
+        end = start
+        while end < len(self.vocabulary) and self.vocabulary[end].startswith(token):
+            end += 1
+        return self.word_postings[start:end]
+
+    def candidates(self, processed_query):
+        """Ids of the choices worth scoring, most promising first."""
+        hits = []
+        if len(processed_query) >= 3:
+            hits.extend(
+                self.trigram_postings[gram]
+                for gram in trigrams(processed_query)
+                if gram in self.trigram_postings
+            )
+        for token in processed_query.split():
+            if len(token) >= 2 or len(processed_query) < 3:
+                hits.extend(self._prefix_postings(token))
+        if len(processed_query) < 3:
+            # Too short for trigrams: any label or name starting with the query
+            hits.extend(
+                postings for gram, postings in self.trigram_postings.items()
+                if gram.startswith(" " + processed_query)
+            )
+        if not hits:
+            # A short query is cheap to score against every choice; a longer one that
+            # shares no trigram or word prefix with any choice has no candidates
+            if len(processed_query) < 3:
+                return np.arange(self.n_choices)
+            return np.arange(0)
+        counts = np.bincount(np.concatenate(hits), minlength=self.n_choices)
+        found = np.flatnonzero(counts)
+        if len(found) > MAX_CANDIDATES:
+            found = found[np.argsort(-counts[found], kind="stable")[:MAX_CANDIDATES]]
+        return found
+
+    def search(self, query, limit=10, score_cutoff=50):
+        """Return up to ``limit`` class display labels ranked by best fuzzy score."""
+        processed = utils.default_process(query or "")
+        if not processed:
+            return []
+        candidate_ids = self.candidates(processed)
+        choices = [self.choices[i] for i in candidate_ids]
+        matches = process.extract(
+            processed, choices, scorer=fuzz.WRatio, processor=None,
+            limit=None, score_cutoff=score_cutoff
+        )
+        results = []
+        seen = set()
+        for _, _, position in matches:
+            owner = self.owners[candidate_ids[position]]
+            if owner not in seen:
+                seen.add(owner)
+                results.append(owner)
+                if len(results) == limit:
+                    break
+        return results
+
+
+def build_class_search_index(idx, languages=SEARCH_LANGUAGES):
+    """Build the ClassSearchIndex (and the sorted dropdown mapping) for an OntologyIndex."""
+    dropdown = []
+    for uri in idx.classes:
+        frag = local_name(uri)
+        if BNODE_LABEL.match(frag) and not idx.labels.get(uri):
+            continue
+        label = idx.display_labels.get(uri)
+        if label and label.strip():
+            dropdown.append((label, uri))
+    dropdown.sort(key=lambda x: x[0].lower())
+    label_to_uri = {label: uri for label, uri in dropdown}
+
+    short_choices = []
+    long_choices = []
+    for label, uri in label_to_uri.items():
+        short_choices.append((label, label))
+        short_choices.append((label, local_name(uri)))
+        for lbl in idx.labels.get(uri, ()):
+            if getattr(lbl, "language", None) in languages:
+                short_choices.append((label, str(lbl)))
+        for desc in idx.descriptions.get(uri, ()):
+            if getattr(desc, "language", None) in languages:
+                long_choices.append((label, str(desc)))
+    return ClassSearchIndex(label_to_uri, short_choices, long_choices)
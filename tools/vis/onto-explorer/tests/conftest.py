@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+from rdflib import Graph
+
+TOOL_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, TOOL_DIR)
+sys.path.insert(0, os.path.join(TOOL_DIR, "benchmarks"))
+sys.path.insert(0, os.path.join(TOOL_DIR, "..", ".."))
+
+from ontology_index import build_ontology_index
+
+EXAMPLE_ONTOLOGY = os.path.join(TOOL_DIR, "example_data", "ebucoreplus-2-0.owl")
+
+
+@pytest.fixture(scope="session")
+def graph():
+    return Graph().parse(EXAMPLE_ONTOLOGY, format="turtle")
+
+
+@pytest.fixture(scope="session")
+def index(graph):
+    return build_ontology_index(graph)
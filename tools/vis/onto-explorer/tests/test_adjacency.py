@@ -0,0 +1,73 @@
+from collections import deque
+
+import pytest
+from rdflib import URIRef
+
+from adjacency import EDGE_KINDS, ClassAdjacency
+
+EC = "http://www.ebu.ch/metadata/ontologies/ebucoreplus#"
+START_CLASSES = [URIRef(EC + name) for name in ("EditorialObject", "Agent", "Location")]
+KIND_FILTERS = [None, ("subclass",), ("restriction", "domain/range"), ("skos",)]
+
+
+def bfs_neighbourhood(triples, start, hops, kinds):
+    # Reference: breadth-first search over the edge list, in both directions
+    edges = [t for t in set(triples) if kinds is None or t[3] in kinds]
+    neighbours = {}
+    for source, _, target, _ in edges:
+        neighbours.setdefault(source, set()).add(target)
+        neighbours.setdefault(target, set()).add(source)
+    distance = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        if distance[node] == hops:
+            continue
+        for other in neighbours.get(node, ()):
+            if other not in distance:
+                distance[other] = distance[node] + 1
+                queue.append(other)
+    inside = [t for t in edges if t[0] in distance and t[2] in distance]
+    return distance, inside
+
+
+def all_triples(adjacency):
+    kind_names = {code: name for name, code in EDGE_KINDS.items()}
+    return [
+        (adjacency.nodes[s], adjacency.predicates[p], adjacency.nodes[t], kind_names[k])
+        for s, p, t, k in zip(adjacency.source.tolist(), adjacency.predicate.tolist(),
+                              adjacency.target.tolist(), adjacency.kind.tolist())
+    ]
+
+
+@pytest.mark.parametrize("kinds", KIND_FILTERS, ids=str)
+@pytest.mark.parametrize("hops", [1, 2, 3])
+@pytest.mark.parametrize("start", START_CLASSES, ids=lambda uri: uri.split("#")[-1])
+def test_matches_python_bfs_on_example(index, start, hops, kinds):
+    adjacency = index.adjacency
+    distance, edges = adjacency.neighbourhood(start, hops, kinds)
+    expected_distance, expected_edges = bfs_neighbourhood(all_triples(adjacency), start, hops, kinds)
+    assert distance == expected_distance
+    assert sorted(edges) == sorted(expected_edges)
+
+
+def test_small_graph():
+    a, b, c, d, p = (URIRef(f"urn:{name}") for name in "abcdp")
+    adjacency = ClassAdjacency([
+        (a, p, b, "restriction"),
+        (c, p, b, "subclass"),
+        (c, p, d, "restriction"),
+        (a, p, b, "restriction"),  # duplicates are stored once
+    ])
+    assert len(adjacency.source) == 3
+    assert adjacency.neighbourhood(a, 1) == ({a: 0, b: 1}, [(a, p, b, "restriction")])
+    distance, edges = adjacency.neighbourhood(a, 3)
+    assert distance == {a: 0, b: 1, c: 2, d: 3}
+    assert len(edges) == 3
+    distance, _ = adjacency.neighbourhood(a, 3, ["restriction"])
+    assert distance == {a: 0, b: 1}
+
+
+def test_unknown_start():
+    start = URIRef("urn:missing")
+    assert ClassAdjacency([]).neighbourhood(start, 2) == ({start: 0}, [])
@@ -0,0 +1,78 @@
+from hierarchy import ClassHierarchy, strongly_connected_components
+
+
+def build(edges):
+    # edges: (child, parent) pairs
+    superclasses, subclasses = {}, {}
+    for child, parent in edges:
+        superclasses[child] = superclasses.get(child, ()) + (parent,)
+        subclasses[parent] = subclasses.get(parent, ()) + (child,)
+    return ClassHierarchy(superclasses, subclasses)
+
+
+def reachable(start, edges):
+    # Plain DFS closure; contains start only when a cycle leads back to it
+    found, stack = set(), list(edges.get(start, ()))
+    while stack:
+        node = stack.pop()
+        if node not in found:
+            found.add(node)
+            stack.extend(edges.get(node, ()))
+    return found
+
+
+def test_chain():
+    h = build([("C", "B"), ("B", "A")])
+    assert h.ancestors_of("C") == ["B", "A"]
+    assert h.descendants_of("A") == ["B", "C"]
+    assert h.is_ancestor("A", "C") and not h.is_ancestor("C", "A")
+    assert h.is_descendant("C", "A")
+    assert h.primary_path("C") == ["A", "B", "C"]
+    assert h.top_ancestor("C") == "A"
+
+
+def test_diamond():
+    h = build([("D", "B"), ("D", "C"), ("B", "A"), ("C", "A")])
+    assert set(h.ancestors_of("D")) == {"A", "B", "C"}
+    assert h.ancestors_of("D")[-1] == "A"
+    assert set(h.descendants_of("A")) == {"B", "C", "D"}
+
+
+def test_cycle():
+    # A <-> B, with C below the cycle and R above it
+    h = build([("A", "B"), ("B", "A"), ("C", "A"), ("B", "R")])
+    assert set(h.ancestors_of("A")) == {"A", "B", "R"}
+    assert set(h.ancestors_of("B")) == {"A", "B", "R"}
+    assert set(h.ancestors_of("C")) == {"A", "B", "R"}
+    assert set(h.descendants_of("R")) == {"A", "B", "C"}
+    assert set(h.descendants_of("A")) == {"A", "B", "C"}
+    assert h.primary_path("C") == ["B", "A", "C"]
+
+
+def test_self_loop():
+    h = build([("A", "A"), ("B", "A")])
+    assert h.ancestors_of("A") == ["A"]
+    assert h.ancestors_of("B") == ["A"]
+    assert set(h.descendants_of("A")) == {"A", "B"}
+    assert h.primary_path("A") == ["A"]
+
+
+def test_unknown_node():
+    h = build([("B", "A")])
+    assert h.ancestors_of("X") == []
+    assert h.descendants_of("X") == []
+    assert not h.is_ancestor("A", "X")
+
+
+def test_components_are_listed_after_the_ones_they_reach():
+    edges = {"C": ("B",), "B": ("A",), "A": ("B",)}
+    components = strongly_connected_components(["C", "B", "A"], edges)
+    assert sorted(map(sorted, components)) == [["A", "B"], ["C"]]
+    assert components[-1] == ["C"]
+
+
+def test_closure_matches_dfs_on_example(index):
+    h = index.hierarchy
+    for cls in index.classes:
+        assert set(h.ancestors_of(cls)) == reachable(cls, h.superclasses)
+        assert set(h.descendants_of(cls)) == reachable(cls, h.subclasses)
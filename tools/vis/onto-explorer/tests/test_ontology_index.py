@@ -0,0 +1,38 @@
+import dataclasses
+
+import pytest
+from rdflib import RDF, RDFS, OWL, URIRef
+
+from bench_reverse_restrictions import scan_reverse_restriction_properties
+
+EC = "http://www.ebu.ch/metadata/ontologies/ebucoreplus#"
+SAMPLE_CLASSES = [URIRef(EC + name) for name in ("EditorialObject", "Agent", "Location", "MediaResource", "Person")]
+
+
+def test_classes_are_the_typed_classes(graph, index):
+    assert set(index.classes) == set(graph.subjects(RDF.type, OWL.Class))
+
+
+def test_hierarchy_tables_match_the_graph(graph, index):
+    for cls in index.classes:
+        parents = {o for o in graph.objects(cls, RDFS.subClassOf) if isinstance(o, URIRef)}
+        assert set(index.superclasses.get(cls, ())) == parents
+        if isinstance(cls, URIRef):
+            children = {s for s in graph.subjects(RDFS.subClassOf, cls) if isinstance(s, URIRef)}
+            assert set(index.subclasses.get(cls, ())) == children
+
+
+def test_english_labels_match_the_graph(graph, index):
+    for cls in index.classes:
+        expected = [o for o in graph.objects(cls, RDFS.label) if getattr(o, "language", None) == "en"]
+        assert sorted(index.labels_en.get(cls, ())) == sorted(expected)
+
+
+@pytest.mark.parametrize("target", SAMPLE_CLASSES, ids=lambda uri: uri.split("#")[-1])
+def test_reverse_restrictions_match_the_full_scan(graph, index, target):
+    assert sorted(index.reverse_restrictions.get(target, ())) == sorted(scan_reverse_restriction_properties(graph, target))
+
+
+def test_index_is_read_only(index):
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        index.classes = ()